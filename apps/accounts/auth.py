@@ -0,0 +1,143 @@
+"""Native async JWT authentication with an in-process user cache.
+
+Token parsing and signature/expiry checks are pure CPU work, so they run
+inline on the event loop — no thread-pool hop. The `User` row is looked up
+once and then served from a small TTL'd LRU keyed by (user id, token
+version); the version is the token's revoke claim when simplejwt's
+`CHECK_REVOKE_TOKEN` is on, so tokens minted before a password change never
+match a cached entry.
+
+Invalidation: `apps.accounts.signals` drops a user's entries on save and
+delete in this process. Changes made by another process (e.g. admin on a
+separate worker) are picked up when the entry expires — keep
+`JWT_USER_CACHE_TTL` short.
+
+Only DB-free token classes (the default `AccessToken`) are supported here;
+blacklist-checking token types would query the DB from the event loop.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.models import User
+
+# (user id, token version)
+CacheKey = tuple[str, Any]
+
+
+class UserCache:
+    """Thread-safe LRU of `User` rows with per-entry expiry."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[CacheKey, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a put() whose DB read started before
+        # the bump would resurrect stale data, so it is dropped.
+        self.generation = 0
+
+    def get(self, key: CacheKey) -> User | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Each request gets its own instance; the cached one stays pristine.
+        return copy.copy(user)
+
+    def put(self, key: CacheKey, user: User, generation: int) -> None:
+        expires_at = time.monotonic() + settings.JWT_USER_CACHE_TTL
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (expires_at, copy.copy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.JWT_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Drop every entry of `user_id`, whatever its token version."""
+        user_id = str(user_id)
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+user_cache = UserCache()
+_jwt = JWTAuthentication()
+
+
+async def authenticate(request: HttpRequest) -> User | None:
+    """User for the request's `Authorization: Bearer` token, or None without one.
+
+    Raises simplejwt's AuthenticationFailed (or its InvalidToken subclass)
+    for malformed/expired tokens and unknown or inactive users — same
+    contract as `JWTAuthentication.authenticate`.
+    """
+    header = _jwt.get_header(request)  # type: ignore[arg-type]
+    if header is None:
+        return None
+    return await authenticate_header(header)
+
+
+async def authenticate_header(header: bytes | str) -> User | None:
+    """Same as `authenticate`, for an `Authorization` value obtained elsewhere
+    (e.g. websocket connection params)."""
+    if isinstance(header, str):
+        header = header.encode()
+    raw_token = _jwt.get_raw_token(header)
+    if raw_token is None:
+        return None
+    token = _jwt.get_validated_token(raw_token)
+
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        raise InvalidToken(_("Token contained no recognizable user identification"))
+    revoke_claim = (
+        token.get(api_settings.REVOKE_TOKEN_CLAIM)
+        if api_settings.CHECK_REVOKE_TOKEN
+        else None
+    )
+    key: CacheKey = (str(user_id), revoke_claim)
+
+    user = user_cache.get(key)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation
+    user = await User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if api_settings.CHECK_REVOKE_TOKEN and revoke_claim != get_md5_hash_password(
+        user.password
+    ):
+        raise AuthenticationFailed(
+            _("The user's password has been changed."), code="password_changed"
+        )
+
+    user_cache.put(key, user, generation)
+    return user
@@ -0,0 +1,14 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.auth import user_cache
+from apps.accounts.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender: type[User], instance: User, **kwargs: Any) -> None:
+    """Deactivation, password or profile changes must not be served from cache."""
+    user_cache.invalidate_user(instance.pk)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from apps.bedmages.models import BedmageWatch
+
+
+@admin.register(BedmageWatch)
+class BedmageWatchAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = ("user", "character", "created_at", "reminded_login")
+    search_fields = ("user__username", "character__name")
+    autocomplete_fields = ("user", "character")
+    readonly_fields = ("created_at", "reminded_login")
+    ordering = ["-created_at"]
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class BedmagesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.bedmages"
+    label = "bedmages"
+
+    def ready(self) -> None:
+        from apps.bedmages import signals  # noqa: F401
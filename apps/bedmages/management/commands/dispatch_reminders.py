@@ -0,0 +1,57 @@
+import logging
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.bedmages import reminders, services
+from apps.bedmages.tasks import send_bedmage_reminder
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Queue bedmage reminders as they come due (see apps.bedmages.reminders)."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch", type=int, default=500, help="Reminders claimed per tick"
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=300.0,
+            help="Longest wait between checks; new reminders wake the "
+            "dispatcher early, so this only bounds idle polling",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Dispatch what is due now and exit"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # Anything lost with Redis (or scheduled while it was down) since the
+        # oldest login whose reminder may still be sent.
+        now = time.time()
+        window = settings.BEDMAGE_REMINDER_MINUTES * 60 + reminders.MISSED_GRACE
+        since = datetime.fromtimestamp(now, tz=timezone.utc) - timedelta(seconds=window)
+        added = reminders.seed(services.watched_logins(since), now=now)
+        logger.info("dispatch_reminders: seeded %d reminders", added)
+
+        while True:
+            names, lease = reminders.claim_due(time.time(), options["batch"])
+            for name in names:
+                send_bedmage_reminder.delay(name)
+            reminders.ack(names, lease)
+            if names:
+                logger.info("dispatch_reminders: queued %d reminders", len(names))
+            if options["once"]:
+                self.stdout.write(f"Queued {len(names)} reminders")
+                return
+            if len(names) == options["batch"]:
+                continue  # backlog: claim the next batch straight away
+            wakeup = reminders.next_wakeup()
+            delay = options["max_sleep"] if wakeup is None else wakeup - time.time()
+            reminders.wait(min(delay, options["max_sleep"]))
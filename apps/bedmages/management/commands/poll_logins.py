@@ -0,0 +1,28 @@
+import os
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+
+os.environ.setdefault("SCRAPY_SETTINGS_MODULE", "scrapers.tibiantis_scrapers.settings")
+
+
+class Command(BaseCommand):
+    help = (
+        "Poll the last login of bedmage-watched characters, feeding the reminder "
+        "queue (see scrapers.tibiantis_scrapers.spiders.login_spider)."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--rounds", type=int, default=None, help="Stop after this many rounds"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from scrapers.tibiantis_scrapers.spiders.login_spider import LoginSpider
+
+        process = CrawlerProcess(get_project_settings())
+        process.crawl(LoginSpider, rounds=options["rounds"])
+        process.start()
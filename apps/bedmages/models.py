@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import models
+
+from apps.characters.models import Character
+
+
+class BedmageWatch(models.Model):
+    """A user's watch on a character: once the character has been logged out
+    for `BEDMAGE_REMINDER_MINUTES` (mana regenerated in bed), remind them."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="bedmage_watches",
+    )
+    # No reverse accessor: Character mirrors the scraped item's fields.
+    character = models.ForeignKey(Character, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    # The `last_login` this watch was last reminded about: a reminder that
+    # fires twice (dispatcher restart, lease retry) is only sent once.
+    reminded_login = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "character"], name="bedmage_watch_unique"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user} → {self.character.name}"
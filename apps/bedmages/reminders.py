@@ -0,0 +1,130 @@
+"""Due-time queue of bedmage reminders, kept in a Redis sorted set.
+
+Each watched character with a fresh `last_login` is a member of `DUE_KEY`
+scored by the epoch second its reminder is due (`last_login` +
+`BEDMAGE_REMINDER_MINUTES`). A new login replaces the member's score, so a
+character has at most one pending reminder however often it is scraped.
+
+One dispatcher (`dispatch_reminders` command) sleeps in a blocking pop on
+`WAKE_KEY` until the earliest due time: idle, it costs one Redis call per
+`--max-sleep`, and a reminder scheduled ahead of the current head pushes a
+wake token so the dispatcher recomputes its deadline at once instead of
+oversleeping it.
+
+Claiming leases entries (`CLAIM_LEASE`) like the scrape schedule; the
+dispatcher acknowledges them once their tasks are queued. A dispatcher that
+dies in between fires them again after the lease, and the per-watch
+`reminded_login` keeps that from reaching a user twice.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime
+from typing import cast
+
+import redis
+from django.conf import settings
+
+from config.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = "bedmages:due"
+WAKE_KEY = "bedmages:wake"
+# Seconds a claimed entry is held back before it is fired again.
+CLAIM_LEASE = 60
+# Reminders missed by more than this (e.g. the dispatcher was down) are not
+# re-seeded: a rested-bedmage message an hour late is noise.
+MISSED_GRACE = 15 * 60
+
+# ZADD, and a wake token if the entry is now the earliest.
+_SCHEDULE = """
+local head = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+if head[2] == nil or tonumber(ARGV[1]) < tonumber(head[2]) then
+    redis.call('DEL', KEYS[2])
+    redis.call('RPUSH', KEYS[2], 1)
+end
+"""
+
+# ZRANGEBYSCORE + lease in one round trip, atomic across dispatchers.
+_CLAIM = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, name in ipairs(due) do
+    redis.call('ZADD', KEYS[1], 'XX', ARGV[3], name)
+end
+return due
+"""
+
+# Remove claimed entries still at their lease score; one rescheduled by a
+# newer login in the meantime stays.
+_ACK = """
+local removed = 0
+for i = 2, #ARGV do
+    if tonumber(redis.call('ZSCORE', KEYS[1], ARGV[i])) == tonumber(ARGV[1]) then
+        removed = removed + redis.call('ZREM', KEYS[1], ARGV[i])
+    end
+end
+return removed
+"""
+
+
+def due_at(last_login: datetime) -> float:
+    return last_login.timestamp() + settings.BEDMAGE_REMINDER_MINUTES * 60
+
+
+def schedule(name: str, last_login: datetime, *, now: float) -> bool:
+    """Schedule `name`'s reminder for `last_login`; False if that reminder is
+    long past. Redis errors are logged, not raised — a scrape must not fail
+    over its bookkeeping; the next dispatcher start re-seeds the reminder."""
+    due = due_at(last_login)
+    if due < now - MISSED_GRACE:
+        return False
+    try:
+        get_redis().eval(_SCHEDULE, 2, DUE_KEY, WAKE_KEY, repr(due), name)
+    except redis.RedisError:
+        logger.warning("Could not schedule the reminder for %s", name, exc_info=True)
+        return False
+    return True
+
+
+def seed(entries: Iterable[tuple[str, datetime]], *, now: float) -> int:
+    """Add reminders not yet in the queue; returns how many were added."""
+    batch = {
+        name: due
+        for name, last_login in entries
+        if (due := due_at(last_login)) >= now - MISSED_GRACE
+    }
+    if not batch:
+        return 0
+    return cast(int, get_redis().zadd(DUE_KEY, batch, nx=True))
+
+
+def claim_due(now: float, limit: int) -> tuple[list[str], float]:
+    """Up to `limit` names due at `now`, and the lease score they now hold
+    (for `ack`)."""
+    lease = now + CLAIM_LEASE
+    due = get_redis().eval(_CLAIM, 1, DUE_KEY, now, limit, repr(lease))
+    return [name.decode() for name in cast(list[bytes], due)], lease
+
+
+def ack(names: list[str], lease: float) -> int:
+    """Drop claimed entries whose tasks are queued."""
+    if not names:
+        return 0
+    return cast(int, get_redis().eval(_ACK, 1, DUE_KEY, repr(lease), *names))
+
+
+def next_wakeup() -> float | None:
+    """Epoch second of the earliest due entry; None if nothing is scheduled."""
+    head = cast(
+        list[tuple[bytes, float]], get_redis().zrange(DUE_KEY, 0, 0, withscores=True)
+    )
+    return head[0][1] if head else None
+
+
+def wait(timeout: float) -> bool:
+    """Block up to `timeout` seconds for a wake token; True if one came."""
+    if timeout < 0.01:
+        return False  # BLPOP treats 0 as "forever"
+    return get_redis().blpop([WAKE_KEY], timeout=timeout) is not None
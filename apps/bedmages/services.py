@@ -0,0 +1,89 @@
+import logging
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from typing import cast
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from apps.bedmages.models import BedmageWatch
+from apps.characters.models import Character
+from apps.notifications import services as notifications
+from config import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def watched_logins(since: datetime) -> Iterator[tuple[str, datetime]]:
+    """(name, last_login) of watched characters that logged in after `since`."""
+    rows = Character.objects.filter(
+        last_login__gt=since,  # never NULL past this filter
+        id__in=BedmageWatch.objects.values("character_id"),
+    ).values_list("name", "last_login")
+    return cast("Iterator[tuple[str, datetime]]", rows.iterator())
+
+
+def poll_period(watched: int, characters: int) -> float:
+    """Seconds between login fast-lane rounds (`LoginSpider`).
+
+    `LOGIN_POLL_SECONDS`, stretched when needed so that the lane sends at most
+    `LOGIN_POLL_BUDGET_RATIO` times the request rate of the full-profile
+    schedule (`characters` per `CHARACTER_SCRAPE_INTERVAL_MINUTES`): the two
+    lanes have separate budgets, and the fast one cannot crowd out the other.
+    """
+    if not watched:
+        return float(settings.LOGIN_POLL_SECONDS)
+    sweep_rate = characters / (settings.CHARACTER_SCRAPE_INTERVAL_MINUTES * 60)
+    budget = settings.LOGIN_POLL_BUDGET_RATIO * sweep_rate
+    return max(float(settings.LOGIN_POLL_SECONDS), watched / budget)
+
+
+def login_poll_round() -> tuple[list[str], float]:
+    """Characters to poll in one fast-lane round, and the seconds until the
+    next round should start."""
+    names = list(
+        Character.objects.filter(id__in=BedmageWatch.objects.values("character_id"))
+        .order_by("name")
+        .values_list("name", flat=True)
+    )
+    return names, poll_period(len(names), Character.objects.count())
+
+
+def remind(name: str, *, now: datetime) -> list[BedmageWatch]:
+    """Mark `name`'s watches reminded about its current `last_login`, queue
+    their Discord messages in the same transaction, and return them; empty
+    if the reminder is not due (a newer login moved it) or every watch was
+    already reminded.
+
+    Idempotent: the `reminded_login` update is the claim, taken under row
+    locks, so a reminder fired twice reaches each watcher once.
+    """
+    character = Character.objects.filter(name=name).values("id", "last_login").first()
+    if character is None or character["last_login"] is None:
+        return []
+    last_login: datetime = character["last_login"]
+    due = last_login + timedelta(minutes=settings.BEDMAGE_REMINDER_MINUTES)
+    if due > now:
+        return []
+
+    with transaction.atomic():
+        watches = list(
+            BedmageWatch.objects.select_for_update()
+            .select_related("user")
+            .filter(character_id=character["id"])
+            .filter(Q(reminded_login__isnull=True) | Q(reminded_login__lt=last_login))
+        )
+        BedmageWatch.objects.filter(pk__in=[watch.pk for watch in watches]).update(
+            reminded_login=last_login
+        )
+        notifications.remind_watchers(watches, name, last_login)
+    if watches:
+        metrics.REMINDER_LAG_SECONDS.observe((now - due).total_seconds())
+        logger.info(
+            "Bedmage %s rested (logged in %s): reminding %s",
+            name,
+            last_login.isoformat(),
+            ", ".join(watch.user.username for watch in watches),
+        )
+    return watches
@@ -0,0 +1,34 @@
+import time
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.bedmages import reminders
+from apps.bedmages.models import BedmageWatch
+from apps.characters.models import Character
+from apps.characters.signals import last_login_changed
+
+
+@receiver(last_login_changed)
+def schedule_reminder(
+    sender: type[Character], character: Character, **kwargs: Any
+) -> None:
+    """A watched character logged in again: its reminder moves to the new login."""
+    if character.last_login is None:
+        return
+    if BedmageWatch.objects.filter(character=character).exists():
+        reminders.schedule(character.name, character.last_login, now=time.time())
+
+
+@receiver(post_save, sender=BedmageWatch)
+def schedule_new_watch(
+    sender: type[BedmageWatch], instance: BedmageWatch, created: bool, **kwargs: Any
+) -> None:
+    """A new watch on a character already resting gets that reminder too."""
+    name, last_login = instance.character.name, instance.character.last_login
+    if created and last_login is not None:
+        transaction.on_commit(
+            lambda: reminders.schedule(name, last_login, now=time.time())
+        )
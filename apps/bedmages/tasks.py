@@ -0,0 +1,11 @@
+from celery import shared_task
+from django.utils import timezone
+
+from apps.bedmages import services
+
+
+@shared_task
+def send_bedmage_reminder(name: str) -> int:
+    """Remind everyone watching `name` that its bedmage has rested (queued
+    by the `dispatch_reminders` dispatcher); returns how many were reminded."""
+    return len(services.remind(name, now=timezone.now()))
@@ -1,6 +1,29 @@
+import logging
+import time
+from typing import Any
+
+import redis
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from apps.characters import cache as character_cache
+from apps.characters import schedule
 from apps.characters.models import Character
 
+logger = logging.getLogger(__name__)
+
+
+def _watch(name: str) -> None:
+    """Add `name` to the scrape schedule. Redis errors are logged, not
+    raised: the save already committed, and the dispatcher seeds anything
+    missing when it starts."""
+    try:
+        schedule.seed([(name, None)], now=time.time())
+    except redis.RedisError:
+        logger.warning("Could not schedule %s", name, exc_info=True)
+
 
 @admin.register(Character)
 class CharacterAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
@@ -8,3 +31,28 @@ class CharacterAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_filter = ("vocation", "world")
     search_fields = ("name",)
     readonly_fields = ("last_scraped_at",)
+    ordering = ["-level"]
+
+    def save_model(
+        self, request: HttpRequest, obj: Character, form: Any, change: bool
+    ) -> None:
+        super().save_model(request, obj, form, change)
+        if change and "name" in form.changed_data:
+            character_cache.invalidate([form.initial["name"]])
+        character_cache.refresh([obj])
+        if not change or "name" in form.changed_data:
+            # Watch it from now on, once the save commits; the old name
+            # drops out when it comes due.
+            name = obj.name
+            transaction.on_commit(lambda: _watch(name))
+
+    def delete_model(self, request: HttpRequest, obj: Character) -> None:
+        super().delete_model(request, obj)
+        character_cache.invalidate([obj.name])
+
+    def delete_queryset(
+        self, request: HttpRequest, queryset: QuerySet[Character]
+    ) -> None:
+        names = list(queryset.values_list("name", flat=True))
+        super().delete_queryset(request, queryset)
+        character_cache.invalidate(names)
@@ -0,0 +1,125 @@
+"""Read-through cache for character rows, keyed by normalized name.
+
+Entries hold a serialized row (concrete field values), not a pickled model
+instance, so a Django upgrade never makes cached entries unreadable. A
+negative entry (`{}`) records "no such character" so repeated lookups of
+unknown names don't reach Postgres either.
+
+Freshness: writers call `refresh()` which overwrites the entries once the
+surrounding transaction commits, while readers only ever fill a missing key
+with `add()`. A reader that loaded an old row just before a scrape committed
+therefore cannot clobber the fresh entry — the cache is never staler than
+the last completed scrape.
+
+The backend is `CACHES["default"]`: Redis in production (shared by the ASGI
+workers and the `scrape_character` subprocesses, so write-through is visible
+everywhere), LocMem — an in-process LRU — for single-process dev and tests.
+Cache failures are logged and treated as misses; they never fail a read or
+a write.
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.characters.models import Character
+from apps.characters.services import normalize_character_name
+from config.cache_stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+# Bump the version when Character's concrete fields change.
+KEY_PREFIX = "characters:v1:"
+
+Row = dict[str, Any]
+
+stats = CacheStats()
+
+
+def cache_key(normalized_name: str) -> str:
+    # Names contain spaces, which Django flags as non-portable cache keys.
+    return KEY_PREFIX + quote(normalized_name)
+
+
+def _serialize(character: Character | None) -> Row:
+    if character is None:
+        return {}
+    return {
+        field.attname: getattr(character, field.attname)
+        for field in Character._meta.concrete_fields
+    }
+
+
+def _deserialize(row: Row) -> Character | None:
+    if not row:
+        return None
+    return Character.from_db("default", list(row), list(row.values()))
+
+
+async def aget_many(keys: Iterable[str]) -> dict[str, Character | None]:
+    """Cached entries for the given normalized names.
+
+    Keys absent from the result are misses; a key mapped to None is a cached
+    "does not exist".
+    """
+    by_cache_key = {cache_key(key): key for key in keys}
+    try:
+        rows: dict[str, Row] = await cache.aget_many(list(by_cache_key))
+    except Exception:
+        logger.warning("Character cache read failed", exc_info=True)
+        rows = {}
+
+    found = {by_cache_key[ck]: _deserialize(row) for ck, row in rows.items()}
+    stats.hits += len(found)
+    stats.misses += len(by_cache_key) - len(found)
+    return found
+
+
+async def afill(loaded: Mapping[str, Character | None]) -> None:
+    """Populate misses after a DB read — `add()` so a concurrent write-through wins."""
+    timeout = settings.CHARACTER_CACHE_TTL
+    try:
+        for key, character in loaded.items():
+            await cache.aadd(cache_key(key), _serialize(character), timeout)
+    except Exception:
+        logger.warning("Character cache fill failed", exc_info=True)
+
+
+def refresh(characters: Iterable[Character]) -> None:
+    """Write-through: overwrite entries with these rows once the transaction commits.
+
+    Call from every path that writes Character rows, bulk ones included.
+    Outside a transaction the write happens immediately.
+    """
+    rows = {
+        cache_key(normalize_character_name(character.name)): _serialize(character)
+        for character in characters
+    }
+    if rows:
+        transaction.on_commit(lambda: _set_many(rows))
+
+
+def invalidate(names: Iterable[str]) -> None:
+    """Drop entries (e.g. after a delete) once the transaction commits."""
+    keys = [cache_key(normalize_character_name(name)) for name in names]
+    if keys:
+        transaction.on_commit(lambda: _delete_many(keys))
+
+
+def _set_many(rows: dict[str, Row]) -> None:
+    try:
+        cache.set_many(rows, settings.CHARACTER_CACHE_TTL)
+    except Exception:
+        logger.warning("Character cache write-through failed", exc_info=True)
+
+
+def _delete_many(keys: list[str]) -> None:
+    try:
+        cache.delete_many(keys)
+    except Exception:
+        logger.warning("Character cache invalidation failed", exc_info=True)
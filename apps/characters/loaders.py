@@ -0,0 +1,42 @@
+from strawberry.dataloader import DataLoader
+
+from apps.characters import cache as character_cache
+from apps.characters.models import Character
+from apps.characters.services import (
+    find_characters_by_names,
+    find_ranks,
+    normalize_character_name,
+)
+
+
+async def load_characters(keys: list[str]) -> list[Character | None]:
+    """DataLoader batch fn — `keys` are normalized names, result is aligned to them.
+
+    Every `load()` scheduled in the same event-loop tick lands here as one
+    list, so N aliased `character(...)` fields (or a `characters([...])`
+    list) cost a single SELECT — and only for names the character cache
+    could not answer.
+    """
+    found = await character_cache.aget_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        loaded: dict[str, Character | None] = dict.fromkeys(missing)
+        async for character in find_characters_by_names(missing):
+            loaded[normalize_character_name(character.name)] = character
+        await character_cache.afill(loaded)
+        found.update(loaded)
+    return [found[key] for key in keys]
+
+
+def character_loader() -> DataLoader[str, Character | None]:
+    return DataLoader(load_fn=load_characters)
+
+
+async def load_ranks(keys: list[int]) -> list[int | None]:
+    """DataLoader batch fn — `keys` are character ids; None for unranked."""
+    ranks = {pk: rank async for pk, rank in find_ranks(keys)}
+    return [ranks.get(key) for key in keys]
+
+
+def rank_loader() -> DataLoader[int, int | None]:
+    return DataLoader(load_fn=load_ranks)
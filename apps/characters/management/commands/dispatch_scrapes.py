@@ -0,0 +1,62 @@
+import logging
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.characters import schedule
+from apps.characters.models import Character
+from apps.characters.tasks import refresh_leaderboard, scrape_character
+
+logger = logging.getLogger(__name__)
+
+# The leaderboard snapshot is refreshed at most this often while scrapes flow.
+LEADERBOARD_REFRESH_SECONDS = 5 * 60
+
+
+class Command(BaseCommand):
+    help = "Queue character scrapes as they come due (see apps.characters.schedule)."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch", type=int, default=100, help="Names claimed per tick"
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=5.0,
+            help="Seconds between checks when nothing is due soon; bounds how "
+            "late a newly added character is picked up",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Dispatch what is due now and exit"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        added = schedule.seed(
+            Character.objects.values_list("name", "last_scraped_at").iterator(),
+            now=time.time(),
+        )
+        logger.info("dispatch_scrapes: seeded %d characters", added)
+
+        last_refresh = 0.0
+        while True:
+            now = time.time()
+            names = schedule.claim_due(now, options["batch"])
+            for name in names:
+                scrape_character.delay(name)
+            if names:
+                logger.info("dispatch_scrapes: queued %d scrapes", len(names))
+                if now - last_refresh >= LEADERBOARD_REFRESH_SECONDS:
+                    # Let the scrapes just queued land first.
+                    refresh_leaderboard.apply_async(countdown=60)
+                    last_refresh = now
+            if options["once"]:
+                self.stdout.write(f"Queued {len(names)} scrapes")
+                return
+            if len(names) == options["batch"]:
+                continue  # backlog: claim the next batch straight away
+            wakeup = schedule.next_wakeup()
+            delay = options["max_sleep"] if wakeup is None else wakeup - time.time()
+            time.sleep(min(max(delay, 0.0), options["max_sleep"]))
@@ -0,0 +1,33 @@
+import os
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.characters import zygote
+
+
+class Command(BaseCommand):
+    help = (
+        "Preload the scraper once and fork a scrape_character child per job "
+        "(see apps.characters.zygote). Tasks use it when SCRAPE_ZYGOTE_SOCKET "
+        "is set."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--socket",
+            default=settings.SCRAPE_ZYGOTE_SOCKET,
+            help="Unix socket to listen on (default: SCRAPE_ZYGOTE_SOCKET)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not hasattr(os, "fork"):
+            raise CommandError("The scrape zygote needs os.fork (not on Windows)")
+        if not options["socket"]:
+            raise CommandError("Pass --socket or set SCRAPE_ZYGOTE_SOCKET")
+        try:
+            zygote.serve(options["socket"])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.4 on 2026-10-19 09:12
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("characters", "0003_seed_default_periodic_task"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="character",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower("name"),
+                    name="text_pattern_ops",
+                ),
+                name="characters_name_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="character",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="characters_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
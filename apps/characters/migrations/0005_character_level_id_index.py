@@ -0,0 +1,18 @@
+# Generated by Django 6.0.4 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("characters", "0004_character_name_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="character",
+            index=models.Index(
+                fields=["-level", "-id"], name="characters_level_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 6.0.4 on 2026-10-19 13:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW characters_leaderboard AS
+SELECT
+    id AS character_id,
+    world,
+    vocation,
+    level,
+    RANK() OVER (ORDER BY level DESC) AS rank,
+    RANK() OVER (PARTITION BY world ORDER BY level DESC) AS world_rank,
+    RANK() OVER (PARTITION BY vocation ORDER BY level DESC) AS vocation_rank,
+    RANK() OVER (PARTITION BY world, vocation ORDER BY level DESC)
+        AS world_vocation_rank
+FROM characters_character
+WHERE level IS NOT NULL;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY; also serves `rank`.
+CREATE UNIQUE INDEX characters_leaderboard_pk
+    ON characters_leaderboard (character_id);
+-- Keyset pages of `leaderboard` for each filter combination.
+CREATE INDEX characters_leaderboard_level_idx
+    ON characters_leaderboard (level DESC, character_id DESC);
+CREATE INDEX characters_leaderboard_world_idx
+    ON characters_leaderboard (world, level DESC, character_id DESC);
+CREATE INDEX characters_leaderboard_voc_idx
+    ON characters_leaderboard (vocation, level DESC, character_id DESC);
+CREATE INDEX characters_leaderboard_world_voc_idx
+    ON characters_leaderboard (world, vocation, level DESC, character_id DESC);
+"""
+
+DROP_VIEW = "DROP MATERIALIZED VIEW IF EXISTS characters_leaderboard;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("characters", "0005_character_level_id_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="character",
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name="character",
+            index=models.Index(
+                fields=["world", "vocation", "-level", "-id"],
+                name="characters_world_voc_lvl_idx",
+            ),
+        ),
+        migrations.RunSQL(CREATE_VIEW, DROP_VIEW),
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "character",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="characters.character",
+                    ),
+                ),
+                ("world", models.CharField(max_length=32)),
+                ("vocation", models.CharField(max_length=32)),
+                ("level", models.PositiveIntegerField()),
+                ("rank", models.PositiveIntegerField()),
+                ("world_rank", models.PositiveIntegerField()),
+                ("vocation_rank", models.PositiveIntegerField()),
+                ("world_vocation_rank", models.PositiveIntegerField()),
+            ],
+            options={
+                "db_table": "characters_leaderboard",
+                "managed": False,
+            },
+        ),
+    ]
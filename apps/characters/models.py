@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import PositiveIntegerField, CharField, DateTimeField
+from django.db.models.functions import Lower
 
 
 class Character(models.Model):
@@ -16,7 +18,61 @@ class Character(models.Model):
     last_scraped_at = DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-level"]
+        # No default ordering: it would sort every unqualified queryset
+        # (e.g. the scrape batch's full-table scan). Order explicitly.
+        indexes = [
+            # `text_pattern_ops` serves both `lower(name) = %s` (normalized
+            # lookup) and `lower(name) LIKE 'prefix%'` regardless of the
+            # database collation.
+            models.Index(
+                OpClass(Lower("name"), name="text_pattern_ops"),
+                name="characters_name_lower_idx",
+            ),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="characters_name_trgm_idx",
+            ),
+            # Keyset pagination order of the `allCharacters` connection.
+            models.Index(fields=["-level", "-id"], name="characters_level_id_idx"),
+            # Live "top N in world/vocation" queries.
+            models.Index(
+                fields=["world", "vocation", "-level", "-id"],
+                name="characters_world_voc_lvl_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} (level {self.level})"
+
+
+class LeaderboardEntry(models.Model):
+    """Row of the `characters_leaderboard` materialized view.
+
+    A snapshot of every ranked (non-NULL level) character with its RANK()
+    overall, per world, per vocation and per world+vocation — ties share a
+    rank. Refreshed concurrently after each scrape batch
+    (`services.refresh_leaderboard`), so it lags live levels by at most one
+    batch. Lookups by character and keyset pages per scope are index scans.
+    """
+
+    character = models.OneToOneField(
+        Character,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        related_name="+",
+    )
+    world = CharField(max_length=32)
+    vocation = CharField(max_length=32)
+    level = PositiveIntegerField()
+    rank = PositiveIntegerField()
+    world_rank = PositiveIntegerField()
+    vocation_rank = PositiveIntegerField()
+    world_vocation_rank = PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = "characters_leaderboard"
+
+    def __str__(self) -> str:
+        return f"#{self.rank} {self.character_id} (level {self.level})"
@@ -0,0 +1,117 @@
+"""Due-time schedule of character scrapes, kept in a Redis sorted set.
+
+Each watched character is a member of `DUE_KEY` scored by the epoch second
+its next scrape is due. A successful scrape reschedules its character
+(`upsert_character` → `schedule`), and the dispatcher (`dispatch_scrapes`
+command) claims whatever is due and queues one `scrape_character` task per
+name — the cost of a tick is O(due · log n), not a scan of the watchlist.
+
+Spreading: every character has a stable phase inside the scrape interval
+(a hash of its name), and its due time is always the next instant at that
+phase. A watchlist of 600 characters on a 60-minute interval is scraped
+about ten a minute, not 600 at the top of the hour.
+
+Claiming pushes the claimed entries' score `CLAIM_LEASE` into the future
+instead of removing them; a scrape that fails or a worker that dies simply
+comes due again when the lease runs out. A scrape that finishes without an
+item (a name the site no longer has) is rescheduled an interval ahead, so it
+isn't retried every lease.
+"""
+
+import logging
+import zlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import cast
+
+import redis
+from django.conf import settings
+
+from config.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = "characters:due"
+# Seconds a claimed entry is held back before it is retried.
+CLAIM_LEASE = 10 * 60
+
+# ZRANGEBYSCORE + lease in one round trip, atomic across dispatchers.
+_CLAIM = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, name in ipairs(due) do
+    redis.call('ZADD', KEYS[1], 'XX', ARGV[3], name)
+end
+return due
+"""
+
+
+def interval() -> int:
+    return settings.CHARACTER_SCRAPE_INTERVAL_MINUTES * 60
+
+
+def phase(name: str) -> int:
+    """Stable offset of `name` within the interval, in seconds."""
+    return zlib.crc32(name.encode()) % interval()
+
+
+def next_due(name: str, scraped_at: float) -> float:
+    """First instant at `name`'s phase at least half an interval after
+    `scraped_at` — one interval later in steady state, and a newly added
+    character waits at most 1.5 intervals to fall in step."""
+    period = interval()
+    earliest = scraped_at + period / 2
+    offset = phase(name)
+    slots = -(-(earliest - offset) // period)  # ceil
+    return slots * period + offset
+
+
+def schedule(name: str, scraped_at: datetime) -> None:
+    """(Re)schedule `name` after a scrape. Redis errors are logged, not
+    raised — a scrape must not fail over its bookkeeping; the next
+    dispatcher start re-seeds anything missing."""
+    try:
+        get_redis().zadd(DUE_KEY, {name: next_due(name, scraped_at.timestamp())})
+    except redis.RedisError:
+        logger.warning("Could not schedule %s", name, exc_info=True)
+
+
+def seed(entries: Iterable[tuple[str, datetime | None]], *, now: float) -> int:
+    """Add characters not yet in the schedule; returns how many were added.
+
+    Never-scraped and overdue characters are due at their phase within the
+    next interval, so a fresh or long-stopped watchlist is spread out from
+    the start rather than scraped in one burst.
+    """
+    added = 0
+    client = get_redis()
+    batch: dict[str, float] = {}
+    overdue = now - interval() / 2
+    for name, scraped_at in entries:
+        last = max(scraped_at.timestamp(), overdue) if scraped_at else overdue
+        batch[name] = next_due(name, last)
+        if len(batch) >= 1000:
+            added += cast(int, client.zadd(DUE_KEY, batch, nx=True))
+            batch.clear()
+    if batch:
+        added += cast(int, client.zadd(DUE_KEY, batch, nx=True))
+    return added
+
+
+def unschedule(names: Iterable[str]) -> None:
+    names = list(names)
+    if names:
+        get_redis().zrem(DUE_KEY, *names)
+
+
+def claim_due(now: float, limit: int) -> list[str]:
+    """Up to `limit` names due at `now`, leased for `CLAIM_LEASE` seconds."""
+    due = get_redis().eval(_CLAIM, 1, DUE_KEY, now, limit, now + CLAIM_LEASE)
+    return [name.decode() for name in cast(list[bytes], due)]
+
+
+def next_wakeup() -> float | None:
+    """Epoch second of the earliest due entry; None if nothing is scheduled."""
+    head = cast(
+        list[tuple[bytes, float]], get_redis().zrange(DUE_KEY, 0, 0, withscores=True)
+    )
+    return head[0][1] if head else None
@@ -1,9 +1,21 @@
+from enum import Enum
+
 import strawberry
 import strawberry_django
 from strawberry import auto
-from apps.characters.models import Character
+from apps.characters.models import Character, LeaderboardEntry
+from apps.characters import services
+from apps.characters import cache as character_cache
 from typing import cast
 
+from config.cache_stats import CacheStatsType
+from config.optimizer import optimize, optimize_connection
+from config.pagination import Connection, decode_cursor, encode_cursor, keyset_page
+from config.permissions import require_staff
+
+CURSOR_KIND = "character"
+LEADERBOARD_CURSOR_KIND = "leaderboard"
+
 
 @strawberry_django.type(Character)
 class CharacterType:
@@ -19,10 +31,134 @@ class CharacterType:
     account_status: auto
     last_scraped_at: auto
 
+    @strawberry.field
+    async def rank(self, root: Character, info: strawberry.Info) -> int | None:
+        """Overall level rank as of the last leaderboard refresh (ties share a
+        rank); null until the character has been ranked."""
+        result = await info.context.rank_loader.load(root.pk)
+        return cast("int | None", result)
+
+
+@strawberry_django.type(LeaderboardEntry)
+class LeaderboardEntryType:
+    level: auto
+    character: CharacterType
+
+    @strawberry.field
+    def rank(self, root: LeaderboardEntry) -> int:
+        """Rank within the requested world/vocation scope."""
+        return cast(int, getattr(root, "scope_rank"))
+
+
+@strawberry.enum
+class CharacterSearchMode(Enum):
+    PREFIX = "prefix"
+    FUZZY = "fuzzy"
+
+
+def _cursor(character: Character) -> str:
+    return encode_cursor(CURSOR_KIND, character.level, character.pk)
+
+
+def _position(after: str | None) -> tuple[int, int] | None:
+    if after is None:
+        return None
+    try:
+        level, pk = decode_cursor(CURSOR_KIND, after)
+        return int(level), int(pk)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
+def _leaderboard_cursor(entry: LeaderboardEntry) -> str:
+    return encode_cursor(LEADERBOARD_CURSOR_KIND, entry.level, entry.character_id)
+
+
+def _leaderboard_position(after: str | None) -> tuple[int, int] | None:
+    if after is None:
+        return None
+    try:
+        level, pk = decode_cursor(LEADERBOARD_CURSOR_KIND, after)
+        return int(level), int(pk)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
 
 @strawberry.type
 class Query:
     @strawberry.field
-    async def character(self, name: str) -> CharacterType | None:
-        result = await Character.objects.filter(name=name).afirst()
+    async def character(self, info: strawberry.Info, name: str) -> CharacterType | None:
+        result = await info.context.character_loader.load(
+            services.normalize_character_name(name)
+        )
         return cast("CharacterType | None", result)
+
+    @strawberry.field
+    async def characters(
+        self, info: strawberry.Info, names: list[str]
+    ) -> list[CharacterType | None]:
+        if len(names) > services.BATCH_LOOKUP_MAX:
+            raise ValueError(f"At most {services.BATCH_LOOKUP_MAX} names per request")
+        result = await info.context.character_loader.load_many(
+            [services.normalize_character_name(name) for name in names]
+        )
+        return cast("list[CharacterType | None]", result)
+
+    @strawberry.field
+    async def search_characters(
+        self,
+        info: strawberry.Info,
+        query: str,
+        mode: CharacterSearchMode = CharacterSearchMode.PREFIX,
+        limit: int = 10,
+    ) -> list[CharacterType]:
+        qs = optimize(
+            services.search_characters(
+                query, fuzzy=mode is CharacterSearchMode.FUZZY, limit=limit
+            ),
+            info,
+        )
+        return cast("list[CharacterType]", [c async for c in qs])
+
+    @strawberry.field
+    async def all_characters(
+        self,
+        info: strawberry.Info,
+        first: int | None = None,
+        after: str | None = None,
+    ) -> Connection[CharacterType]:
+        """All scraped characters, highest level first (keyset-paginated)."""
+        qs = optimize_connection(
+            services.characters_by_level_after(_position(after)), info, only=["level"]
+        )
+        result = await keyset_page(qs, first=first, after=after, cursor_for=_cursor)
+        return cast("Connection[CharacterType]", result)
+
+    @strawberry.field
+    async def leaderboard(
+        self,
+        info: strawberry.Info,
+        world: str | None = None,
+        vocation: str | None = None,
+        first: int | None = None,
+        after: str | None = None,
+    ) -> Connection[LeaderboardEntryType]:
+        """Top characters by level, optionally per world and/or vocation, with
+        their rank there. Reflects the last completed scrape batch."""
+        qs = optimize_connection(
+            services.leaderboard_after(
+                _leaderboard_position(after), world=world, vocation=vocation
+            ),
+            info,
+            only=["level"],
+        )
+        result = await keyset_page(
+            qs, first=first, after=after, cursor_for=_leaderboard_cursor
+        )
+        return cast("Connection[LeaderboardEntryType]", result)
+
+    @strawberry.field
+    async def character_cache_stats(self, info: strawberry.Info) -> CacheStatsType:
+        """Hit/miss counters of the serving process (staff only)."""
+        await require_staff(info)
+        return CacheStatsType.from_stats(character_cache.stats)
@@ -1,32 +1,237 @@
-from django.db import IntegrityError, transaction
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
 
-from apps.characters.models import Character
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Length, Lower
+
+from apps.characters import schedule, signals
+from apps.characters.models import Character, LeaderboardEntry
 from apps.characters.types import CharacterPayload
+from config import metrics
+
+SEARCH_LIMIT_MAX = 50
+BATCH_LOOKUP_MAX = 100
+
+
+def normalize_character_name(name: str) -> str:
+    """Collapse whitespace runs and lowercase — `"  go  Diego go"` → `"go diego go"`.
+
+    Lowercasing mirrors SQL `LOWER()` so the result can be compared against
+    the `characters_name_lower_idx` functional index.
+    """
+    return " ".join(name.split()).lower()
+
+
+def find_characters_by_name(name: str) -> QuerySet[Character]:
+    """Case- and spacing-insensitive exact-name lookup.
+
+    Filters on `lower(name)` so Postgres serves it from
+    `characters_name_lower_idx` instead of a seq scan.
+    """
+    return Character.objects.alias(name_lower=Lower("name")).filter(
+        name_lower=normalize_character_name(name)
+    )
+
+
+def find_characters_by_names(names: Iterable[str]) -> QuerySet[Character]:
+    """Batch variant of `find_characters_by_name` — one `lower(name) IN (...)`
+    probe on `characters_name_lower_idx` regardless of how many names."""
+    keys = {normalize_character_name(name) for name in names}
+    return Character.objects.alias(name_lower=Lower("name")).filter(name_lower__in=keys)
+
+
+def search_characters(
+    query: str, *, fuzzy: bool = False, limit: int = 10
+) -> QuerySet[Character]:
+    """Ranked, limited name search.
+
+    Prefix mode matches `lower(name) LIKE 'query%'` (btree
+    `characters_name_lower_idx`) and ranks shorter names first, so an exact
+    match always leads. Fuzzy mode uses the pg_trgm `%` operator (GIN
+    `characters_name_trgm_idx`) and ranks by trigram similarity — tolerant of
+    typos such as "Yhrall".
+    """
+    term = normalize_character_name(query)
+    limit = min(max(limit, 1), SEARCH_LIMIT_MAX)
+    if not term:
+        return Character.objects.none()
+
+    if fuzzy:
+        return (
+            Character.objects.filter(name__trigram_similar=term)
+            .annotate(similarity=TrigramSimilarity("name", term))
+            .order_by("-similarity", "name")[:limit]
+        )
+
+    return (
+        Character.objects.alias(name_lower=Lower("name"))
+        .filter(name_lower__startswith=term)
+        .order_by(Length("name"), "name")[:limit]
+    )
+
+
+def characters_by_level_after(position: tuple[int, int] | None) -> QuerySet[Character]:
+    """Characters highest level first, strictly after `position` = (level, id).
+
+    Unscraped characters (NULL level) have no rank and are left out. The
+    keyset predicate is a range scan on `characters_level_id_idx`.
+    """
+    qs = Character.objects.filter(level__isnull=False).order_by("-level", "-id")
+    if position is not None:
+        level, pk = position
+        qs = qs.filter(level__lte=level).filter(
+            Q(level__lt=level) | Q(level=level, id__lt=pk)
+        )
+    return qs
+
+
+def leaderboard_after(
+    position: tuple[int, int] | None,
+    *,
+    world: str | None = None,
+    vocation: str | None = None,
+) -> QuerySet[LeaderboardEntry]:
+    """Leaderboard rows highest level first, strictly after `position` =
+    (level, character id), optionally within a world and/or vocation.
+
+    Each row carries `scope_rank`: its rank within the requested scope. Every
+    filter combination has a matching `characters_leaderboard_*` index, so a
+    page is a range scan, never a sort.
+    """
+    rank_field = {
+        (False, False): "rank",
+        (True, False): "world_rank",
+        (False, True): "vocation_rank",
+        (True, True): "world_vocation_rank",
+    }[(world is not None, vocation is not None)]
+    qs = LeaderboardEntry.objects.annotate(scope_rank=F(rank_field)).order_by(
+        "-level", "-character_id"
+    )
+    if world is not None:
+        qs = qs.filter(world=world)
+    if vocation is not None:
+        qs = qs.filter(vocation=vocation)
+    if position is not None:
+        level, pk = position
+        qs = qs.filter(level__lte=level).filter(
+            Q(level__lt=level) | Q(level=level, character_id__lt=pk)
+        )
+    return qs
+
+
+def find_ranks(
+    character_ids: Iterable[int],
+) -> QuerySet[LeaderboardEntry, tuple[int, int]]:
+    """(character id, overall rank) pairs — a primary-key probe per id."""
+    return LeaderboardEntry.objects.filter(
+        character_id__in=set(character_ids)
+    ).values_list("character_id", "rank")
+
+
+def refresh_leaderboard() -> None:
+    """Recompute the leaderboard snapshot.
+
+    CONCURRENTLY keeps the old snapshot readable while the new one is built
+    (it diffs against the unique `characters_leaderboard_pk` index).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY characters_leaderboard")
 
 
 def upsert_character(payload: CharacterPayload) -> Character:
     """Create or update a Character keyed by `name`.
 
-    update_or_create() is not race-safe: two concurrent scrapes of the
-    same character can both see "no row" and both attempt INSERT. The
-    unique constraint on `name` rejects the loser with IntegrityError;
-    retrying lets its SELECT find the row written by the winner and
-    fall through to UPDATE.
+    The row is read with SELECT … FOR UPDATE and updated in the same
+    transaction (`_write_character`): as many queries as update_or_create()
+    spends, and the values it replaces are the ones this write overwrote.
+    Two concurrent scrapes of a new character can both see "no row" and
+    both attempt INSERT. The unique constraint on `name` rejects the loser
+    with IntegrityError; retrying lets its SELECT find the row written by
+    the winner and fall through to UPDATE.
+
+    The character cache is refreshed with the written row once the
+    caller's transaction commits, so reads never lag the last scrape, and
+    the character's next scrape is scheduled then too, and a new
+    `last_login` is announced (`signals.last_login_changed`).
+
+    Counted as `scraped` in `tibiantis_items_total` when a field changed and
+    `unchanged` when the scrape only confirmed the stored row (which still
+    bumps `last_scraped_at`).
     """
+    # Imported here: the cache module depends on this one for name normalization.
+    from apps.characters import cache as character_cache
+
     name = payload.get("name")
     if not name:
         raise ValueError("CharacterPayload requires non-empty 'name'")
     defaults = {k: v for k, v in payload.items() if k != "name"}
 
     try:
-        with transaction.atomic():
-            character, _ = Character.objects.update_or_create(
-                name=name, defaults=defaults
-            )
+        character, previous = _write_character(name, defaults)
     except IntegrityError:
-        with transaction.atomic():
-            character, _ = Character.objects.update_or_create(
-                name=name, defaults=defaults
-            )
+        character, previous = _write_character(name, defaults)
 
+    character_cache.refresh([character])
+    transaction.on_commit(
+        lambda: schedule.schedule(character.name, character.last_scraped_at)
+    )
+    if "last_login" in defaults and (
+        previous is None or previous["last_login"] != defaults["last_login"]
+    ):
+        transaction.on_commit(
+            lambda: signals.last_login_changed.send(
+                sender=Character, character=character
+            )
+        )
+    outcome = "unchanged" if previous == defaults else "scraped"
+    metrics.count_ingested("character", outcome)
     return character
+
+
+def _write_character(
+    name: str, defaults: dict[str, Any]
+) -> tuple[Character, dict[str, Any] | None]:
+    """Lock `name`'s row and update it from `defaults`, or create it; the row
+    and the values `defaults` replaced (None for a new row)."""
+    with transaction.atomic():
+        character = Character.objects.select_for_update().filter(name=name).first()
+        if character is None:
+            return Character.objects.create(name=name, **defaults), None
+        previous = {field: getattr(character, field) for field in defaults}
+        for field, value in defaults.items():
+            setattr(character, field, value)
+        character.save(update_fields=[*defaults, "last_scraped_at"])
+        return character, previous
+
+
+def record_login(name: str, last_login: datetime | None) -> bool:
+    """Store a `last_login` seen by the login fast lane (`LoginSpider`);
+    True if it was newer than the stored one.
+
+    Only that column is written: `last_scraped_at`, and with it the full
+    profile scrape schedule, belong to `upsert_character`. A new login is
+    announced like one found by a full scrape (`signals.last_login_changed`).
+    """
+    # Imported here: the cache module depends on this one for name normalization.
+    from apps.characters import cache as character_cache
+
+    updated = 0
+    if last_login is not None:
+        updated = (
+            Character.objects.filter(name=name)
+            .filter(Q(last_login__isnull=True) | Q(last_login__lt=last_login))
+            .update(last_login=last_login)
+        )
+    metrics.count_ingested("login", "scraped" if updated else "unchanged")
+    if not updated:
+        return False
+
+    character = Character.objects.get(name=name)
+    character_cache.refresh([character])
+    transaction.on_commit(
+        lambda: signals.last_login_changed.send(sender=Character, character=character)
+    )
+    return True
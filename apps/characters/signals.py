@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by `upsert_character`, after the caller's transaction commits, when a
+# scrape stored a different `last_login` than the row had; `character` is
+# the written row. Bedmage reminders are scheduled from it (apps.bedmages).
+last_login_changed = Signal()
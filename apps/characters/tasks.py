@@ -1,26 +1,166 @@
 import logging
+import os
 import subprocess
 import sys
-from datetime import timedelta
+import tempfile
+import time
+from datetime import datetime, timedelta
 
 from celery import shared_task, Task
 from django.conf import settings
 from django.utils import timezone
 
+from apps.characters import schedule, services, zygote
 from apps.characters.models import Character
+from apps.scraping.models import ScrapeRun, ScrapeRunItem
+from apps.scraping.services import (
+    SCRAPE_REPORT_ENV,
+    RunRecorder,
+    item_from_report,
+    read_report,
+    skipped_item,
+)
+from config import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
+# Seconds one `scrape_character` run may take, subprocess or zygote child.
+SCRAPE_TIMEOUT = 60
+
 
 @shared_task
 def ping() -> str:
     return "pong"
 
 
+@shared_task
+def refresh_leaderboard() -> None:
+    services.refresh_leaderboard()
+
+
+def _staleness(last_scraped_at: datetime | None) -> float | None:
+    if last_scraped_at is None:
+        return None
+    return (timezone.now() - last_scraped_at).total_seconds()
+
+
+def _spawn(name: str, env: dict[str, str]) -> int:
+    """Run `scrape_character name` with `env` added; its exit code.
+
+    Forked from the scrape zygote when one is configured and listening
+    (`apps.characters.zygote`), else a fresh subprocess.
+    """
+    if settings.SCRAPE_ZYGOTE_SOCKET:
+        try:
+            return zygote.run(
+                settings.SCRAPE_ZYGOTE_SOCKET, name, env=env, timeout=SCRAPE_TIMEOUT
+            )
+        except zygote.ZygoteUnavailable:
+            logger.warning(
+                "No scrape zygote on %s; spawning a subprocess",
+                settings.SCRAPE_ZYGOTE_SOCKET,
+            )
+    return subprocess.run(
+        [sys.executable, "manage.py", "scrape_character", name],
+        timeout=SCRAPE_TIMEOUT,
+        check=False,
+        env={**os.environ, **env},
+    ).returncode
+
+
+def _run_scrape(
+    name: str,
+    recorder: RunRecorder | None = None,
+    staleness_seconds: float | None = None,
+) -> bool:
+    """Scrape `name` in a subprocess (or zygote child); True if it succeeded.
+
+    The subprocess reports its phase timings and counts back through a
+    temporary file; with a `recorder`, they become the target's ledger entry.
+    """
+    started_at = timezone.now()
+    started = time.perf_counter()
+    returncode: int | None = None
+    error_class = ""
+    with tempfile.TemporaryDirectory(prefix="scrape-") as report_dir:
+        report_path = os.path.join(report_dir, "report.json")
+        try:
+            with tracing.span("scrape_character.subprocess", character=name) as trace:
+                returncode = _spawn(
+                    name,
+                    {
+                        # The scraper's metrics go to this worker's files (config/metrics.py).
+                        metrics.PROCESS_ID_ENV: f"scrape-{os.getpid()}",
+                        # ...and its spans continue this trace (config/tracing.py).
+                        **tracing.child_env(trace),
+                        SCRAPE_REPORT_ENV: report_path,
+                    },
+                )
+        except BaseException as exc:  # the timeout, mostly
+            error_class = type(exc).__name__
+            raise
+        finally:
+            item = item_from_report(
+                name,
+                started_at=started_at,
+                total_ms=(time.perf_counter() - started) * 1000,
+                returncode=returncode,
+                report=read_report(report_path),
+                staleness_seconds=staleness_seconds,
+                error_class=error_class,
+            )
+            if recorder is not None:
+                recorder.add(item)
+    if item.outcome == ScrapeRunItem.Outcome.FAILED:
+        logger.warning(
+            "scrape_character %s failed: returncode=%s error=%s",
+            name,
+            returncode,
+            item.error_class,
+        )
+        metrics.ITEMS.labels(kind="character", outcome="failed").inc()
+        return False
+    if item.outcome == ScrapeRunItem.Outcome.EMPTY:
+        # The site doesn't know the name (deleted or renamed): nothing reached
+        # upsert_character to reschedule it, and left to the claim lease it
+        # would be retried every CLAIM_LEASE. Try again in an interval.
+        schedule.schedule(name, timezone.now())
+    return True
+
+
+@shared_task
+def scrape_character(name: str) -> bool:
+    """Scrape one character (queued by the `dispatch_scrapes` dispatcher).
+
+    A successful scrape reschedules the character from `upsert_character`,
+    one that found nothing on the site is rescheduled here, and a failed one
+    comes due again once the dispatcher's claim lease expires.
+    Characters deleted since they were scheduled are dropped, not re-created.
+    """
+    with (
+        tracing.span("task.scrape_character", character=name),
+        RunRecorder(
+            ScrapeRun.Kind.CHARACTER, task_id=scrape_character.request.id
+        ) as recorder,
+    ):
+        found = Character.objects.filter(name=name).values("last_scraped_at").first()
+        if found is None:
+            schedule.unschedule([name])
+            metrics.ITEMS.labels(kind="character", outcome="skipped").inc()
+            recorder.add(skipped_item(name))
+            return False
+        return _run_scrape(
+            name, recorder, staleness_seconds=_staleness(found["last_scraped_at"])
+        )
+
+
 @shared_task(bind=True, max_retries=2)
 def scrape_watched_characters(self: Task) -> dict[str, int]:
     """Scrape all Character objects via M1 management command (subprocess).
 
+    Superseded by the due-time schedule (`apps.characters.schedule` and the
+    `dispatch_scrapes` command); kept for one-off full sweeps.
+
     Subprocess isolates Twisted reactor from Celery worker pool — see M1 retro #8
     (3 event loops can't coexist in one process). Per-character failures are
     absorbed in `failed` count, not propagated to retry — `max_retries=2` covers
@@ -30,6 +170,12 @@ def scrape_watched_characters(self: Task) -> dict[str, int]:
     Characters scraped recently — mitigates Beat race when task duration
     overlaps with next fire interval.
 
+    Every target, skipped ones included, is recorded in the run's ledger
+    (`apps.scraping`), written in batches as the sweep goes.
+
+    A batch that scraped anything queues `refresh_leaderboard`, so ranks
+    lag live levels by at most one batch.
+
     Returns: {"scraped": int, "failed": int, "skipped": int}
     """
 
@@ -37,29 +183,26 @@ def scrape_watched_characters(self: Task) -> dict[str, int]:
     cutoff = timezone.now() - timedelta(minutes=threshold_minutes)
 
     scraped = failed = skipped = 0
-    for name, last_scraped_at in Character.objects.values_list(
-        "name", "last_scraped_at"
+    with (
+        tracing.span("task.scrape_watched_characters"),
+        RunRecorder(ScrapeRun.Kind.SWEEP, task_id=self.request.id) as recorder,
     ):
-        if last_scraped_at and last_scraped_at > cutoff:
-            skipped += 1
-            continue
-        result = subprocess.run(
-            [
-                sys.executable,
-                "manage.py",
-                "scrape_character",
-                name,
-            ],
-            timeout=60,
-            check=False,
-        )
-        if result.returncode == 0:
-            scraped += 1
-        else:
-            failed += 1
-            logger.warning(
-                "scrape_character %s failed: returncode=%s", name, result.returncode
-            )
+        for name, last_scraped_at in Character.objects.values_list(
+            "name", "last_scraped_at"
+        ):
+            staleness = _staleness(last_scraped_at)
+            if last_scraped_at and last_scraped_at > cutoff:
+                skipped += 1
+                metrics.ITEMS.labels(kind="character", outcome="skipped").inc()
+                recorder.add(skipped_item(name, staleness))
+                continue
+            if _run_scrape(name, recorder, staleness_seconds=staleness):
+                scraped += 1
+            else:
+                failed += 1
+
+    if scraped:
+        refresh_leaderboard.delay()
 
     summary = {"scraped": scraped, "failed": failed, "skipped": skipped}
     logger.info("scrape_watched_characters: %s", summary)
@@ -0,0 +1,231 @@
+"""Pre-forked `scrape_character` processes.
+
+A cold `scrape_character` subprocess spends most of a second on
+`django.setup()`, Twisted, crochet and Scrapy before its first request (see
+the run's `startup_profile`, `apps.scraping.startup`). The zygote
+(`manage.py scrape_zygote`) pays that once: it preloads the imports, then
+listens on the Unix socket `SCRAPE_ZYGOTE_SOCKET` and forks one child per
+job. The child shares the loaded modules copy-on-write, takes the job's
+environment (report path, trace context, metrics id — what the task would
+give a subprocess) and runs the `scrape_character` command, which installs
+its own reactor.
+
+The zygote itself never installs the reactor or starts crochet's thread:
+threads do not survive a fork, and children sharing one epoll instance
+would receive each other's events. It stays single-threaded and holds no
+database connections for the same reason.
+
+Protocol: the client sends one JSON line, ``{"name": ..., "env": {...}}``;
+the zygote answers ``{"returncode": n}`` once the child exits. A client
+that hangs up first (its timeout) gets the child killed.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+from django.core.management import call_command
+from django.db import connections
+
+from apps.scraping import startup
+from config import scrape_log, tracing
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[str], int]
+
+
+class ZygoteUnavailable(Exception):
+    """Nothing listens on the zygote socket."""
+
+
+def crawl(name: str) -> int:
+    """Run `scrape_character name` in this (forked) process; its exit code."""
+    try:
+        call_command("scrape_character", name)
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else 1
+    except Exception:
+        logger.exception("scrape_character %s failed", name)
+        return 1
+    finally:
+        # The child leaves through os._exit: no atexit handlers.
+        tracing.flush()
+        scrape_log.close()
+    return 0
+
+
+def run(path: str, name: str, *, env: dict[str, str], timeout: float) -> int:
+    """Have the zygote at `path` scrape `name`; the child's exit code.
+
+    Raises `ZygoteUnavailable` if no zygote listens there, and
+    `subprocess.TimeoutExpired` (as `subprocess.run` would) when the child
+    takes longer than `timeout` seconds.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    with sock:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as exc:
+            raise ZygoteUnavailable(path) from exc
+        sock.sendall(json.dumps({"name": name, "env": env}).encode() + b"\n")
+        try:
+            reply = _readline(sock)
+        except TimeoutError:
+            raise subprocess.TimeoutExpired(["scrape_zygote", name], timeout) from None
+    if not reply:
+        raise ConnectionError(f"The scrape zygote at {path} hung up")
+    returncode: int = json.loads(reply)["returncode"]
+    return returncode
+
+
+def serve(path: str, job: Job = crawl) -> None:
+    """Preload, then fork `job(name)` for every request on `path` until
+    interrupted or terminated."""
+    profile = startup.preload()
+    if "twisted.internet.reactor" in sys.modules:
+        raise RuntimeError(
+            "A preloaded module installed a Twisted reactor; forked children "
+            "could not install their own"
+        )
+    connections.close_all()
+    logger.info(
+        "Scrape zygote preloaded in %.0f ms: %s", sum(profile.values()), profile
+    )
+    _Zygote(path, job).serve()
+
+
+class _Zygote:
+    def __init__(self, path: str, job: Job) -> None:
+        self.path = path
+        self.job = job
+        # Child pid → the connection waiting for it (None once it hung up).
+        self.children: dict[int, socket.socket | None] = {}
+        self.selector = selectors.DefaultSelector()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # SIGCHLD wakes the select loop through this pipe.
+        self.wakeup_r, self.wakeup_w = os.pipe()
+
+    def serve(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self.listener.bind(self.path)
+        self.listener.listen()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        os.set_blocking(self.wakeup_r, False)
+        os.set_blocking(self.wakeup_w, False)
+        self.selector.register(self.wakeup_r, selectors.EVENT_READ)
+        signal.set_wakeup_fd(self.wakeup_w)
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        logger.info("Scrape zygote listening on %s", self.path)
+        try:
+            while True:
+                for key, _ in self.selector.select():
+                    if key.fileobj is self.listener:
+                        self._accept()
+                    elif key.fileobj == self.wakeup_r:
+                        with contextlib.suppress(BlockingIOError):
+                            os.read(self.wakeup_r, 512)
+                        self._reap()
+                    else:
+                        self._hung_up(key.fileobj, key.data)  # type: ignore[arg-type]
+        finally:
+            signal.set_wakeup_fd(-1)
+            self.selector.close()
+            self.listener.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    def _accept(self) -> None:
+        conn, _ = self.listener.accept()
+        conn.settimeout(5.0)
+        try:
+            request = json.loads(_readline(conn))
+            name, env = str(request["name"]), dict(request.get("env", {}))
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Dropped a malformed scrape zygote request", exc_info=True)
+            conn.close()
+            return
+        received_at = time.time()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self._become_child(conn)
+                code = self._run_child(name, env, received_at)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = conn
+        self.selector.register(conn, selectors.EVENT_READ, pid)
+
+    def _become_child(self, conn: socket.socket) -> None:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.selector.close()
+        self.listener.close()
+        os.close(self.wakeup_r)
+        os.close(self.wakeup_w)
+        conn.close()
+        for other in self.children.values():
+            if other is not None:
+                other.close()
+
+    def _run_child(self, name: str, env: dict[str, str], received_at: float) -> int:
+        os.environ.update(env)
+        os.environ[tracing.PROCESS_STARTED_AT_ENV] = repr(time.time())
+        tracing.continue_from_env()
+        # From here on the profile is what this child pays.
+        startup.profile.clear()
+        startup.profile["zygote.fork"] = round((time.time() - received_at) * 1000, 3)
+        return self.job(name)
+
+    def _reap(self) -> None:
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = self.children.pop(pid, None)
+            if conn is None:
+                continue
+            self.selector.unregister(conn)
+            reply = {"returncode": os.waitstatus_to_exitcode(status)}
+            with contextlib.suppress(OSError):
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+            conn.close()
+
+    def _hung_up(self, conn: socket.socket, pid: int) -> None:
+        """The client of a running child gave up (or sent more than its one
+        line): kill the child; `_reap` collects it."""
+        self.selector.unregister(conn)
+        conn.close()
+        self.children[pid] = None
+        logger.warning("Scrape zygote client went away; killing child %d", pid)
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGKILL)
+
+
+def _readline(sock: socket.socket) -> bytes:
+    """One newline-terminated message; empty if the peer closed first."""
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(4096)
+        if not chunk:
+            return b""
+        data += chunk
+    return data
@@ -0,0 +1,160 @@
+"""Real-time death feed: Redis pub/sub between processes, in-memory fan-out
+within each ASGI worker.
+
+`publish()` is called once per newly inserted `DeathEvent` (after commit)
+by whichever process ingested it. The message carries the whole row, so
+delivering it never touches Postgres.
+
+Each ASGI worker runs a single `DeathBroadcaster`: one Redis subscription
+for the process however many websocket subscribers it serves. Subscribers
+are bucketed by their `min_level`, so an event is only offered to the
+buckets whose threshold it meets. Every subscriber owns a bounded queue; a
+consumer that can't keep up loses its oldest undelivered events instead of
+growing memory or stalling the others.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+import redis
+from django.conf import settings
+
+from apps.deaths.models import DeathEvent
+from config.redis import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "deaths:added"
+RECONNECT_DELAY = 1.0
+
+
+def serialize(event: DeathEvent) -> str:
+    return json.dumps(
+        {
+            "id": event.pk,
+            "character_name": event.character_name,
+            "level_at_death": event.level_at_death,
+            "killed_by": event.killed_by,
+            "died_at": event.died_at.isoformat(),
+        }
+    )
+
+
+def deserialize(message: str | bytes) -> DeathEvent:
+    """`DeathEvent` rebuilt from a feed message, without a DB read."""
+    data = json.loads(message)
+    return DeathEvent(
+        id=data["id"],
+        character_name=data["character_name"],
+        level_at_death=data["level_at_death"],
+        killed_by=data["killed_by"],
+        died_at=datetime.fromisoformat(data["died_at"]),
+    )
+
+
+def publish(event: DeathEvent) -> None:
+    """Announce a new death to every ASGI worker. Failures are logged only —
+    the row is already committed and `deaths` still serves it."""
+    try:
+        get_redis().publish(CHANNEL, serialize(event))
+    except redis.RedisError:
+        logger.warning("Publishing death %s failed", event.pk, exc_info=True)
+
+
+class DeathBroadcaster:
+    """Per-process fan-out of the Redis death channel to local subscribers."""
+
+    def __init__(self) -> None:
+        self._buckets: defaultdict[int, set[asyncio.Queue[DeathEvent]]] = defaultdict(
+            set
+        )
+        self._listener: asyncio.Task[None] | None = None
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._buckets.values())
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, min_level: int
+    ) -> AsyncIterator[asyncio.Queue[DeathEvent]]:
+        """Queue receiving every death at `level_at_death >= min_level` while
+        the context is open."""
+        queue: asyncio.Queue[DeathEvent] = asyncio.Queue(
+            maxsize=settings.DEATH_FEED_QUEUE_SIZE
+        )
+        self._buckets[min_level].add(queue)
+        self._ensure_listener()
+        try:
+            yield queue
+        finally:
+            bucket = self._buckets[min_level]
+            bucket.discard(queue)
+            if not bucket:
+                del self._buckets[min_level]
+
+    def dispatch(self, event: DeathEvent) -> int:
+        """Hand `event` to every matching subscriber; returns how many got it.
+
+        Runs on the event loop without awaiting, so subscribe/unsubscribe
+        can't change the buckets mid-iteration.
+        """
+        delivered = 0
+        for min_level, queues in self._buckets.items():
+            if event.level_at_death < min_level:
+                continue
+            for queue in queues:
+                if queue.full():
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(event)
+                delivered += 1
+        return delivered
+
+    async def aclose(self) -> None:
+        """Stop the Redis listener (worker shutdown); the next subscriber
+        starts a fresh one."""
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.done():
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+
+    def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        listener = self._listener
+        if listener is None or listener.done() or listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = get_async_redis()
+                async with client, client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._dispatch_message(message["data"])
+            except redis.RedisError:
+                logger.warning(
+                    "Death feed lost its Redis subscription; reconnecting",
+                    exc_info=True,
+                )
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    def _dispatch_message(self, data: bytes) -> None:
+        try:
+            event = deserialize(data)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed death feed message %r", data)
+            return
+        self.dispatch(event)
+
+
+broadcaster = DeathBroadcaster()
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.4 on 2026-10-19 09:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("deaths", "0001_initial"),
+        # pg_trgm extension is created there.
+        ("characters", "0004_character_name_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="deathevent",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["character_name"],
+                name="deaths_char_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.4 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("deaths", "0002_deathevent_character_name_trgm_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="deathevent",
+            name="died_at",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="deathevent",
+            index=models.Index(
+                fields=["-died_at", "-id"], name="deaths_died_at_id_idx"
+            ),
+        ),
+    ]
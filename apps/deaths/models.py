@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 
@@ -5,7 +6,7 @@ class DeathEvent(models.Model):
     character_name = models.CharField(max_length=64, db_index=True)
     level_at_death = models.PositiveIntegerField()
     killed_by = models.TextField(blank=True, default="")
-    died_at = models.DateTimeField(db_index=True)
+    died_at = models.DateTimeField()
     scraped_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -16,6 +17,16 @@ class DeathEvent(models.Model):
                 name="unique_death_event_per_character_time",
             ),
         ]
+        indexes = [
+            GinIndex(
+                fields=["character_name"],
+                opclasses=["gin_trgm_ops"],
+                name="deaths_char_name_trgm_idx",
+            ),
+            # Keyset pagination order of the `deaths` connection; also
+            # serves plain `died_at` range filters.
+            models.Index(fields=["-died_at", "-id"], name="deaths_died_at_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.character_name} (lvl {self.level_at_death}) @ {self.died_at:%Y-%m-%d %H:%M}"
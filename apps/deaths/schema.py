@@ -0,0 +1,88 @@
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from typing import cast
+
+import strawberry
+import strawberry_django
+from django.conf import settings
+from strawberry import auto
+
+from apps.characters.schema import CharacterType
+from apps.characters.services import normalize_character_name
+from apps.deaths import services
+from apps.deaths.broadcast import broadcaster
+from apps.deaths.models import DeathEvent
+from config.optimizer import optimize_connection
+from config.pagination import Connection, decode_cursor, encode_cursor, keyset_page
+from config.permissions import require_authenticated
+
+CURSOR_KIND = "death"
+
+
+@strawberry_django.type(DeathEvent)
+class DeathEventType:
+    character_name: auto
+    level_at_death: auto
+    killed_by: auto
+    died_at: auto
+
+    @strawberry_django.field(only=["character_name"])  # type: ignore[untyped-decorator]
+    async def character(
+        self, root: DeathEvent, info: strawberry.Info
+    ) -> CharacterType | None:
+        """Batched through the request's character loader — one query per page."""
+        result = await info.context.character_loader.load(
+            normalize_character_name(root.character_name)
+        )
+        return cast("CharacterType | None", result)
+
+
+def _cursor(death: DeathEvent) -> str:
+    return encode_cursor(CURSOR_KIND, death.died_at.isoformat(), death.pk)
+
+
+def _position(after: str | None) -> tuple[datetime, int] | None:
+    if after is None:
+        return None
+    try:
+        died_at, pk = decode_cursor(CURSOR_KIND, after)
+        return datetime.fromisoformat(died_at), int(pk)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def deaths(
+        self,
+        info: strawberry.Info,
+        first: int | None = None,
+        after: str | None = None,
+        min_level: int | None = None,
+    ) -> Connection[DeathEventType]:
+        """Death feed, newest first (keyset-paginated). Requires JWT."""
+        await require_authenticated(info)
+        qs = optimize_connection(
+            services.deaths_after(_position(after), min_level=min_level),
+            info,
+            only=["died_at"],
+        )
+        result = await keyset_page(qs, first=first, after=after, cursor_for=_cursor)
+        return cast("Connection[DeathEventType]", result)
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription
+    async def death_added(
+        self, info: strawberry.Info, min_level: int | None = None
+    ) -> AsyncGenerator[DeathEventType, None]:
+        """New deaths as they are ingested, at or above `minLevel`
+        (default `DEATH_LEVEL_THRESHOLD`). Requires JWT."""
+        await require_authenticated(info)
+        threshold = settings.DEATH_LEVEL_THRESHOLD if min_level is None else min_level
+        async with broadcaster.subscribe(threshold) as queue:
+            while True:
+                event = await queue.get()
+                yield cast("DeathEventType", event)
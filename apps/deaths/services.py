@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q, QuerySet
+
+from apps.deaths import broadcast
+from apps.deaths.models import DeathEvent
+from apps.deaths.types import DeathPayload
+from apps.notifications import services as notifications
+from config import metrics
+
+
+def save_death_event(payload: DeathPayload) -> DeathEvent | None:
+    """Insert one scraped death; None if it was already recorded.
+
+    The unique (character_name, died_at) constraint makes re-scrapes of the
+    same death list idempotent. Only rows actually inserted are published to
+    the `deathAdded` feed, once, after the caller's transaction commits, and
+    queued for Discord in the same transaction as the row.
+    """
+    try:
+        with transaction.atomic():
+            event = DeathEvent.objects.create(**payload)
+            notifications.announce_death(event)
+    except IntegrityError:
+        metrics.count_ingested("death", "duplicate")
+        return None
+
+    metrics.count_ingested("death", "scraped")
+
+    transaction.on_commit(lambda: broadcast.publish(event))
+    return event
+
+
+def deaths_after(
+    position: tuple[datetime, int] | None, *, min_level: int | None = None
+) -> QuerySet[DeathEvent]:
+    """Deaths newest-first, strictly after `position` = (died_at, id).
+
+    The redundant `died_at <= x` bound turns the keyset predicate into an
+    index range scan on `deaths_died_at_id_idx` (died_at DESC, id DESC).
+    """
+    qs = DeathEvent.objects.order_by("-died_at", "-id")
+    if min_level is not None:
+        qs = qs.filter(level_at_death__gte=min_level)
+    if position is not None:
+        died_at, pk = position
+        qs = qs.filter(died_at__lte=died_at).filter(
+            Q(died_at__lt=died_at) | Q(died_at=died_at, id__lt=pk)
+        )
+    return qs
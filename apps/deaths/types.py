@@ -0,0 +1,9 @@
+from typing import TypedDict
+from datetime import datetime
+
+
+class DeathPayload(TypedDict):
+    character_name: str
+    level_at_death: int
+    killed_by: str
+    died_at: datetime
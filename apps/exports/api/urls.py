@@ -0,0 +1,8 @@
+from django.urls import path
+from apps.exports.api.views import export_view
+
+app_name = "exports_api"
+
+urlpatterns = [
+    path("<str:dataset>/", export_view, name="export"),
+]
@@ -0,0 +1,52 @@
+from django.http import (
+    HttpRequest,
+    HttpResponseBase,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.accounts.auth import authenticate
+from apps.exports.services import (
+    ExportError,
+    aiter_export,
+    get_dataset,
+    get_encoder,
+    parse_filters,
+)
+
+
+@require_GET
+async def export_view(request: HttpRequest, dataset: str) -> HttpResponseBase:
+    """Stream a whole dataset: `?format=ndjson|csv|parquet&since=&until=&min_level=`.
+
+    Requires a JWT bearer token (or a logged-in session).
+    """
+    try:
+        user = await authenticate(request) or await request.auser()
+    except AuthenticationFailed as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=401)
+    if not user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    try:
+        spec = get_dataset(dataset)
+        filters = parse_filters(
+            request.GET.get("since"),
+            request.GET.get("until"),
+            request.GET.get("min_level"),
+        )
+        encoder = get_encoder(request.GET.get("format", "ndjson"), spec)
+    except ExportError as exc:
+        return JsonResponse({"detail": str(exc)}, status=400)
+
+    response = StreamingHttpResponse(
+        aiter_export(spec, encoder, filters), content_type=encoder.content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{dataset}.{encoder.extension}"'
+    )
+    return response
@@ -0,0 +1,55 @@
+import sys
+from argparse import ArgumentParser
+from collections.abc import Iterable
+from typing import Any, BinaryIO
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.exports.services import (
+    DATASETS,
+    FORMATS,
+    ExportError,
+    get_dataset,
+    get_encoder,
+    iter_export,
+    parse_filters,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream a dataset to a file (or stdout) as NDJSON, CSV or Parquet."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+        parser.add_argument("--since", help="ISO date/datetime, inclusive")
+        parser.add_argument("--until", help="ISO date/datetime, exclusive")
+        parser.add_argument("--min-level")
+        parser.add_argument("--output", "-o", help="File path; stdout if omitted")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            dataset = get_dataset(options["dataset"])
+            filters = parse_filters(
+                options["since"], options["until"], options["min_level"]
+            )
+            encoder = get_encoder(options["format"], dataset)
+        except ExportError as exc:
+            raise CommandError(str(exc)) from None
+
+        if options["output"]:
+            with open(options["output"], "wb") as fh:
+                written = self._write(fh, iter_export(dataset, encoder, filters))
+            self.stderr.write(
+                self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}")
+            )
+        else:
+            self._write(sys.stdout.buffer, iter_export(dataset, encoder, filters))
+
+    def _write(self, fh: BinaryIO, chunks: Iterable[bytes]) -> int:
+        written = 0
+        for chunk in chunks:
+            fh.write(chunk)
+            written += len(chunk)
+        fh.flush()
+        return written
@@ -0,0 +1,294 @@
+"""Bulk export of deaths and characters as NDJSON, CSV or Parquet.
+
+Rows are read with `values_list(...).iterator()` — a Postgres server-side
+cursor, `EXPORT_CHUNK_SIZE` rows per fetch — and encoded a batch at a time,
+so memory stays flat however many rows are exported. Model instances are
+never built.
+
+`iter_export` serves the management command (sync), `aiter_export` the
+streaming HTTP endpoint (async); both yield encoded byte chunks.
+"""
+
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Generator, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, time, timezone
+from itertools import batched
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.characters.models import Character
+from apps.deaths.models import DeathEvent
+
+Row = tuple[Any, ...]
+
+
+class ExportError(ValueError):
+    """Unknown dataset/format, or a format whose library isn't installed."""
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type[Model]
+    fields: tuple[str, ...]
+    # Field the `since`/`until` range and `min_level` filters apply to.
+    time_field: str
+    level_field: str
+    ordering: tuple[str, ...]
+
+
+DATASETS: dict[str, Dataset] = {
+    "deaths": Dataset(
+        model=DeathEvent,
+        fields=("id", "character_name", "level_at_death", "killed_by", "died_at"),
+        time_field="died_at",
+        level_field="level_at_death",
+        ordering=("died_at", "id"),
+    ),
+    "characters": Dataset(
+        model=Character,
+        fields=(
+            "id",
+            "name",
+            "sex",
+            "vocation",
+            "level",
+            "world",
+            "residence",
+            "house",
+            "guild_membership",
+            "last_login",
+            "account_status",
+            "last_scraped_at",
+        ),
+        time_field="last_scraped_at",
+        level_field="level",
+        ordering=("id",),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    since: datetime | None = None
+    until: datetime | None = None
+    min_level: int | None = None
+
+
+def _parse_moment(name: str, value: str) -> datetime:
+    """ISO datetime or date (midnight); naive values are taken as UTC."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = datetime.combine(day, time()) if day is not None else None
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ExportError(f"`{name}` must be an ISO date or datetime")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def parse_filters(
+    since: str | None = None, until: str | None = None, min_level: str | None = None
+) -> ExportFilters:
+    """Filters from raw query-string / command-line values."""
+    level: int | None = None
+    if min_level:
+        try:
+            level = int(min_level)
+        except ValueError:
+            raise ExportError("`min_level` must be an integer") from None
+    return ExportFilters(
+        since=_parse_moment("since", since) if since else None,
+        until=_parse_moment("until", until) if until else None,
+        min_level=level,
+    )
+
+
+def get_dataset(name: str) -> Dataset:
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ExportError(
+            f"Unknown dataset {name!r}; choose from {', '.join(DATASETS)}"
+        ) from None
+
+
+def export_queryset(dataset: Dataset, filters: ExportFilters) -> QuerySet[Any]:
+    """`values_list` rows of `dataset.fields`, filtered; `since` inclusive,
+    `until` exclusive."""
+    qs = dataset.model._default_manager.order_by(*dataset.ordering)
+    if filters.since is not None:
+        qs = qs.filter(**{f"{dataset.time_field}__gte": filters.since})
+    if filters.until is not None:
+        qs = qs.filter(**{f"{dataset.time_field}__lt": filters.until})
+    if filters.min_level is not None:
+        qs = qs.filter(**{f"{dataset.level_field}__gte": filters.min_level})
+    return qs.values_list(*dataset.fields)
+
+
+class Encoder(ABC):
+    content_type = "application/octet-stream"
+    extension = ""
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.dataset = dataset
+
+    def header(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def encode(self, rows: Sequence[Row]) -> bytes: ...
+
+    def footer(self) -> bytes:
+        return b""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class NDJSONEncoder(Encoder):
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        fields = self.dataset.fields
+        dumps = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=_json_default
+        ).encode
+        return "".join(dumps(dict(zip(fields, row))) + "\n" for row in rows).encode()
+
+
+class CSVEncoder(Encoder):
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def _write(self, rows: Iterable[Row]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def header(self) -> bytes:
+        return self._write([self.dataset.fields])
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        return self._write(
+            tuple(
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            )
+            for row in rows
+        )
+
+
+class ParquetEncoder(Encoder):
+    """One Parquet row group per batch; the footer is written at the end."""
+
+    content_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, dataset: Dataset) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("Parquet export requires pyarrow") from None
+        super().__init__(dataset)
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, self._arrow_type(name)) for name in dataset.fields]
+        )
+        self._sink = io.BytesIO()
+        self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+    def _arrow_type(self, name: str) -> Any:
+        pa = self._pa
+        internal = self.dataset.model._meta.get_field(name).get_internal_type()
+        if internal == "DateTimeField":
+            return pa.timestamp("us", tz="UTC")
+        if "Integer" in internal or internal.endswith("AutoField"):
+            return pa.int64()
+        return pa.string()
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        pa = self._pa
+        arrays = [
+            pa.array(column, type=arrow_type)
+            for column, arrow_type in zip(zip(*rows), self._schema.types)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        return self._drain()
+
+    def footer(self) -> bytes:
+        self._writer.close()
+        return self._drain()
+
+
+FORMATS: dict[str, Callable[[Dataset], Encoder]] = {
+    "ndjson": NDJSONEncoder,
+    "csv": CSVEncoder,
+    "parquet": ParquetEncoder,
+}
+
+
+def get_encoder(fmt: str, dataset: Dataset) -> Encoder:
+    try:
+        factory = FORMATS[fmt]
+    except KeyError:
+        raise ExportError(
+            f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}"
+        ) from None
+    return factory(dataset)
+
+
+def iter_export(
+    dataset: Dataset, encoder: Encoder, filters: ExportFilters
+) -> Generator[bytes]:
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    yield encoder.header()
+    rows = export_queryset(dataset, filters).iterator(chunk_size=chunk_size)
+    for batch in batched(rows, chunk_size):
+        yield encoder.encode(batch)
+    yield encoder.footer()
+
+
+async def aiter_export(
+    dataset: Dataset, encoder: Encoder, filters: ExportFilters
+) -> AsyncIterator[bytes]:
+    """Async wrapper over `iter_export`: each chunk is fetched *and* encoded in
+    the ORM's worker thread, keeping the event loop free.
+
+    (`values_list().aiterator()` can't be used: Django runs the query of a
+    values-list iterable on the event loop.)
+    """
+    chunks = iter_export(dataset, encoder, filters)
+
+    def next_chunk() -> bytes | None:
+        return next(chunks, None)
+
+    try:
+        while (chunk := await sync_to_async(next_chunk)()) is not None:
+            if chunk:
+                yield chunk
+    finally:
+        # Closes the server-side cursor on the thread that owns the connection.
+        await sync_to_async(chunks.close)()
@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from apps.notifications.models import DeathSubscription, NotificationOutbox
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = ("key", "kind", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("kind", "status")
+    search_fields = ("key",)
+    readonly_fields = ("key", "kind", "webhook_url", "embed", "created_at", "sent_at")
+    ordering = ["-created_at"]
+
+
+@admin.register(DeathSubscription)
+class DeathSubscriptionAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = (
+        "channel_id",
+        "guild_id",
+        "min_level",
+        "world",
+        "character_name",
+        "created_at",
+    )
+    list_filter = ("world",)
+    search_fields = ("guild_id", "channel_id", "character_name")
+    ordering = ["guild_id", "channel_id", "min_level"]
@@ -0,0 +1,295 @@
+"""Discord webhook delivery: coalesced, rate-limit aware, over one pooled
+HTTP client.
+
+`WebhookDispatcher.submit(url, embed)` queues one embed for one channel
+(its webhook URL) and returns a future that resolves True once Discord
+accepted it, False if it was given up on. Each channel with pending embeds
+has one sender task, so a channel never has more than one request in
+flight:
+
+* embeds are coalesced — up to `MAX_EMBEDS` (and `MAX_EMBED_CHARS`) per
+  message. The first message of a burst waits `DISCORD_COALESCE_MS` for the
+  rest of it; after that, whatever piles up while a channel waits for its
+  rate limit goes out together, so a death spike costs a few messages
+  instead of one request per death;
+* the `X-RateLimit-*` headers of every response are kept per bucket
+  (`RateLimits`); a channel out of requests sleeps until its bucket resets
+  instead of collecting 429s;
+* a 429 that still happens (another process shares the webhook, or the
+  global limit) pauses the bucket — or every bucket — for `retry_after` and
+  retries the same message; 5xx and connection errors are retried with
+  backoff up to `DISCORD_MAX_RETRIES` times; other 4xx (deleted webhook,
+  invalid payload) fail at once.
+
+All channels share one `aiohttp` session whose connector keeps at most
+`DISCORD_WEBHOOK_CONNECTIONS` keep-alive connections open.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+from django.conf import settings
+
+from config import metrics
+
+logger = logging.getLogger(__name__)
+
+Embed = dict[str, Any]
+
+# Discord's limits on one webhook message.
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+# First retry delay after a 5xx or connection error; doubles per attempt.
+RETRY_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+
+def embed_chars(embed: Embed) -> int:
+    """Characters of `embed` counted against `MAX_EMBED_CHARS`."""
+    size = len(embed.get("title", "")) + len(embed.get("description", ""))
+    size += len(embed.get("footer", {}).get("text", ""))
+    size += len(embed.get("author", {}).get("name", ""))
+    for f in embed.get("fields", ()):
+        size += len(f.get("name", "")) + len(f.get("value", ""))
+    return size
+
+
+@dataclass
+class _Bucket:
+    # Optimistic until Discord tells us otherwise: a channel's first request
+    # goes out at once.
+    remaining: int = 1
+    reset_at: float = 0.0
+
+
+class RateLimits:
+    """Discord rate-limit buckets, as learned from response headers.
+
+    Routes (webhook URLs) map to the bucket Discord names in
+    `X-RateLimit-Bucket`, so routes sharing a bucket share its budget.
+    Times are event-loop clock times.
+    """
+
+    def __init__(self) -> None:
+        self._route_buckets: dict[str, str] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._global_until = 0.0
+
+    def _bucket(self, route: str) -> _Bucket:
+        key = self._route_buckets.get(route, route)
+        return self._buckets.setdefault(key, _Bucket())
+
+    async def acquire(self, route: str) -> None:
+        """Wait until `route` may send one request, and take it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            bucket = self._bucket(route)
+            if bucket.remaining <= 0 and bucket.reset_at <= now:
+                bucket.remaining = 1  # reset passed: one request learns the new window
+            delay = self._global_until - now
+            if bucket.remaining <= 0:
+                delay = max(delay, bucket.reset_at - now)
+            if delay <= 0:
+                bucket.remaining -= 1
+                return
+            await asyncio.sleep(delay)
+
+    def update(self, route: str, headers: Mapping[str, str]) -> None:
+        """Record the limits a response to `route` reported."""
+        if name := headers.get("X-RateLimit-Bucket"):
+            self._route_buckets[route] = name
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        bucket = self._bucket(route)
+        bucket.remaining = int(remaining)
+        bucket.reset_at = asyncio.get_running_loop().time() + float(reset_after)
+
+    def block(self, route: str, retry_after: float, *, is_global: bool) -> None:
+        """Honour a 429: pause `route`'s bucket, or everything, for
+        `retry_after` seconds."""
+        until = asyncio.get_running_loop().time() + retry_after
+        if is_global:
+            self._global_until = max(self._global_until, until)
+            return
+        bucket = self._bucket(route)
+        bucket.remaining = 0
+        bucket.reset_at = max(bucket.reset_at, until)
+
+
+@dataclass
+class _Pending:
+    embed: Embed
+    future: "asyncio.Future[bool]"
+    submitted_at: float
+
+
+@dataclass
+class _Channel:
+    pending: deque[_Pending] = field(default_factory=deque)
+    sender: "asyncio.Task[None] | None" = None
+
+
+class WebhookDispatcher:
+    """Sends embeds to Discord webhooks; see the module docstring.
+
+    Use as an async context manager: leaving it waits for every queued embed
+    to be delivered or given up on, then closes the HTTP session (unless one
+    was passed in).
+    """
+
+    def __init__(
+        self,
+        *,
+        session: aiohttp.ClientSession | None = None,
+        coalesce: float | None = None,
+        max_embeds: int = MAX_EMBEDS,
+        max_retries: int | None = None,
+    ) -> None:
+        self.coalesce = (
+            settings.DISCORD_COALESCE_MS / 1000 if coalesce is None else coalesce
+        )
+        self.max_embeds = min(max_embeds, MAX_EMBEDS)
+        self.max_retries = (
+            settings.DISCORD_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.limits = RateLimits()
+        self._session = session
+        self._owns_session = session is None
+        self._channels: dict[str, _Channel] = {}
+
+    async def __aenter__(self) -> "WebhookDispatcher":
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.DISCORD_WEBHOOK_CONNECTIONS
+                ),
+                timeout=aiohttp.ClientTimeout(total=settings.DISCORD_TIMEOUT_SECONDS),
+            )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.drain()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def submit(self, url: str, embed: Embed) -> "asyncio.Future[bool]":
+        """Queue `embed` for the channel behind webhook `url`."""
+        loop = asyncio.get_running_loop()
+        pending = _Pending(embed, loop.create_future(), loop.time())
+        channel = self._channels.setdefault(url, _Channel())
+        channel.pending.append(pending)
+        if channel.sender is None:
+            channel.sender = asyncio.create_task(self._send_channel(url, channel))
+        return pending.future
+
+    async def drain(self) -> None:
+        """Wait until nothing is queued."""
+        while senders := [c.sender for c in self._channels.values() if c.sender]:
+            await asyncio.gather(*senders, return_exceptions=True)
+
+    async def _send_channel(self, url: str, channel: _Channel) -> None:
+        batch: list[_Pending] = []
+        try:
+            if self.coalesce and len(channel.pending) < self.max_embeds:
+                await asyncio.sleep(self.coalesce)
+            while channel.pending:
+                await self.limits.acquire(url)
+                batch = self._take(channel.pending)
+                delivered = await self._post(url, batch)
+                if delivered is None:  # rate limited: same message, next window
+                    channel.pending.extendleft(reversed(batch))
+                    continue
+                self._settle(batch, delivered)
+        except Exception:
+            logger.exception("Discord sender crashed")
+        finally:
+            # Crashed or cancelled: nothing left may wait forever.
+            unsettled = [p for p in (*batch, *channel.pending) if not p.future.done()]
+            if unsettled:
+                self._settle(unsettled, False)
+            del self._channels[url]
+
+    def _take(self, pending: deque[_Pending]) -> list[_Pending]:
+        batch = [pending.popleft()]
+        chars = embed_chars(batch[0].embed)
+        while pending and len(batch) < self.max_embeds:
+            chars += embed_chars(pending[0].embed)
+            if chars > MAX_EMBED_CHARS:
+                break
+            batch.append(pending.popleft())
+        return batch
+
+    async def _post(self, url: str, batch: list[_Pending]) -> bool | None:
+        """POST one message; True/False for delivered/given up, None when
+        rate limited (retry after the bucket's pause)."""
+        assert self._session is not None, "use WebhookDispatcher as a context manager"
+        payload = {"embeds": [p.embed for p in batch]}
+        attempt = 0
+        while True:
+            try:
+                async with self._session.post(url, json=payload) as response:
+                    self.limits.update(url, response.headers)
+                    if response.status == 429:
+                        await self._rate_limited(url, response)
+                        return None
+                    if response.status < 300:
+                        return True
+                    if response.status < 500:
+                        logger.error(
+                            "Discord rejected a webhook message (%d): %s",
+                            response.status,
+                            await response.text(),
+                        )
+                        return False
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientError, TimeoutError) as exc:
+                error = repr(exc)
+            attempt += 1
+            if attempt > self.max_retries:
+                logger.error("Giving up on a webhook message after %s", error)
+                return False
+            logger.warning("Webhook message failed (%s), retry %d", error, attempt)
+            await asyncio.sleep(min(RETRY_BACKOFF * 2 ** (attempt - 1), MAX_BACKOFF))
+
+    async def _rate_limited(self, url: str, response: aiohttp.ClientResponse) -> None:
+        try:
+            body = await response.json(content_type=None)
+        except ValueError:
+            body = {}
+        retry_after = float(
+            body.get("retry_after") or response.headers.get("Retry-After") or 1
+        )
+        is_global = bool(body.get("global")) or (
+            response.headers.get("X-RateLimit-Global") == "true"
+        )
+        metrics.DISCORD_RATE_LIMITED.labels("global" if is_global else "bucket").inc()
+        logger.info("Discord rate limit hit, waiting %.2fs", retry_after)
+        self.limits.block(url, retry_after, is_global=is_global)
+
+    @staticmethod
+    def _settle(batch: list[_Pending], delivered: bool) -> None:
+        now = asyncio.get_running_loop().time()
+        outcome = "delivered" if delivered else "failed"
+        metrics.DISCORD_EMBEDS.labels(outcome).inc(len(batch))
+        if delivered:
+            metrics.DISCORD_MESSAGES.inc()
+        for pending in batch:
+            if delivered:
+                metrics.DISCORD_DELIVERY_SECONDS.observe(now - pending.submitted_at)
+            if not pending.future.done():  # the caller may have cancelled it
+                pending.future.set_result(delivered)
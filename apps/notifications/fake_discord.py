@@ -0,0 +1,162 @@
+"""Local stand-in for Discord's webhook endpoint, for tests, benchmarks and
+dev (`manage.py fake_discord`).
+
+Enforces what the real one does to a webhook client:
+
+* a per-webhook bucket of `limit` requests per `per` seconds (Discord's
+  webhooks: 5 per 2 s), announced in `X-RateLimit-*` headers; a request
+  past it gets a 429 with `retry_after`;
+* optionally a global limit of `global_limit` requests per second across
+  all webhooks (429 with `"global": true`);
+* at most 10 embeds and 6000 embed characters per message (400 otherwise).
+
+`latency` delays every response, `fail_next` queues status codes to answer
+the next requests with (e.g. 502), and webhooks listed in `deleted` answer
+404, for fault injection. Every accepted message is kept in `messages`.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+from apps.notifications.discord import MAX_EMBED_CHARS, MAX_EMBEDS, embed_chars
+
+
+@dataclass
+class ReceivedMessage:
+    webhook: str
+    embeds: list[dict[str, Any]]
+    received_at: float  # time.monotonic()
+
+
+@dataclass
+class _Window:
+    started_at: float = 0.0
+    used: int = 0
+
+
+@dataclass
+class FakeDiscord:
+    limit: int = 5
+    per: float = 2.0
+    global_limit: int | None = None
+    latency: float = 0.0
+    fail_next: list[int] = field(default_factory=list)
+    deleted: set[str] = field(default_factory=set)
+    messages: list[ReceivedMessage] = field(default_factory=list)
+    rate_limited: int = 0
+
+    def __post_init__(self) -> None:
+        self._windows: dict[str, _Window] = {}
+        self._global = _Window()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        self.app = web.Application()
+        self.app.router.add_post("/api/webhooks/{webhook}/{token}", self._execute)
+
+    def webhook_url(self, channel: str | int) -> str:
+        return f"{self.base_url}/api/webhooks/{channel}/fake-token"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on `host:port` (0: any free port); returns the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeDiscord":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def _execute(self, request: web.Request) -> web.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        webhook = request.match_info["webhook"]
+        if webhook in self.deleted:
+            return web.json_response(
+                {"code": 10015, "message": "Unknown Webhook"}, status=404
+            )
+        now = time.monotonic()
+
+        if self.global_limit is not None:
+            if now - self._global.started_at >= 1.0:
+                self._global = _Window(started_at=now)
+            if self._global.used >= self.global_limit:
+                self.rate_limited += 1
+                retry_after = self._global.started_at + 1.0 - now
+                return web.json_response(
+                    {
+                        "message": "You are being rate limited.",
+                        "retry_after": retry_after,
+                        "global": True,
+                    },
+                    status=429,
+                    headers={
+                        "X-RateLimit-Global": "true",
+                        "X-RateLimit-Scope": "global",
+                        "Retry-After": str(max(1, round(retry_after))),
+                    },
+                )
+            self._global.used += 1
+
+        window = self._windows.setdefault(webhook, _Window())
+        if now - window.started_at >= self.per:
+            window.started_at, window.used = now, 0
+        reset_after = window.started_at + self.per - now
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": hashlib.md5(webhook.encode()).hexdigest(),
+        }
+        if window.used >= self.limit:
+            self.rate_limited += 1
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["X-RateLimit-Scope"] = "user"
+            headers["Retry-After"] = str(max(1, round(reset_after)))
+            return web.json_response(
+                {
+                    "message": "You are being rate limited.",
+                    "retry_after": reset_after,
+                    "global": False,
+                },
+                status=429,
+                headers=headers,
+            )
+        window.used += 1
+        headers["X-RateLimit-Remaining"] = str(self.limit - window.used)
+
+        if self.fail_next:
+            status = self.fail_next.pop(0)
+            return web.json_response(
+                {"message": "Injected failure"}, status=status, headers=headers
+            )
+
+        payload = await request.json()
+        embeds = payload.get("embeds") or []
+        if (
+            not 0 < len(embeds) <= MAX_EMBEDS
+            or sum(map(embed_chars, embeds)) > MAX_EMBED_CHARS
+        ):
+            return web.json_response(
+                {"code": 50035, "message": "Invalid Form Body"},
+                status=400,
+                headers=headers,
+            )
+        self.messages.append(ReceivedMessage(webhook, embeds, time.monotonic()))
+        return web.Response(status=204, headers=headers)
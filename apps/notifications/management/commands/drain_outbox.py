@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.notifications.discord import WebhookDispatcher
+from apps.notifications.outbox import drain_once
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued Discord notifications (see apps.notifications.outbox). "
+        "Run as many as throughput needs; they never claim the same rows."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help="Messages claimed per batch",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Batches in flight at once, sharing one dispatcher",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the outbox is empty",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Send what is queued now and exit"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        asyncio.run(self._drain(**options))
+
+    async def _drain(self, **options: Any) -> None:
+        async with WebhookDispatcher() as dispatcher:
+            await asyncio.gather(
+                *(
+                    self._loop(dispatcher, options)
+                    for _ in range(options["concurrency"])
+                )
+            )
+
+    async def _loop(
+        self, dispatcher: WebhookDispatcher, options: dict[str, Any]
+    ) -> None:
+        while True:
+            sent = await drain_once(dispatcher, options["batch"])
+            if sent:
+                logger.info("drain_outbox: sent a batch of %d", sent)
+                continue
+            if options["once"]:
+                return
+            await asyncio.sleep(options["idle_sleep"])
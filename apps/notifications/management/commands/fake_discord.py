@@ -0,0 +1,43 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from apps.notifications.fake_discord import FakeDiscord
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local stand-in for Discord's webhook endpoint with its rate "
+        "limits (see apps.notifications.fake_discord)."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--limit", type=int, default=5, help="Requests per webhook per window"
+        )
+        parser.add_argument(
+            "--per", type=float, default=2.0, help="Window length in seconds"
+        )
+        parser.add_argument(
+            "--global-limit", type=int, default=None, help="Requests per second overall"
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds added to every response"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        fake = FakeDiscord(
+            limit=options["limit"],
+            per=options["per"],
+            global_limit=options["global_limit"],
+            latency=options["latency"],
+        )
+        self.stdout.write(
+            f"Webhook URLs: http://{options['host']}:{options['port']}"
+            "/api/webhooks/<channel>/<token>"
+        )
+        web.run_app(fake.app, host=options["host"], port=options["port"], print=None)
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.4 on 2026-10-19 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeathSubscription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("guild_id", models.CharField(max_length=32)),
+                ("channel_id", models.CharField(max_length=32)),
+                ("webhook_url", models.CharField(max_length=500)),
+                ("min_level", models.PositiveIntegerField()),
+                ("world", models.CharField(blank=True, default="", max_length=32)),
+                (
+                    "character_name",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("channel_id", "world", "character_name"),
+                        name="death_subscription_unique",
+                    )
+                ],
+            },
+        ),
+    ]
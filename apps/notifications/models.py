@@ -0,0 +1,78 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class NotificationOutbox(models.Model):
+    """One Discord message to send, written in the transaction that caused it.
+
+    Ingestion only inserts rows; `drain_outbox` workers claim and send them
+    (`apps.notifications.outbox`). `key` names the event and destination,
+    so an event ingested or triggered twice is still queued once:
+    `death:<name>@<died_at>` for the deaths webhook, with `:<channel id>`
+    added for a subscribed channel, and `bedmage:<watch id>@<last_login>` for
+    a reminder (ISO 8601 times; `apps.notifications.services`).
+    """
+
+    class Kind(models.TextChoices):
+        DEATH = "death", "Death announcement"
+        BEDMAGE = "bedmage", "Bedmage reminder"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    key = models.CharField(max_length=200, unique=True)
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    webhook_url = models.CharField(max_length=500)
+    embed = models.JSONField()
+    status = models.CharField(
+        max_length=8, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Not claimable before this: pushed forward by each claim (the lease)
+    # and by a failed attempt (the backoff).
+    available_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The claim query; sent and failed rows stay out of the index.
+            models.Index(
+                fields=["available_at", "id"],
+                condition=Q(status="pending"),
+                name="outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.key} ({self.status})"
+
+
+class DeathSubscription(models.Model):
+    """A Discord channel's `/deaths threshold`: deaths at `min_level` or
+    above, optionally only on one world and/or of one character, are
+    announced there. Matched through `subscriptions.SubscriptionIndex`."""
+
+    guild_id = models.CharField(max_length=32)
+    channel_id = models.CharField(max_length=32)
+    webhook_url = models.CharField(max_length=500)
+    min_level = models.PositiveIntegerField()
+    # Empty: any world / any character. Matched case-insensitively.
+    world = models.CharField(max_length=32, blank=True, default="")
+    character_name = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["channel_id", "world", "character_name"],
+                name="death_subscription_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        scope = " ".join(filter(None, [self.world, self.character_name])) or "all"
+        return f"#{self.channel_id}: {scope} ≥ {self.min_level}"
@@ -0,0 +1,106 @@
+"""Transactional outbox of Discord notifications.
+
+Producers call `enqueue` inside the transaction that stores what the
+message is about (a new `DeathEvent`, a bedmage watch marked reminded): the
+row commits or rolls back with it, so a crash can neither lose a message
+nor send one for data that was never stored, and ingestion never waits on
+Discord.
+
+`drain_outbox` workers, any number of them, take rows with `claim`:
+`SELECT … FOR UPDATE SKIP LOCKED` picks up to `OUTBOX_BATCH_SIZE` pending
+rows no other worker is claiming at that moment, and pushes their
+`available_at` one lease (`OUTBOX_CLAIM_LEASE_SECONDS`) ahead before
+committing. The lock is held only for that UPDATE, never while sending;
+the lease keeps other workers off the rows meanwhile, and returns them to
+the pool if the worker dies mid-send.
+
+Delivery is at least once: a worker that dies after Discord accepted a
+message but before `settle` leaves it to be sent again after the lease.
+Enqueueing is exactly once per `key` — a re-scraped death or a reminder
+fired twice is not queued again.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.notifications.discord import Embed, WebhookDispatcher
+from apps.notifications.models import NotificationOutbox
+from config import metrics
+
+# First retry of a message Discord refused or the dispatcher gave up on;
+# doubles per attempt up to MAX_RETRY_DELAY.
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+def enqueue(kind: str, key: str, webhook_url: str, embed: Embed) -> None:
+    """Queue one message; a no-op if `key` was queued before.
+
+    Call inside the producer's transaction."""
+    NotificationOutbox.objects.bulk_create(
+        [NotificationOutbox(kind=kind, key=key, webhook_url=webhook_url, embed=embed)],
+        ignore_conflicts=True,
+    )
+
+
+def claim(limit: int) -> list[NotificationOutbox]:
+    """Lease up to `limit` due messages to this worker, oldest first."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=NotificationOutbox.Status.PENDING, available_at__lte=now)
+            .order_by("available_at", "id")[:limit]
+        )
+        if rows:
+            lease = now + timedelta(seconds=settings.OUTBOX_CLAIM_LEASE_SECONDS)
+            NotificationOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                available_at=lease, attempts=F("attempts") + 1
+            )
+    for row in rows:
+        row.attempts += 1
+    return rows
+
+
+def settle(rows: Sequence[NotificationOutbox], delivered: Sequence[bool]) -> None:
+    """Record the outcome of sending claimed `rows`."""
+    now = timezone.now()
+    sent = [row for row, ok in zip(rows, delivered) if ok]
+    NotificationOutbox.objects.filter(
+        pk__in=[row.pk for row in sent], status=NotificationOutbox.Status.PENDING
+    ).update(status=NotificationOutbox.Status.SENT, sent_at=now)
+    for row in sent:
+        metrics.OUTBOX_DELIVERY_SECONDS.observe((now - row.created_at).total_seconds())
+
+    for row, ok in zip(rows, delivered):
+        if ok:
+            continue
+        changes: dict[str, Any]
+        if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            changes = {"status": NotificationOutbox.Status.FAILED}
+        else:
+            delay = min(RETRY_DELAY * 2 ** (row.attempts - 1), MAX_RETRY_DELAY)
+            changes = {"available_at": now + delay}
+        NotificationOutbox.objects.filter(
+            pk=row.pk, status=NotificationOutbox.Status.PENDING
+        ).update(**changes)
+
+
+async def drain_once(dispatcher: WebhookDispatcher, limit: int) -> int:
+    """Claim one batch, send it and record the outcome; returns the batch size."""
+    rows = await sync_to_async(claim)(limit)
+    if not rows:
+        return 0
+    delivered = await asyncio.gather(
+        *(dispatcher.submit(row.webhook_url, row.embed) for row in rows)
+    )
+    await sync_to_async(settle)(rows, delivered)
+    return len(rows)
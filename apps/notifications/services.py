@@ -0,0 +1,85 @@
+"""What gets announced, where, and how it looks; producers call these inside
+their own transactions and the outbox does the rest."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from urllib.parse import quote_plus
+
+from django.conf import settings
+
+from apps.bedmages.models import BedmageWatch
+from apps.characters.services import find_characters_by_name
+from apps.deaths.models import DeathEvent
+from apps.notifications import outbox, subscriptions
+from apps.notifications.discord import Embed
+from apps.notifications.models import NotificationOutbox
+
+CHARACTER_URL = "https://tibiantis.online/?page=character&name={}"
+# Discord's limit on an embed description.
+MAX_DESCRIPTION = 4096
+
+
+def death_embed(event: DeathEvent) -> Embed:
+    return {
+        "title": f"{event.character_name} died at level {event.level_at_death}",
+        "description": (event.killed_by or "Killed.")[:MAX_DESCRIPTION],
+        "url": CHARACTER_URL.format(quote_plus(event.character_name)),
+        "timestamp": event.died_at.isoformat(),
+    }
+
+
+def bedmage_embed(watch: BedmageWatch, name: str, last_login: datetime) -> Embed:
+    user = watch.user
+    mention = f"<@{user.discord_id}>" if user.discord_id else user.username
+    return {
+        "title": f"{name} has rested",
+        "description": (
+            f"{mention}: {settings.BEDMAGE_REMINDER_MINUTES} minutes since "
+            f"{name} logged in."
+        ),
+        "url": CHARACTER_URL.format(quote_plus(name)),
+        "timestamp": last_login.isoformat(),
+    }
+
+
+def announce_death(event: DeathEvent) -> None:
+    """Queue the announcement of a newly stored death to every channel
+    subscribed to it, and to `DISCORD_DEATHS_WEBHOOK_URL` at
+    `DEATH_LEVEL_THRESHOLD`+."""
+    key = f"death:{event.character_name}@{event.died_at.isoformat()}"
+    embed = death_embed(event)
+    url = settings.DISCORD_DEATHS_WEBHOOK_URL
+    if url and event.level_at_death >= settings.DEATH_LEVEL_THRESHOLD:
+        outbox.enqueue(NotificationOutbox.Kind.DEATH, key, url, embed)
+
+    index = subscriptions.current_index()
+    world = ""
+    if index.needs_world:
+        world = (
+            find_characters_by_name(event.character_name)
+            .values_list("world", flat=True)
+            .first()
+        ) or ""
+    for sub in index.match(event.level_at_death, event.character_name, world):
+        outbox.enqueue(
+            NotificationOutbox.Kind.DEATH,
+            f"{key}:{sub.channel_id}",
+            sub.webhook_url,
+            embed,
+        )
+
+
+def remind_watchers(
+    watches: Iterable[BedmageWatch], name: str, last_login: datetime
+) -> None:
+    """Queue one reminder per watch about `name`'s login at `last_login`."""
+    url = settings.DISCORD_BEDMAGE_WEBHOOK_URL
+    if not url:
+        return
+    for watch in watches:
+        outbox.enqueue(
+            NotificationOutbox.Kind.BEDMAGE,
+            f"bedmage:{watch.pk}@{last_login.isoformat()}",
+            url,
+            bedmage_embed(watch, name, last_login),
+        )
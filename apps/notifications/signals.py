@@ -0,0 +1,14 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.notifications import subscriptions
+from apps.notifications.models import DeathSubscription
+
+
+@receiver([post_save, post_delete], sender=DeathSubscription)
+def subscriptions_changed(sender: type[DeathSubscription], **kwargs: Any) -> None:
+    """Every process's subscription index is stale once this commits."""
+    transaction.on_commit(subscriptions.changed)
@@ -0,0 +1,138 @@
+"""In-memory index matching deaths to `DeathSubscription`s.
+
+Checking every new death against every subscription costs O(deaths ×
+subscriptions). The index splits subscriptions by filter: no filter,
+world only, character only, world and character. Each group, or each
+world / character within a group (dict lookups), keeps its subscriptions
+sorted by `min_level`. The subscriptions a death at level L matches are then a
+prefix of each candidate list, found by `bisect`, so matching costs a few
+lookups and binary searches plus the matches themselves.
+
+Each process builds the index from the table on first use and keeps it.
+Saving or deleting a subscription bumps a version counter in Redis after
+commit (`signals`); `current_index` compares it at most every
+`CHECK_INTERVAL` seconds and rebuilds when it moved, so a change reaches
+every ingesting process within about a second. Without Redis it rebuilds
+every `CHECK_INTERVAL` instead.
+"""
+
+import bisect
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+
+import redis
+
+from apps.characters.services import normalize_character_name
+from apps.notifications.models import DeathSubscription
+from config.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "notifications:subscriptions:version"
+CHECK_INTERVAL = 1.0
+
+
+class _Thresholds:
+    """Subscriptions sorted by `min_level`; `upto(level)` is the prefix a
+    death at `level` matches."""
+
+    def __init__(self, subscriptions: list[DeathSubscription]) -> None:
+        subscriptions.sort(key=lambda s: s.min_level)
+        self.levels = [s.min_level for s in subscriptions]
+        self.subscriptions = subscriptions
+
+    def upto(self, level: int) -> list[DeathSubscription]:
+        return self.subscriptions[: bisect.bisect_right(self.levels, level)]
+
+
+class SubscriptionIndex:
+    def __init__(self, subscriptions: Iterable[DeathSubscription]) -> None:
+        everywhere: list[DeathSubscription] = []
+        by_world: defaultdict[str, list[DeathSubscription]] = defaultdict(list)
+        by_character: defaultdict[str, list[DeathSubscription]] = defaultdict(list)
+        by_both: defaultdict[tuple[str, str], list[DeathSubscription]] = defaultdict(
+            list
+        )
+        self.size = 0
+        for sub in subscriptions:
+            self.size += 1
+            world = sub.world.lower()
+            name = normalize_character_name(sub.character_name)
+            if world and name:
+                by_both[world, name].append(sub)
+            elif world:
+                by_world[world].append(sub)
+            elif name:
+                by_character[name].append(sub)
+            else:
+                everywhere.append(sub)
+        self._everywhere = _Thresholds(everywhere)
+        self._by_world = {k: _Thresholds(v) for k, v in by_world.items()}
+        self._by_character = {k: _Thresholds(v) for k, v in by_character.items()}
+        self._by_both = {k: _Thresholds(v) for k, v in by_both.items()}
+
+    @property
+    def needs_world(self) -> bool:
+        """Whether any subscription filters by world (the caller then has
+        to look up the dead character's world)."""
+        return bool(self._by_world or self._by_both)
+
+    def match(
+        self, level: int, character_name: str, world: str = ""
+    ) -> list[DeathSubscription]:
+        """Subscriptions a death at `level` of `character_name` on `world`
+        matches, at most one per channel (the lowest threshold wins)."""
+        name = normalize_character_name(character_name)
+        world = world.lower()
+        candidates = [self._everywhere, self._by_character.get(name)]
+        if world:
+            candidates += [self._by_world.get(world), self._by_both.get((world, name))]
+        channels: dict[str, DeathSubscription] = {}
+        for thresholds in candidates:
+            if thresholds is None:
+                continue
+            for sub in thresholds.upto(level):
+                known = channels.get(sub.channel_id)
+                if known is None or sub.min_level < known.min_level:
+                    channels[sub.channel_id] = sub
+        return list(channels.values())
+
+
+_index: SubscriptionIndex | None = None
+_version: int | None = None
+_checked_at = 0.0
+
+
+def current_index() -> SubscriptionIndex:
+    """This process's index, rebuilt if a subscription changed since."""
+    global _index, _version, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < CHECK_INTERVAL:
+        return _index
+    _checked_at = now
+    try:
+        version: int | None = int(get_redis().get(VERSION_KEY) or 0)  # type: ignore[arg-type]
+    except redis.RedisError:
+        logger.warning("Could not read the subscription version", exc_info=True)
+        version = None
+    if _index is None or version is None or version != _version:
+        _index = SubscriptionIndex(DeathSubscription.objects.all())
+        _version = version
+    return _index
+
+
+def changed() -> None:
+    """Make every process rebuild its index (call after commit)."""
+    clear()
+    try:
+        get_redis().incr(VERSION_KEY)
+    except redis.RedisError:
+        logger.warning("Could not bump the subscription version", exc_info=True)
+
+
+def clear() -> None:
+    """Drop this process's index; the next `current_index` rebuilds it."""
+    global _index
+    _index = None
@@ -0,0 +1,59 @@
+from django.contrib import admin
+from django.http import HttpRequest
+
+from apps.scraping.models import ScrapeRun, ScrapeRunItem
+
+
+class ScrapeRunItemInline(admin.TabularInline):  # type: ignore[type-arg]
+    model = ScrapeRunItem
+    fields = (
+        "target",
+        "outcome",
+        "total_ms",
+        "startup_ms",
+        "fetch_ms",
+        "parse_ms",
+        "db_ms",
+        "bytes_downloaded",
+        "items",
+        "staleness_seconds",
+        "error_class",
+        "startup_profile",
+    )
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(
+        self, request: HttpRequest, obj: ScrapeRun | None = None
+    ) -> bool:
+        return False
+
+
+@admin.register(ScrapeRun)
+class ScrapeRunAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = (
+        "started_at",
+        "kind",
+        "duration_ms",
+        "targets",
+        "items",
+        "unchanged",
+        "failed",
+        "skipped",
+        "bytes_downloaded",
+        "error_class",
+    )
+    list_filter = ("kind", "started_at")
+    search_fields = ("task_id", "entries__target")
+    ordering = ["-started_at", "-id"]
+    date_hierarchy = "started_at"
+    inlines = [ScrapeRunItemInline]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: ScrapeRun | None = None
+    ) -> bool:
+        return False
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ScrapingConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.scraping"
+    label = "scraping"
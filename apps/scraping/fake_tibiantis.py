@@ -0,0 +1,123 @@
+"""Local stand-in for the Tibiantis sites, for load tests and dev
+(`manage.py fake_tibiantis`, `manage.py loadtest`).
+
+Serves `characters` synthetic characters (`apps.scraping.synthetic`) as
+tibiantis.online does, at ``/?page=character&name=<name>`` — an unknown
+name gets the site's "does not exist" page — and tibiantis.info's deaths
+list at ``/stats/deaths/<page>`` (`deaths_pages` pages of
+`deaths_per_page`). Point the spiders at it with `TIBIANTIS_BASE_URL`.
+
+`latency` delays every response (seconds; `jitter` spreads it uniformly by
+± that fraction), and `error_rate` is the share of requests answered 503,
+for fault injection. `requests` and `errors` count what was served.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from apps.scraping import synthetic
+
+ROBOTS_TXT = "User-agent: *\nAllow: /\n"
+
+
+@dataclass
+class FakeTibiantis:
+    characters: int = 10_000
+    deaths_pages: int = 20
+    deaths_per_page: int = 50
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    requests: int = 0
+    errors: int = 0
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        self.app = web.Application()
+        self.app.router.add_get("/", self._index)
+        self.app.router.add_get("/robots.txt", self._robots)
+        self.app.router.add_get("/stats/deaths", self._deaths)
+        self.app.router.add_get("/stats/deaths/{page:\\d+}", self._deaths)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on `host:port` (0: any free port); returns the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeTibiantis":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def _respond(self) -> web.Response | None:
+        """The injected delay and failure; None to serve the page."""
+        self.requests += 1
+        if self.latency:
+            spread = self.latency * self.jitter
+            await asyncio.sleep(self.latency + self._random.uniform(-spread, spread))
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+        return None
+
+    async def _robots(self, request: web.Request) -> web.Response:
+        return web.Response(text=ROBOTS_TXT)
+
+    async def _index(self, request: web.Request) -> web.Response:
+        failed = await self._respond()
+        if failed is not None:
+            return failed
+        if request.query.get("page") != "character":
+            raise web.HTTPNotFound()
+        name = request.query.get("name", "")
+        n = synthetic.index(name)
+        if n is None or n >= self.characters:
+            html = synthetic.not_found_page(name)
+        else:
+            html = synthetic.character_page(synthetic.character(n, self.seed))
+        return web.Response(text=html, content_type="text/html")
+
+    async def _deaths(self, request: web.Request) -> web.Response:
+        failed = await self._respond()
+        if failed is not None:
+            return failed
+        page = int(request.match_info.get("page", 1))
+        if not 1 <= page <= self.deaths_pages:
+            raise web.HTTPNotFound()
+        html = synthetic.deaths_page(
+            page,
+            pages=self.deaths_pages,
+            per_page=self.deaths_per_page,
+            characters=self.characters,
+            seed=self.seed,
+        )
+        return web.Response(text=html, content_type="text/html")
+
+
+def serve(host: str, port: int, **options: object) -> None:
+    """Run a `FakeTibiantis(**options)` until interrupted (a process target)."""
+    web.run_app(
+        FakeTibiantis(**options).app,  # type: ignore[arg-type]
+        host=host,
+        port=port,
+        print=None,
+        access_log=None,
+    )
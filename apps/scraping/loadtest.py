@@ -0,0 +1,214 @@
+"""End-to-end load test of character scraping (`manage.py loadtest`).
+
+`LoadTestSpider` is the character spider with its start requests replaced:
+it asks for synthetic characters `offset`..`offset + count - 1`
+(`apps.scraping.synthetic`), so pages go through the usual parse, the
+project's extensions and `DjangoPipeline` into the database, only served by
+a fake site (`apps.scraping.fake_tibiantis`) instead of tibiantis.online.
+
+`run` crawls in this process and measures each character from its first
+request reaching the downloader to its item being stored (retries
+included), plus the crawl's own fetch and DB-write timings. `existing` and
+`delete` let the command remove only the rows its run created.
+"""
+
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Any
+
+import redis
+import scrapy
+
+from apps.characters import schedule
+from apps.characters.models import Character
+from apps.scraping import synthetic
+from config import metrics
+from scrapers.tibiantis_scrapers.spiders.character_spider import (
+    BASE_URL,
+    CharacterSpider,
+    character_url,
+)
+
+SENT_AT = "loadtest_sent_at"
+BATCH = 5000
+
+
+class LoadTestSpider(CharacterSpider):  # type: ignore[misc]
+    name = "character_loadtest"
+
+    def __init__(self, *args: Any, count: int, offset: int = 0, **kwargs: Any) -> None:
+        super().__init__("(load test)", *args, **kwargs)
+        self.count = count
+        self.offset = offset
+        self.base_url = BASE_URL
+
+    @classmethod
+    def from_crawler(cls, crawler: Any, *args: Any, **kwargs: Any) -> "LoadTestSpider":
+        spider: LoadTestSpider = super().from_crawler(crawler, *args, **kwargs)
+        spider.base_url = crawler.settings.get("TIBIANTIS_BASE_URL", BASE_URL)
+        return spider
+
+    async def start(self) -> Any:
+        for n in range(self.offset, self.offset + self.count):
+            yield scrapy.Request(
+                character_url(synthetic.name(n), self.base_url),
+                callback=self.parse,
+                dont_filter=True,
+            )
+
+
+@dataclass
+class LoadTestResult:
+    characters: int
+    elapsed: float
+    # Seconds per stored item: first request sent → item stored, and the
+    # download of its page.
+    latencies: list[float] = field(default_factory=list)
+    fetches: list[float] = field(default_factory=list)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    stats: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def items(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def db_seconds(self) -> float:
+        return float(self.stats.get("tibiantis/db_ms", 0.0)) / 1000
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The `q`-quantile (0..1) of `values`; 0 when there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def run(
+    base_url: str,
+    count: int,
+    *,
+    offset: int = 0,
+    concurrency: int = 16,
+    log_level: str = "INFO",
+) -> LoadTestResult:
+    """Scrape `count` synthetic characters from the site at `base_url`.
+
+    Installs the Twisted reactor and blocks until the crawl ends: call once
+    per process.
+    """
+    from scrapy import signals
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    os.environ.setdefault(
+        "SCRAPY_SETTINGS_MODULE", "scrapers.tibiantis_scrapers.settings"
+    )
+    settings = get_project_settings()
+    settings.setdict(
+        {
+            "TIBIANTIS_BASE_URL": base_url,
+            "CONCURRENT_REQUESTS": concurrency,
+            "CONCURRENT_REQUESTS_PER_DOMAIN": concurrency,
+            "DOWNLOAD_DELAY": 0,
+            "TELNETCONSOLE_ENABLED": False,
+            "LOG_LEVEL": log_level,
+        },
+        priority="cmdline",
+    )
+    result = LoadTestResult(characters=count, elapsed=0.0)
+
+    def sent(request: scrapy.Request, spider: scrapy.Spider) -> None:
+        # Retries copy the meta: the first attempt's time is kept.
+        request.meta.setdefault(SENT_AT, time.perf_counter())
+
+    def stored(item: Any, response: Any, spider: scrapy.Spider) -> None:
+        result.latencies.append(time.perf_counter() - response.meta[SENT_AT])
+        result.fetches.append(response.meta.get("download_latency", 0.0))
+
+    def ingested(sender: Any, kind: str, outcome: str, **kwargs: Any) -> None:
+        result.outcomes[outcome] += 1
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(LoadTestSpider)
+    crawler.signals.connect(sent, signal=signals.request_reached_downloader)
+    crawler.signals.connect(stored, signal=signals.item_scraped)
+    metrics.item_ingested.connect(ingested)
+    try:
+        started = time.perf_counter()
+        process.crawl(crawler, count=count, offset=offset)
+        process.start()
+        result.elapsed = time.perf_counter() - started
+    finally:
+        metrics.item_ingested.disconnect(ingested)
+    result.stats = crawler.stats.get_stats() if crawler.stats else {}
+    return result
+
+
+def existing(indices: range) -> set[str]:
+    """The names of synthetic characters `indices` already in the database."""
+    found: set[str] = set()
+    for batch in batched(map(synthetic.name, indices), BATCH):
+        found.update(
+            Character.objects.filter(name__in=batch).values_list("name", flat=True)
+        )
+    return found
+
+
+def delete(indices: range, keep: set[str]) -> int:
+    """Delete synthetic characters `indices` except `keep`, and unschedule
+    them; the number of rows deleted."""
+    deleted = 0
+    names = (name for name in map(synthetic.name, indices) if name not in keep)
+    for batch in batched(names, BATCH):
+        deleted += (
+            Character.objects.filter(name__in=batch)
+            .delete()[1]
+            .get(Character._meta.label, 0)
+        )
+        try:
+            schedule.unschedule(batch)
+        except redis.RedisError:
+            pass  # scrape_character drops names that have no row
+    return deleted
+
+
+def summary(result: LoadTestResult) -> list[str]:
+    """The report's lines."""
+    items, elapsed = result.items, result.elapsed or 1e-9
+    errors = {
+        key.rsplit("/", 1)[-1]: value
+        for key, value in result.stats.items()
+        if key.startswith("downloader/response_status_count/")
+        and not key.endswith("/200")
+    }
+    lines = [
+        f"items       {items} of {result.characters} in {elapsed:.1f} s "
+        f"→ {items / elapsed:.1f} items/s",
+        f"latency     p50 {percentile(result.latencies, 0.5) * 1000:.1f} ms  "
+        f"p99 {percentile(result.latencies, 0.99) * 1000:.1f} ms  "
+        "(first request → item stored)",
+        f"fetch       p50 {percentile(result.fetches, 0.5) * 1000:.1f} ms  "
+        f"p99 {percentile(result.fetches, 0.99) * 1000:.1f} ms",
+    ]
+    if items:
+        # DjangoPipeline awaits its writes on one thread: the awaited time
+        # includes the queue behind the other writes.
+        lines.append(
+            f"db writes   {items} → {items / elapsed:.1f} writes/s, "
+            f"awaited {result.db_seconds / items * 1000:.1f} ms each"
+        )
+    lines.append(
+        "outcomes    "
+        + (", ".join(f"{k} {v}" for k, v in sorted(result.outcomes.items())) or "-")
+    )
+    lines.append(
+        f"errors      retries {result.stats.get('retry/count', 0)}, gave up "
+        f"{result.stats.get('retry/max_reached', 0)}"
+        + "".join(f", HTTP {status}: {n}" for status, n in sorted(errors.items()))
+    )
+    return lines
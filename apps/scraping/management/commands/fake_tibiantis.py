@@ -0,0 +1,49 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.scraping import fake_tibiantis
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve synthetic Tibiantis character and deaths pages locally "
+        "(see apps.scraping.fake_tibiantis)."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8766)
+        parser.add_argument("--characters", type=int, default=10_000)
+        parser.add_argument("--deaths-pages", type=int, default=20)
+        parser.add_argument("--deaths-per-page", type=int, default=50)
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds added to every response"
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=0.0, help="± fraction of --latency"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share answered 503"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        base_url = f"http://{options['host']}:{options['port']}"
+        self.stdout.write(
+            f"Characters: {base_url}/?page=character&name=<name>, "
+            f"deaths: {base_url}/stats/deaths/<page> "
+            f"(TIBIANTIS_BASE_URL={base_url})"
+        )
+        fake_tibiantis.serve(
+            options["host"],
+            options["port"],
+            characters=options["characters"],
+            deaths_pages=options["deaths_pages"],
+            deaths_per_page=options["deaths_per_page"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+        )
@@ -0,0 +1,102 @@
+import multiprocessing
+import socket
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.scraping import fake_tibiantis, loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Scrape synthetic characters from a local fake Tibiantis into the "
+        "database and report throughput and latency (see apps.scraping.loadtest)."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("--characters", type=int, default=10_000)
+        parser.add_argument(
+            "--offset", type=int, default=0, help="First synthetic character"
+        )
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--base-url",
+            default="",
+            help="Site to scrape; by default a fake one is started on --port",
+        )
+        parser.add_argument("--port", type=int, default=8766)
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Fake site's response delay"
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=0.0, help="± fraction of --latency"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Share answered 503"
+        )
+        parser.add_argument("--log-level", default="WARNING")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Leave the synthetic characters in the database",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        database = settings.DATABASES["default"]["NAME"]
+        if database not in settings.LOADTEST_DATABASES:
+            raise CommandError(
+                f"Refusing to load-test database {database!r}: the run writes and "
+                "deletes characters. Point DATABASE_URL at a throwaway database "
+                "and list its name in LOADTEST_DATABASES."
+            )
+        count, offset = options["characters"], options["offset"]
+        indices = range(offset, offset + count)
+        # Rows a --keep run left behind are not this run's to delete.
+        keep = loadtest.existing(indices)
+        base_url, server = options["base_url"], None
+        if not base_url:
+            server = multiprocessing.get_context("spawn").Process(
+                target=fake_tibiantis.serve,
+                args=("127.0.0.1", options["port"]),
+                kwargs={
+                    "characters": offset + count,
+                    "latency": options["latency"],
+                    "jitter": options["jitter"],
+                    "error_rate": options["error_rate"],
+                },
+                daemon=True,
+            )
+            server.start()
+            _wait_for_port(options["port"])
+            base_url = f"http://127.0.0.1:{options['port']}"
+        try:
+            result = loadtest.run(
+                base_url,
+                count,
+                offset=offset,
+                concurrency=options["concurrency"],
+                log_level=options["log_level"],
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.join(10)
+        for line in loadtest.summary(result):
+            self.stdout.write(line)
+        if not options["keep"]:
+            deleted = loadtest.delete(indices, keep)
+            self.stdout.write(f"Deleted {deleted} synthetic characters")
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise CommandError(f"Fake Tibiantis did not start on port {port}")
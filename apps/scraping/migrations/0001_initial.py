@@ -0,0 +1,125 @@
+# Generated by Django 6.0.4 on 2026-10-19 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapeRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("sweep", "Watchlist sweep"),
+                            ("character", "Single character"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("task_id", models.CharField(blank=True, default="", max_length=64)),
+                ("started_at", models.DateTimeField()),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("targets", models.PositiveIntegerField(default=0)),
+                ("items", models.PositiveIntegerField(default=0)),
+                ("unchanged", models.PositiveIntegerField(default=0)),
+                ("duplicate", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("skipped", models.PositiveIntegerField(default=0)),
+                ("bytes_downloaded", models.PositiveBigIntegerField(default=0)),
+                ("startup_ms", models.FloatField(default=0)),
+                ("fetch_ms", models.FloatField(default=0)),
+                ("parse_ms", models.FloatField(default=0)),
+                ("db_ms", models.FloatField(default=0)),
+                (
+                    "error_class",
+                    models.CharField(blank=True, default="", max_length=128),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["-started_at", "-id"], name="scrape_runs_started_idx"
+                    ),
+                    models.Index(
+                        fields=["kind", "-started_at", "-id"],
+                        name="scrape_runs_kind_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ScrapeRunItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("target", models.CharField(max_length=64)),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[
+                            ("scraped", "Stored with changes"),
+                            ("unchanged", "Nothing changed"),
+                            ("empty", "Page yielded nothing"),
+                            ("skipped", "Not fetched"),
+                            ("failed", "Failed"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("total_ms", models.FloatField()),
+                ("staleness_seconds", models.FloatField(blank=True, null=True)),
+                ("fetches", models.PositiveIntegerField(default=0)),
+                ("bytes_downloaded", models.PositiveBigIntegerField(default=0)),
+                ("items", models.PositiveIntegerField(default=0)),
+                ("unchanged", models.PositiveIntegerField(default=0)),
+                ("duplicate", models.PositiveIntegerField(default=0)),
+                ("startup_ms", models.FloatField(blank=True, null=True)),
+                ("fetch_ms", models.FloatField(blank=True, null=True)),
+                ("parse_ms", models.FloatField(blank=True, null=True)),
+                ("db_ms", models.FloatField(blank=True, null=True)),
+                (
+                    "error_class",
+                    models.CharField(blank=True, default="", max_length=128),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="scraping.scraperun",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["started_at"], name="scrape_run_items_started_idx"
+                    )
+                ],
+            },
+        ),
+    ]
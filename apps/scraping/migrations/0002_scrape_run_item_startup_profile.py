@@ -0,0 +1,17 @@
+# Generated by Django 6.0.4 on 2026-10-19 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scraping", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scraperunitem",
+            name="startup_profile",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
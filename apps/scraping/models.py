@@ -0,0 +1,97 @@
+from django.db import models
+
+
+class ScrapeRun(models.Model):
+    """One scrape task run: a watchlist sweep or a single dispatched character.
+
+    Totals are summed from its `ScrapeRunItem` rows as they are recorded
+    (`services.RunRecorder`), so listing runs never aggregates items.
+    """
+
+    class Kind(models.TextChoices):
+        SWEEP = "sweep", "Watchlist sweep"
+        CHARACTER = "character", "Single character"
+
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    task_id = models.CharField(max_length=64, blank=True, default="")
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    targets = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    duplicate = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    bytes_downloaded = models.PositiveBigIntegerField(default=0)
+
+    # Phase totals over all targets, in milliseconds.
+    startup_ms = models.FloatField(default=0)
+    fetch_ms = models.FloatField(default=0)
+    parse_ms = models.FloatField(default=0)
+    db_ms = models.FloatField(default=0)
+
+    # Set when the task itself failed (not a single target).
+    error_class = models.CharField(max_length=128, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order of the `scrapeRuns` connection.
+            models.Index(fields=["-started_at", "-id"], name="scrape_runs_started_idx"),
+            models.Index(
+                fields=["kind", "-started_at", "-id"], name="scrape_runs_kind_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} @ {self.started_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds() * 1000
+
+
+class ScrapeRunItem(models.Model):
+    """One target (character) scraped within a run."""
+
+    class Outcome(models.TextChoices):
+        SCRAPED = "scraped", "Stored with changes"
+        UNCHANGED = "unchanged", "Nothing changed"
+        EMPTY = "empty", "Page yielded nothing"
+        SKIPPED = "skipped", "Not fetched"
+        FAILED = "failed", "Failed"
+
+    run = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name="entries")
+    target = models.CharField(max_length=64)
+    outcome = models.CharField(max_length=16, choices=Outcome.choices)
+    started_at = models.DateTimeField()
+    # Wall time of the whole target, process spawn included.
+    total_ms = models.FloatField()
+    # How old the stored data was when this scrape started (feed lag).
+    staleness_seconds = models.FloatField(null=True, blank=True)
+
+    fetches = models.PositiveIntegerField(default=0)
+    bytes_downloaded = models.PositiveBigIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    duplicate = models.PositiveIntegerField(default=0)
+
+    startup_ms = models.FloatField(null=True, blank=True)
+    fetch_ms = models.FloatField(null=True, blank=True)
+    parse_ms = models.FloatField(null=True, blank=True)
+    db_ms = models.FloatField(null=True, blank=True)
+    # Where `startup_ms` went, step → ms (`apps.scraping.startup`).
+    startup_profile = models.JSONField(default=dict, blank=True)
+
+    error_class = models.CharField(max_length=128, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # Trend buckets (`scrapeRunTrends`) are started_at ranges.
+            models.Index(fields=["started_at"], name="scrape_run_items_started_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.target}: {self.outcome}"
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import cast
+
+import strawberry
+import strawberry_django
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from strawberry import auto
+
+from apps.scraping import services
+from apps.scraping.models import ScrapeRun, ScrapeRunItem
+from config.optimizer import optimize_connection
+from config.pagination import Connection, decode_cursor, encode_cursor, keyset_page
+from config.permissions import require_staff
+
+CURSOR_KIND = "scrape_run"
+
+
+@strawberry_django.type(ScrapeRunItem)
+class ScrapeRunItemType:
+    target: auto
+    outcome: auto
+    started_at: auto
+    total_ms: auto
+    staleness_seconds: auto
+    fetches: auto
+    bytes_downloaded: auto
+    items: auto
+    unchanged: auto
+    duplicate: auto
+    startup_ms: auto
+    fetch_ms: auto
+    parse_ms: auto
+    db_ms: auto
+    error_class: auto
+
+
+@strawberry_django.type(ScrapeRun)
+class ScrapeRunType:
+    kind: auto
+    task_id: auto
+    started_at: auto
+    finished_at: auto
+    targets: auto
+    items: auto
+    unchanged: auto
+    duplicate: auto
+    failed: auto
+    skipped: auto
+    bytes_downloaded: auto
+    startup_ms: auto
+    fetch_ms: auto
+    parse_ms: auto
+    db_ms: auto
+    error_class: auto
+    entries: list[ScrapeRunItemType]
+
+    @strawberry_django.field(only=["started_at", "finished_at"])  # type: ignore[untyped-decorator]
+    def duration_ms(self, root: ScrapeRun) -> float | None:
+        return root.duration_ms
+
+
+@strawberry.enum
+class TrendBucket(Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+@strawberry.type
+class ScrapeRunTrendType:
+    bucket: datetime
+    targets: int
+    scraped: int
+    unchanged: int
+    failed: int
+    skipped: int
+    items: int
+    bytes_downloaded: int
+    avg_total_ms: float | None
+    avg_fetch_ms: float | None
+    avg_db_ms: float | None
+    max_staleness_seconds: float | None
+    targets_per_minute: float | None
+
+
+def _cursor(run: ScrapeRun) -> str:
+    return encode_cursor(CURSOR_KIND, run.started_at.isoformat(), run.pk)
+
+
+def _position(after: str | None) -> tuple[datetime, int] | None:
+    if after is None:
+        return None
+    try:
+        started_at, pk = decode_cursor(CURSOR_KIND, after)
+        return datetime.fromisoformat(started_at), int(pk)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def scrape_runs(
+        self,
+        info: strawberry.Info,
+        kind: str | None = None,
+        first: int | None = None,
+        after: str | None = None,
+    ) -> Connection[ScrapeRunType]:
+        """Scrape task runs, newest first, with their per-target entries
+        (staff only)."""
+        await require_staff(info)
+        qs = optimize_connection(
+            services.runs_after(_position(after), kind=kind),
+            info,
+            only=["started_at"],
+        )
+        result = await keyset_page(qs, first=first, after=after, cursor_for=_cursor)
+        return cast("Connection[ScrapeRunType]", result)
+
+    @strawberry.field
+    async def scrape_run_trends(
+        self,
+        info: strawberry.Info,
+        kind: str | None = None,
+        bucket: TrendBucket = TrendBucket.HOUR,
+        days: int = 7,
+    ) -> list[ScrapeRunTrendType]:
+        """Per-hour or per-day throughput, failures, phase times and feed lag
+        over the last `days` days, oldest first (staff only)."""
+        await require_staff(info)
+        if not 1 <= days <= 90:
+            raise ValueError("`days` must be between 1 and 90")
+        trends = await sync_to_async(services.run_trends)(
+            bucket=bucket.value,
+            since=timezone.now() - timedelta(days=days),
+            kind=kind,
+        )
+        return [ScrapeRunTrendType(**vars(trend)) for trend in trends]
@@ -0,0 +1,278 @@
+"""Scrape-run ledger: one `ScrapeRun` per task run, one `ScrapeRunItem` per
+target, kept in the database instead of the Celery result backend.
+
+A scrape subprocess measures its own phases and reports them through a JSON
+file named in `SCRAPE_REPORT_PATH` (`write_report`); the task turns the
+report into a `ScrapeRunItem` (`item_from_report`) and hands it to a
+`RunRecorder`, which writes items and the run's totals in batches of
+`SCRAPE_RUN_BATCH_SIZE` — one INSERT per batch, not one per target.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q, QuerySet, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from apps.scraping.models import ScrapeRun, ScrapeRunItem
+from apps.scraping.types import ScrapeReport
+
+SCRAPE_REPORT_ENV = "SCRAPE_REPORT_PATH"
+
+_RUN_TOTALS = [
+    "targets",
+    "items",
+    "unchanged",
+    "duplicate",
+    "failed",
+    "skipped",
+    "bytes_downloaded",
+    "startup_ms",
+    "fetch_ms",
+    "parse_ms",
+    "db_ms",
+    "finished_at",
+    "error_class",
+]
+
+
+def write_report(report: ScrapeReport) -> None:
+    """Hand `report` to the parent task, if it asked for one."""
+    path = os.environ.get(SCRAPE_REPORT_ENV)
+    if path:
+        Path(path).write_text(json.dumps(report), encoding="utf-8")
+
+
+def read_report(path: str | Path) -> ScrapeReport | None:
+    """The subprocess's report; None if it died before writing one."""
+    try:
+        report: ScrapeReport = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return report
+
+
+def crawl_error(stats: dict[str, Any]) -> str:
+    """The class of the first error a crawl's Scrapy stats count; "" for none.
+
+    Callback errors (`spider_exceptions/*`) always fail a crawl. A download
+    exception is counted before `RetryMiddleware` retries the request, so it
+    only does when the retries ran out (`retry/max_reached`) or nothing was
+    stored: a timeout followed by a good response is not a failure.
+    """
+    prefixes = ["spider_exceptions/"]
+    if stats.get("retry/max_reached") or not stats.get("item_scraped_count"):
+        prefixes.append("downloader/exception_type_count/")
+    errors = [
+        key.rsplit("/", 1)[-1].rsplit(".", 1)[-1]
+        for key in stats
+        if key.startswith(tuple(prefixes)) and key != "spider_exceptions/count"
+    ]
+    return errors[0] if errors else ""
+
+
+def item_from_report(
+    target: str,
+    *,
+    started_at: datetime,
+    total_ms: float,
+    returncode: int | None,
+    report: ScrapeReport | None,
+    staleness_seconds: float | None = None,
+    error_class: str = "",
+) -> ScrapeRunItem:
+    """One target's ledger entry.
+
+    `returncode` None means the subprocess never finished (pass the
+    exception's class as `error_class`). A crawl that exits cleanly but
+    logged an error (`crawl_error`) is still a failure.
+    """
+    item = ScrapeRunItem(
+        target=target,
+        started_at=started_at,
+        total_ms=total_ms,
+        staleness_seconds=staleness_seconds,
+        error_class=error_class,
+    )
+    outcomes: dict[str, int] = {}
+    if report is not None:
+        outcomes = report["outcomes"]
+        item.fetches = report["fetches"]
+        item.bytes_downloaded = report["bytes"]
+        item.items = report["items"]
+        item.unchanged = outcomes.get("unchanged", 0)
+        item.duplicate = outcomes.get("duplicate", 0)
+        item.startup_ms = report["startup_ms"]
+        item.startup_profile = report["startup_profile"]
+        item.fetch_ms = report["fetch_ms"]
+        item.parse_ms = report["parse_ms"]
+        item.db_ms = report["db_ms"]
+        item.error_class = item.error_class or report["error_class"]
+    if returncode is None or returncode != 0 or item.error_class:
+        if not item.error_class:
+            item.error_class = "ScrapeFailed" if returncode is None else "NonZeroExit"
+        item.outcome = ScrapeRunItem.Outcome.FAILED
+    elif report is None or outcomes.get("scraped"):
+        # A clean exit without a report predates the report: trust the exit code.
+        item.outcome = ScrapeRunItem.Outcome.SCRAPED
+    elif item.unchanged or item.duplicate:
+        item.outcome = ScrapeRunItem.Outcome.UNCHANGED
+    else:
+        item.outcome = ScrapeRunItem.Outcome.EMPTY
+    return item
+
+
+def skipped_item(target: str, staleness_seconds: float | None = None) -> ScrapeRunItem:
+    return ScrapeRunItem(
+        target=target,
+        outcome=ScrapeRunItem.Outcome.SKIPPED,
+        started_at=timezone.now(),
+        total_ms=0.0,
+        staleness_seconds=staleness_seconds,
+    )
+
+
+class RunRecorder:
+    """Accumulates one run's items and writes them in batches.
+
+    Use as a context manager: the run is finished on exit, with the class of
+    the exception that ended the task (if any) as its `error_class`. Nothing
+    is written until the first batch fills or the run finishes.
+    """
+
+    def __init__(
+        self, kind: str, *, task_id: str | None = None, batch_size: int | None = None
+    ) -> None:
+        self.run = ScrapeRun(
+            kind=kind, task_id=task_id or "", started_at=timezone.now()
+        )
+        self.batch_size = batch_size or settings.SCRAPE_RUN_BATCH_SIZE
+        self._pending: list[ScrapeRunItem] = []
+
+    def __enter__(self) -> "RunRecorder":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.finish(error_class=exc_type.__name__ if exc_type else "")
+
+    def add(self, item: ScrapeRunItem) -> None:
+        run = self.run
+        run.targets += 1
+        run.items += item.items
+        run.unchanged += item.unchanged
+        run.duplicate += item.duplicate
+        run.failed += item.outcome == ScrapeRunItem.Outcome.FAILED
+        run.skipped += item.outcome == ScrapeRunItem.Outcome.SKIPPED
+        run.bytes_downloaded += item.bytes_downloaded
+        run.startup_ms += item.startup_ms or 0.0
+        run.fetch_ms += item.fetch_ms or 0.0
+        run.parse_ms += item.parse_ms or 0.0
+        run.db_ms += item.db_ms or 0.0
+        self._pending.append(item)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def finish(self, error_class: str = "") -> ScrapeRun:
+        self.run.finished_at = timezone.now()
+        self.run.error_class = error_class
+        self.flush()
+        return self.run
+
+    def flush(self) -> None:
+        with transaction.atomic():
+            if self.run.pk is None:
+                self.run.save()
+            else:
+                self.run.save(update_fields=_RUN_TOTALS)
+            for item in self._pending:
+                item.run = self.run
+            ScrapeRunItem.objects.bulk_create(self._pending)
+        self._pending.clear()
+
+
+def runs_after(
+    position: tuple[datetime, int] | None, *, kind: str | None = None
+) -> QuerySet[ScrapeRun]:
+    """Runs newest-first, strictly after `position` = (started_at, id)."""
+    qs = ScrapeRun.objects.order_by("-started_at", "-id")
+    if kind is not None:
+        qs = qs.filter(kind=kind)
+    if position is not None:
+        started_at, pk = position
+        qs = qs.filter(started_at__lte=started_at).filter(
+            Q(started_at__lt=started_at) | Q(started_at=started_at, id__lt=pk)
+        )
+    return qs
+
+
+@dataclass
+class RunTrend:
+    bucket: datetime
+    targets: int
+    scraped: int
+    unchanged: int
+    failed: int
+    skipped: int
+    items: int
+    bytes_downloaded: int
+    avg_total_ms: float | None
+    avg_fetch_ms: float | None
+    avg_db_ms: float | None
+    # Worst feed lag seen in the bucket: age of the data a scrape replaced.
+    max_staleness_seconds: float | None
+    # Fetched targets per minute of scrape wall time (one worker's throughput).
+    targets_per_minute: float | None
+
+
+def run_trends(
+    *, bucket: str = "hour", since: datetime, kind: str | None = None
+) -> list[RunTrend]:
+    """Per-`bucket` ("hour" or "day") aggregates of targets started since
+    `since`, oldest first."""
+    Outcome = ScrapeRunItem.Outcome
+    qs = ScrapeRunItem.objects.filter(started_at__gte=since)
+    if kind is not None:
+        qs = qs.filter(run__kind=kind)
+    fetched = ~Q(outcome=Outcome.SKIPPED)
+    rows = (
+        qs.annotate(bucket=Trunc("started_at", bucket))
+        .values("bucket")
+        .annotate(
+            targets=Count("id"),
+            scraped=Count("id", filter=Q(outcome=Outcome.SCRAPED)),
+            unchanged=Count("id", filter=Q(outcome=Outcome.UNCHANGED)),
+            failed=Count("id", filter=Q(outcome=Outcome.FAILED)),
+            skipped=Count("id", filter=Q(outcome=Outcome.SKIPPED)),
+            items=Sum("items"),
+            bytes_downloaded=Sum("bytes_downloaded"),
+            avg_total_ms=Avg("total_ms", filter=fetched),
+            avg_fetch_ms=Avg("fetch_ms"),
+            avg_db_ms=Avg("db_ms"),
+            max_staleness_seconds=Max("staleness_seconds", filter=fetched),
+            busy_ms=Sum("total_ms", filter=fetched),
+        )
+        .order_by("bucket")
+    )
+    return [_trend(row) for row in rows]
+
+
+def _trend(row: dict[str, Any]) -> RunTrend:
+    busy_ms = row.pop("busy_ms")
+    fetched = row["targets"] - row["skipped"]
+    return RunTrend(
+        **row,
+        targets_per_minute=fetched / busy_ms * 60_000 if busy_ms else None,
+    )
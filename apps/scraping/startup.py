@@ -0,0 +1,91 @@
+"""Where a scrape process's startup goes, step by step.
+
+`scrape_character` imports Twisted, crochet, Scrapy and the project's
+spiders, pipelines and extensions before it installs the reactor and fetches
+anything. `preload` does those imports one module at a time (then the Scrapy
+components the crawl would load on start) and records each in `profile`
+(step → ms), which the run reports as its `startup_profile`.
+
+A child forked from the scrape zygote (`apps.characters.zygote`) runs the
+same steps against modules the zygote already loaded, so they cost next to
+nothing there: comparing its profile with a cold subprocess's shows what the
+zygote saves.
+"""
+
+import importlib
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+PRELOAD = [
+    "twisted.internet.asyncioreactor",
+    "crochet",
+    "scrapy",
+    "scrapy.crawler",
+    "scrapy.utils.project",
+    "scrapers.tibiantis_scrapers.settings",
+    "scrapers.tibiantis_scrapers.spiders.character_spider",
+    "scrapers.tibiantis_scrapers.pipelines",
+    "scrapers.tibiantis_scrapers.metrics",
+    "scrapers.tibiantis_scrapers.scrape_log",
+    "scrapers.tibiantis_scrapers.tracing",
+]
+# Scrapy settings naming the components a crawl loads when it starts: dicts
+# of import path → order (or scheme → import path), and single classes.
+_COMPONENT_DICTS = [
+    "DOWNLOADER_MIDDLEWARES",
+    "SPIDER_MIDDLEWARES",
+    "EXTENSIONS",
+    "ITEM_PIPELINES",
+    "DOWNLOAD_HANDLERS",
+]
+_COMPONENT_CLASSES = [
+    "SCHEDULER",
+    "SCHEDULER_PRIORITY_QUEUE",
+    "SCHEDULER_MEMORY_QUEUE",
+    "DUPEFILTER_CLASS",
+    "DOWNLOADER",
+    "STATS_CLASS",
+    "LOG_FORMATTER",
+    "REQUEST_FINGERPRINTER_CLASS",
+    "SPIDER_LOADER_CLASS",
+]
+
+profile: dict[str, float] = {}
+
+
+@contextmanager
+def timed(step: str) -> Iterator[None]:
+    """Record the block's wall time in `profile` under `step`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile[step] = round((time.perf_counter() - started) * 1000, 3)
+
+
+def preload() -> dict[str, float]:
+    """Import everything a crawl needs short of installing the reactor;
+    the timings, by module."""
+    for module in PRELOAD:
+        with timed(module):
+            importlib.import_module(module)
+    with timed("scrapy.components"):
+        _load_components()
+    return profile
+
+
+def _load_components() -> None:
+    from scrapy.utils.misc import load_object
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    paths: list[object] = []
+    for name in _COMPONENT_DICTS:
+        components = settings.getwithbase(name)
+        paths += components.values() if name == "DOWNLOAD_HANDLERS" else components
+    paths += (settings.get(name) for name in _COMPONENT_CLASSES)
+    for path in paths:
+        # Disabled (None) entries and bare scheme names are not import paths.
+        if isinstance(path, str) and "." in path:
+            load_object(path)
@@ -0,0 +1,386 @@
+"""Synthetic Tibiantis pages for load tests, modeled on the saved pages in
+tests/fixtures.
+
+Characters are numbered. `name(n)` spells `n` in two-letter syllables and
+adds `MARKER` ("Bake Loti (synthetic)"), so `index(name)` reads it back: any
+of millions of characters can be served without storing them. Tibiantis
+names are letters, spaces, apostrophes and hyphens, so no real character
+has the marker. A character's attributes
+come from a random generator seeded with `(seed, n)`, so every request for
+it sees the same page.
+
+* `character_page` — tibiantis.online's profile: the `table.tabi`
+  information table the character spider reads (`tr.hover` rows), the
+  latest deaths and the layout around them;
+* `deaths_page` — tibiantis.info's deaths list: `table.mytab.long` rows
+  and the `mytab2 pagination` links, newest first, `per_page` per page.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from html import escape
+from urllib.parse import quote, quote_plus
+from zoneinfo import ZoneInfo
+
+_CONSONANTS = "bdklmnrt"
+_VOWELS = "aeio"
+_SYLLABLES = [c + v for c in _CONSONANTS for v in _VOWELS]
+_DIGITS = {syllable: n for n, syllable in enumerate(_SYLLABLES)}
+# Two syllables per word, at least two words: 32**4 ≈ 1M names before the
+# second word grows.
+_MIN_SYLLABLES = 4
+MARKER = " (synthetic)"
+
+SEXES = ["male", "female"]
+VOCATIONS = ["Knight", "Paladin", "Sorcerer", "Druid"]
+PROMOTED = {
+    "Knight": "Elite Knight",
+    "Paladin": "Royal Paladin",
+    "Sorcerer": "Master Sorcerer",
+    "Druid": "Elder Druid",
+}
+WORLDS = ["Tibiantis", "Concordia"]
+TOWNS = ["Thais", "Carlin", "Venore", "Ab'Dendriel", "Kazordoon", "Edron"]
+MONSTERS = ["a dragon lord", "a deathslicer", "a slime", "poison", "a giant spider"]
+SITE_TZ = ZoneInfo("Europe/Berlin")
+# Deaths are laid out backwards from here, one per `DEATH_INTERVAL`.
+DEATHS_UNTIL = datetime(2026, 4, 30, 6, 0, tzinfo=SITE_TZ)
+DEATH_INTERVAL = timedelta(minutes=7)
+
+
+def name(n: int) -> str:
+    digits: list[int] = []
+    while n or len(digits) < _MIN_SYLLABLES:
+        n, digit = divmod(n, len(_SYLLABLES))
+        digits.append(digit)
+    letters = "".join(_SYLLABLES[d] for d in digits)
+    return f"{letters[:4].capitalize()} {letters[4:].capitalize()}{MARKER}"
+
+
+def index(character_name: str) -> int | None:
+    """The number `name` spelled; None for a name it never produces."""
+    if not character_name.endswith(MARKER):
+        return None
+    letters = character_name.removesuffix(MARKER).replace(" ", "").lower()
+    if len(letters) % 2 or len(letters) < 2 * _MIN_SYLLABLES:
+        return None
+    n = 0
+    for at in range(len(letters) - 2, -1, -2):
+        digit = _DIGITS.get(letters[at : at + 2])
+        if digit is None:
+            return None
+        n = n * len(_SYLLABLES) + digit
+    return n if name(n) == character_name else None
+
+
+@dataclass(frozen=True)
+class SyntheticCharacter:
+    name: str
+    sex: str
+    vocation: str
+    level: int
+    world: str
+    residence: str
+    house: str
+    guild_membership: str
+    last_login: datetime | None
+    account_status: str
+
+
+def character(n: int, seed: int = 0) -> SyntheticCharacter:
+    rng = random.Random(f"{seed}:{n}")
+    # Most characters are low level, a few are very high.
+    level = min(int(rng.paretovariate(1.2) * 8), 400)
+    vocation = rng.choice(VOCATIONS)
+    if level >= 20 and rng.random() < 0.7:
+        vocation = PROMOTED[vocation]
+    last_login = None
+    if rng.random() > 0.02:
+        last_login = (
+            DEATHS_UNTIL - timedelta(minutes=rng.randrange(60 * 24 * 90))
+        ).replace(microsecond=0)
+    return SyntheticCharacter(
+        name=name(n),
+        sex=rng.choice(SEXES),
+        vocation=vocation,
+        level=level,
+        world=rng.choice(WORLDS),
+        residence=rng.choice(TOWNS),
+        house=f"{rng.choice(TOWNS)} Street {rng.randrange(1, 40)}"
+        if rng.random() < 0.15
+        else "",
+        guild_membership=f"Member of the Guild {rng.randrange(200)}"
+        if rng.random() < 0.3
+        else "",
+        last_login=last_login,
+        account_status="Premium Account" if rng.random() < 0.4 else "Free Account",
+    )
+
+
+def _site_time(at: datetime) -> str:
+    """`18 Apr 2026 01:25:30 CEST`, the profile's date format."""
+    at = at.astimezone(SITE_TZ)
+    return f"{at:%d %b %Y %H:%M:%S} {at.tzname()}"
+
+
+_MENU = "".join(
+    f"<tr><td><a href='?page={page}' class='menulink'>{label}</a></td></tr>\n"
+    for page, label in [
+        ("news", "Latest News"),
+        ("newsarchive", "News Archive"),
+        ("character", "Characters"),
+        ("whoisonline", "Who is Online?"),
+        ("highscores", "Highscores"),
+        ("killstatistics", "Kill Statistics"),
+        ("houses", "Houses"),
+        ("guilds", "Guilds"),
+        ("serverinfo", "Server Info"),
+        ("rules", "Rules"),
+        ("downloads", "Downloads"),
+        ("support", "Support"),
+    ]
+)
+# Like the real layout: head, the scroll script, the side menu and the
+# footer around the content (the profile page is about 16 kB).
+_PROFILE_LAYOUT = (
+    """<!DOCTYPE html>
+<html>
+	<head>
+		<link rel="stylesheet" id="css_st" href="new_lay/stylep.css">
+		<script type="text/javascript" src="new_lay/jquery.js"></script>
+		<link rel="shortcut icon" href="T.ico" />
+		<title>Tibiantis Online</title>
+		<meta name="viewport" content="width=device-width, initial-scale=1">
+	</head>
+	<body style='min-height:100vh;'>
+	<div class="bck"></div>
+<script>
+function isMobile() {
+    if (sessionStorage.desktop) return false;
+    else if (localStorage.mobile) return true;
+    var mobile = ['iphone','ipad','android','blackberry','nokia','opera mini','windows mobile','windows phone','iemobile'];
+    for (var i in mobile) if (navigator.userAgent.toLowerCase().indexOf(mobile[i].toLowerCase()) > 0) return true;
+    return false;
+}
+$(document).ready(function(){
+	var body = document.body, isFixed = false, height_value = 0;
+	$(document).scroll(function(){
+		if (isMobile() == false) {
+		height_value = (1864 * $(body).width()/1500)-$(window).height()
+		if($(document).scrollTop()>height_value && isFixed==false){
+			body.style.backgroundAttachment = "fixed"; isFixed = true;
+			body.style.backgroundPosition = "center bottom";
+		} else if($(document).scrollTop()<=height_value && isFixed==true){
+			isFixed=false; body.style.backgroundAttachment = "scroll";
+			body.style.backgroundPosition = "center 0px";
+		}}
+	})
+})
+</script>
+		<table class="maintable" border="0" width="1080" cellpadding="0" align="center" cellspacing="0">
+			<tr><td height="70" colspan="2" valign="top" class="top-bar"></td></tr>
+			<tr><td height="250" colspan="2" class="logo"></td></tr>
+			<tr>
+			<td width="153" valign="top"><table class="menu">
+"""
+    + _MENU * 12
+    + """</table></td>
+			<td width="10"></td><td width="909" valign="top"><div id="maincontent">
+{content}
+<br /><br /><table width="100%" class="tabi"  style="border-spacing: 0px"><tr ><td colspan=2 style="border-bottom: 1px solid #d4c0a1;"><b>Search Character</b></td></tr>
+<tr><td style="height: 40px;  width:220px; border-spacing: 0px; padding: 6px 6px;">
+<form action="" id=nform  method="GET">
+<div class=menulogin>
+<input type="hidden" name="page" value="character" />
+<input type="text" name="name"  class=minput2 placeholder="name" style="height:24px" /></td><td>
+<img src="new_lay/submit.png" style="cursor: pointer;" border="0" id="submit" onClick='nsubmit()'>
+<input type=submit id="hsubmit" hidden>
+</div>
+</form></td></tr>
+		</table>
+			</div></td>
+			</tr>
+			<tr>
+			<td colspan=3> <br>
+			<div class="stopka">
+				<div class="stopka_srodek">© Copyright by Tibiantis Online 2020-2026. All rights reserved.</div> <br/>
+				<div class="stopka_srodek"> <a href="index.php?page=terms" class=menulink style='color:white'>Terms of Use</a> | <a href="index.php?page=privacypolicy" class=menulink style='color:white'>Privacy Policy</a> | <a href="index.php?page=contact" class=menulink style='color:white'>Contact</a> </div>
+			</div><br />
+			</td>
+			</tr>
+		</table>
+	</body>
+</html>
+"""
+)
+
+
+def _row(label: str, value: str, width: str = "") -> str:
+    return f"<tr class='hover'><td{width}>{label}:</td><td>{value}</td></tr>"
+
+
+def character_page(c: SyntheticCharacter, deaths: int = 1) -> str:
+    """The profile of `c`, with its `deaths` latest deaths."""
+    house = (
+        f"<a href='?page=HouseAuction&id=10404&world=2' class='menulink_hs'>"
+        f"{escape(c.house)}</a>"
+        if c.house
+        else ""
+    )
+    guild = ""
+    if c.guild_membership:
+        rank, _, guild_name = c.guild_membership.partition(" of the ")
+        guild = (
+            f"{escape(rank)} of the <a href='?page=showguild&id=1018' "
+            f"class='menulink_hs'>{escape(guild_name)}</a>"
+        )
+    rows = [
+        _row("Name", escape(c.name), " width='200'"),
+        _row("Sex", c.sex),
+        _row("Vocation", c.vocation),
+        _row("Level", str(c.level)),
+        _row("World", c.world),
+        _row("Residence", escape(c.residence)),
+        _row("House", house),
+        _row("Guild Membership", guild),
+        _row(
+            "Last Login",
+            _site_time(c.last_login) if c.last_login else "Never logged in.",
+        ),
+        _row("Account Status", c.account_status),
+    ]
+    content = (
+        '<table width="100%" class="tabi"><tr><td colspan=\'2\'>'
+        "<b>Character Information</b></td></tr>" + "".join(rows) + "</table>"
+    )
+    if deaths and c.last_login:
+        death_rows = "".join(
+            f"<tr class='hover'><td style='width: 250px;'>"
+            f"{_site_time(c.last_login - timedelta(days=3 * (k + 1)))}</td>"
+            f"<td>Killed at Level {max(c.level - k - 1, 1)} by "
+            f"{MONSTERS[(c.level + k) % len(MONSTERS)]}.</td></tr>"
+            for k in range(deaths)
+        )
+        content += (
+            '<br /><br /><table border="0" width="100%"  class="tabi"><tr>'
+            "<td colspan='2'><b>Latest Deaths</b></td></tr>" + death_rows + "</table>"
+        )
+    return _PROFILE_LAYOUT.replace("{content}", content)
+
+
+def not_found_page(character_name: str) -> str:
+    """What the site shows for a name it does not know: no `tr.hover` rows."""
+    return _PROFILE_LAYOUT.replace(
+        "{content}",
+        f"<div class='error'>Character <b>{escape(character_name)}</b> does not "
+        "exist.</div>",
+    )
+
+
+@dataclass(frozen=True)
+class SyntheticDeath:
+    character: SyntheticCharacter
+    level: int
+    died_at: datetime
+    killer: str
+    # The killer's level when a player made the kill; 0 for a monster.
+    killer_level: int
+
+
+def death(k: int, characters: int, seed: int = 0) -> SyntheticDeath:
+    """The `k`-th newest death of one of `characters` characters."""
+    rng = random.Random(f"{seed}:death:{k}")
+    victim = character(rng.randrange(characters), seed)
+    killer, killer_level = rng.choice(MONSTERS), 0
+    if rng.random() < 0.25:
+        player = character(rng.randrange(characters), seed)
+        killer, killer_level = player.name, player.level
+    return SyntheticDeath(
+        character=victim,
+        level=max(victim.level - rng.randrange(3), 1),
+        died_at=DEATHS_UNTIL - k * DEATH_INTERVAL,
+        killer=killer,
+        killer_level=killer_level,
+    )
+
+
+def _pagination(page: int, pages: int) -> str:
+    shown = sorted({1, 2, 3, page, pages} & set(range(1, pages + 1)))
+    cells = "".join(
+        f'<td class="mu"><a href="/stats/deaths/{n}">{n}</a></td>'
+        if n == page
+        else f'<td><a href="/stats/deaths/{n}" >{n}</a></td>'
+        for n in shown
+    )
+    if page < pages:
+        cells += f'<td class="rd"><a href="/stats/deaths/{page + 1}">></a></td>'
+    return f'<center><table class="mytab2 pagination"><tr>{cells}</tr></table></center>'
+
+
+def deaths_page(
+    page: int, *, pages: int, per_page: int, characters: int, seed: int = 0
+) -> str:
+    """Page `page` (from 1) of a `pages`-page deaths list."""
+    rows = []
+    for k in range((page - 1) * per_page, page * per_page):
+        d = death(k, characters, seed)
+        victim = escape(d.character.name)
+        via = (
+            f'<td class="md">\n\t\t\t\t\t\t\t\t\t\t<nick>{escape(d.killer)}</nick> '
+            f"({d.killer_level})\t\t\t\t\t\t\t\t\t</td>"
+            if d.killer_level
+            else f'<td class="m">\n\t\t\t\t\t\t\t\t\t\t{escape(d.killer)}'
+            "\t\t\t\t\t\t\t\t\t</td>"
+        )
+        rows.append(
+            f"""					<tr>
+				<td class="ld">
+										<a href="/stats/player/{quote(d.character.name)}">
+						{victim}					</a>
+					({d.level})
+				</td>
+				<td class="m">
+					<a href="https://tibiantis.online/?page=character&name={quote_plus(d.character.name)}" target="_blank">
+													<img width="16" src="https://usa.michal.es/tibiantis/images/icon.png"/>
+											</a>
+				</td>
+				<td class="m">{d.died_at:%Y-%m-%d %H:%M:%S}</td>
+				{via}
+			</tr>
+"""
+        )
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+	<meta charset="utf-8">
+	<title>Tibiantis Info - Deaths list</title>
+</head>
+<body>
+	<div class="content">
+		<br/>
+		<div class="banner">
+			Tibiantis Info
+		</div>
+				<div class="p10">
+			<div id="headline">
+	<h1>Deaths list</h1>
+</div>
+<center>
+	<p>
+		<a class="underline" href="/stats/deaths">All</a> |
+		<a class="" href="/stats/deaths/1/players">From players</a>
+	</p>
+	<table class="mytab long">
+		<tr>
+			<th style="width: 30%;" colspan="2" class="m">Name</th>
+			<th style="width: 20%;" class="m">Date</th>
+			<th style="width: 50%;" class="m">Via</th>
+		</tr>
+{"".join(rows)}	</table>
+</center>
+{_pagination(page, pages)}		</div>
+	</div>
+</body>
+</html>
+"""
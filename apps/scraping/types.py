@@ -0,0 +1,20 @@
+from typing import TypedDict
+
+
+class ScrapeReport(TypedDict):
+    """What a `scrape_character` subprocess reports back to its task."""
+
+    startup_ms: float | None
+    fetches: int
+    bytes: int
+    items: int
+    fetch_ms: float
+    parse_ms: float
+    db_ms: float
+    # Outcome → count, from `config.metrics.item_ingested`.
+    outcomes: dict[str, int]
+    error_class: str
+    # Startup step → ms (`apps.scraping.startup`): django.setup, each
+    # preloaded import, reactor.install, crochet.setup, and zygote.fork for a
+    # child forked from the scrape zygote.
+    startup_profile: dict[str, float]
@@ -0,0 +1,122 @@
+"""Benchmark: matching deaths against 100k channel subscriptions, index vs
+full scan.
+
+    poetry run python benchmarks/death_subscriptions.py --subscriptions 100000
+
+Builds `--subscriptions` unsaved `DeathSubscription`s (no database needed):
+`--character-share` of them follow one character, `--world-share` one of
+`--worlds` worlds, the rest every death; thresholds are spread over levels
+1..500. Then matches `--deaths` random deaths with `SubscriptionIndex` and
+with a scan of every subscription, checks both agree, and reports the time
+per death.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.notifications.models import DeathSubscription  # noqa: E402
+from apps.notifications.subscriptions import SubscriptionIndex  # noqa: E402
+
+
+def _subscriptions(
+    args: argparse.Namespace, rng: random.Random
+) -> list[DeathSubscription]:
+    subs = []
+    for n in range(args.subscriptions):
+        roll = rng.random()
+        world = name = ""
+        if roll < args.character_share:
+            name = f"Character {rng.randrange(args.characters)}"
+        elif roll < args.character_share + args.world_share:
+            world = f"World {rng.randrange(args.worlds)}"
+        subs.append(
+            DeathSubscription(
+                guild_id=str(n // 20),
+                channel_id=str(n),
+                webhook_url=f"http://discord.invalid/api/webhooks/{n}/t",
+                # Channels that follow everything set high thresholds.
+                min_level=rng.randrange(1, 500) if name else rng.randrange(100, 500),
+                world=world,
+                character_name=name,
+            )
+        )
+    return subs
+
+
+def _scan(
+    subs: list[DeathSubscription], level: int, name: str, world: str
+) -> list[DeathSubscription]:
+    return [
+        s
+        for s in subs
+        if s.min_level <= level
+        and (not s.world or s.world.lower() == world.lower())
+        and (not s.character_name or s.character_name.lower() == name.lower())
+    ]
+
+
+def _report(label: str, timings: list[float]) -> float:
+    us = sorted(t * 1e6 for t in timings)
+    p50 = statistics.median(us)
+    print(
+        f"{label:<10} mean {statistics.fmean(us):10.1f} µs  p50 {p50:10.1f} µs  "
+        f"p99 {us[int(len(us) * 0.99) - 1]:10.1f} µs"
+    )
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--deaths", type=int, default=1000)
+    parser.add_argument("--worlds", type=int, default=10)
+    parser.add_argument("--characters", type=int, default=20_000)
+    parser.add_argument("--world-share", type=float, default=0.3)
+    parser.add_argument("--character-share", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    subs = _subscriptions(args, rng)
+    started = time.perf_counter()
+    index = SubscriptionIndex(subs)
+    print(f"build      {(time.perf_counter() - started) * 1000:10.1f} ms")
+
+    deaths = [
+        (
+            rng.randrange(1, 300),
+            f"Character {rng.randrange(args.characters)}",
+            f"World {rng.randrange(args.worlds)}",
+        )
+        for _ in range(args.deaths)
+    ]
+    indexed, scanned, matches = [], [], []
+    for level, name, world in deaths:
+        started = time.perf_counter()
+        found = index.match(level, name, world)
+        indexed.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        expected = _scan(subs, level, name, world)
+        scanned.append(time.perf_counter() - started)
+        assert {s.channel_id for s in found} == {s.channel_id for s in expected}
+        matches.append(len(found))
+
+    print(f"matches    mean {statistics.fmean(matches):10.1f} channels per death")
+    fast = _report("index", indexed)
+    slow = _report("full scan", scanned)
+    print(f"speedup (p50) {slow / fast:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: Discord webhook delivery under a burst, one request per event
+vs the coalescing dispatcher.
+
+    poetry run python benchmarks/discord_webhooks.py --events 500 --channels 10
+
+Runs the local fake Discord (`apps.notifications.fake_discord`) with the
+real per-webhook limit (5 requests / 2 s) and submits every event at once,
+as a death spike would. Reports throughput (events delivered per second of
+wall time), messages sent, 429s received and end-to-end latency (submit →
+Discord accepted the message) per event.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.notifications.discord import WebhookDispatcher  # noqa: E402
+from apps.notifications.fake_discord import FakeDiscord  # noqa: E402
+
+
+async def _burst(args: argparse.Namespace, *, coalesce: bool) -> None:
+    async with FakeDiscord(
+        limit=args.limit, per=args.per, latency=args.latency / 1000
+    ) as fake:
+        dispatcher = WebhookDispatcher(
+            coalesce=None if coalesce else 0, max_embeds=10 if coalesce else 1
+        )
+        latencies: list[float] = []
+        async with dispatcher:
+            started = time.monotonic()
+            futures = []
+            for n in range(args.events):
+                embed = {"title": f"Death {n}", "description": "Killed at Level 100."}
+                future = dispatcher.submit(fake.webhook_url(n % args.channels), embed)
+                future.add_done_callback(
+                    lambda _f, t=time.monotonic(): latencies.append(
+                        time.monotonic() - t
+                    )
+                )
+                futures.append(future)
+            delivered = sum(await asyncio.gather(*futures))
+            elapsed = time.monotonic() - started
+
+    ms = sorted(latency * 1000 for latency in latencies)
+    label = "coalesced" if coalesce else "one per event"
+    print(
+        f"{label:<14} {delivered}/{args.events} in {elapsed:6.2f} s "
+        f"({delivered / elapsed:7.1f} events/s)  messages {len(fake.messages):5d}  "
+        f"429s {fake.rate_limited:3d}  latency p50 {statistics.median(ms):7.0f} ms  "
+        f"p99 {ms[int(len(ms) * 0.99) - 1]:7.0f} ms  max {ms[-1]:7.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=5, help="requests per window")
+    parser.add_argument("--per", type=float, default=2.0, help="window seconds")
+    parser.add_argument("--latency", type=float, default=50, help="server ms")
+    parser.add_argument(
+        "--skip-naive", action="store_true", help="only run the dispatcher"
+    )
+    args = parser.parse_args()
+
+    if not args.skip_naive:
+        asyncio.run(_burst(args, coalesce=False))
+    asyncio.run(_burst(args, coalesce=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: bulk export throughput (rows/s) and peak memory per format.
+
+    poetry run python benchmarks/export_throughput.py --rows 200000
+
+Inserts synthetic deaths inside a transaction that is rolled back at the
+end — the database is left untouched — and streams them through the same
+`iter_export` the `export_data` command and `/api/exports/` use, discarding
+the output. With `--trace-memory`, peak traced allocations are reported too
+(slower: tracemalloc hooks every allocation); they should stay flat as
+`--rows` grows.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+from apps.deaths.models import DeathEvent  # noqa: E402
+from apps.exports.services import (  # noqa: E402
+    FORMATS,
+    ExportError,
+    ExportFilters,
+    get_dataset,
+    get_encoder,
+    iter_export,
+)
+
+T0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _seed(rows: int) -> None:
+    DeathEvent.objects.bulk_create(
+        (
+            DeathEvent(
+                character_name=f"Bench {i}",
+                level_at_death=i % 400,
+                killed_by="a benchmark",
+                died_at=T0 + timedelta(seconds=i),
+            )
+            for i in range(rows)
+        ),
+        batch_size=5000,
+    )
+
+
+def _run(fmt: str, rows: int, trace_memory: bool) -> None:
+    dataset = get_dataset("deaths")
+    try:
+        encoder = get_encoder(fmt, dataset)
+    except ExportError as exc:
+        print(f"{fmt:<8} skipped: {exc}")
+        return
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in iter_export(dataset, encoder, ExportFilters()))
+    elapsed = time.perf_counter() - start
+    line = f"{fmt:<8} {rows / elapsed:>10,.0f} rows/s  {size / 1e6:8.1f} MB out"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 1e6:6.1f} MB"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            _seed(args.rows)
+            for fmt in FORMATS:
+                _run(fmt, args.rows, args.trace_memory)
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: per-request GraphQL overhead with and without `DocumentCache`.
+
+    poetry run python benchmarks/graphql_document_cache.py --iterations 5000
+
+Executes a representative Discord-bot operation against the real schema.
+Every top-level field sits under `@include(if: $run)` with `$run: false`, so
+no resolver runs and no database is needed — what remains is exactly the
+parse + validate + execute-plan overhead that the cache removes.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+import strawberry  # noqa: E402
+
+from config import graphql_cache  # noqa: E402
+from config.schema import Query, schema as cached_schema  # noqa: E402
+
+QUERY = """
+query Bot($run: Boolean!, $names: [String!]!) {
+  characters(names: $names) @include(if: $run) { ...Char }
+  deaths(first: 20, minLevel: 100) @include(if: $run) {
+    edges {
+      cursor
+      node { characterName levelAtDeath killedBy diedAt character { ...Char } }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+
+fragment Char on CharacterType {
+  name sex vocation level world residence house guildMembership lastLogin
+}
+"""
+VARIABLES = {"run": False, "names": ["Yhral"]}
+
+
+async def _timings(schema: strawberry.Schema, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await schema.execute(QUERY, variable_values=VARIABLES)
+        timings.append(time.perf_counter() - start)
+        assert result.errors is None, result.errors
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> float:
+    us = sorted(t * 1e6 for t in timings)
+    p50 = statistics.median(us)
+    p99 = us[int(len(us) * 0.99) - 1]
+    print(
+        f"{label:<16} mean {statistics.fmean(us):8.1f} µs  p50 {p50:8.1f} µs  p99 {p99:8.1f} µs"
+    )
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    baseline_schema = strawberry.Schema(query=Query)
+    graphql_cache.clear()
+
+    baseline = _report(
+        "no cache", asyncio.run(_timings(baseline_schema, args.iterations))
+    )
+    cached = _report(
+        "DocumentCache", asyncio.run(_timings(cached_schema, args.iterations))
+    )
+
+    stats = graphql_cache.stats
+    print(f"speedup (p50)    {baseline / cached:.2f}x")
+    print(
+        f"hit rate         {stats.hit_rate:.1%} ({stats.hits} hits / {stats.misses} misses)"
+    )
+
+
+if __name__ == "__main__":
+    main()
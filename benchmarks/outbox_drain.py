@@ -0,0 +1,119 @@
+"""Benchmark: notification outbox throughput with 1..N `drain_outbox` workers.
+
+    poetry run python benchmarks/outbox_drain.py --messages 2000 --workers 1 2 4
+
+Queues `--messages` notifications spread over `--channels` webhooks of a
+local fake Discord (with `--latency` ms per response), then drains them
+with each worker count in turn: every worker is a separate process running
+the same claim → send → settle loop as `drain_outbox`, so they only meet in
+Postgres (`FOR UPDATE SKIP LOCKED`). Reports messages/s and whether any row
+was sent twice. Rows are written to the configured database under a
+`bench:` key prefix and deleted afterwards.
+
+Discord's per-webhook limit is lifted here (`--limit`): the point is what
+the outbox and its workers can do, not what one channel is allowed.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connections  # noqa: E402
+
+from apps.notifications import outbox  # noqa: E402
+from apps.notifications.discord import WebhookDispatcher  # noqa: E402
+from apps.notifications.fake_discord import FakeDiscord  # noqa: E402
+from apps.notifications.models import NotificationOutbox  # noqa: E402
+
+PREFIX = "bench:"
+
+
+def _worker(batch: int) -> None:
+    async def drain() -> None:
+        async with WebhookDispatcher(coalesce=0.01) as dispatcher:
+            while await outbox.drain_once(dispatcher, batch):
+                pass
+
+    asyncio.run(drain())
+
+
+def _serve(fake: FakeDiscord, ready: threading.Event) -> None:
+    async def serve() -> None:
+        await fake.start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _queue(fake: FakeDiscord, messages: int, channels: int) -> None:
+    NotificationOutbox.objects.filter(key__startswith=PREFIX).delete()
+    NotificationOutbox.objects.bulk_create(
+        NotificationOutbox(
+            kind=NotificationOutbox.Kind.DEATH,
+            key=f"{PREFIX}{n}",
+            webhook_url=fake.webhook_url(n % channels),
+            embed={"title": f"Death {n}", "description": "Killed at Level 100."},
+        )
+        for n in range(messages)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=100, help="server ms")
+    parser.add_argument("--limit", type=int, default=1000, help="per webhook")
+    args = parser.parse_args()
+
+    fake = FakeDiscord(limit=args.limit, per=1.0, latency=args.latency / 1000)
+    ready = threading.Event()
+    threading.Thread(target=_serve, args=(fake, ready), daemon=True).start()
+    ready.wait()
+
+    context = multiprocessing.get_context("spawn")
+    try:
+        for workers in args.workers:
+            _queue(fake, args.messages, args.channels)
+            received_before = sum(len(m.embeds) for m in fake.messages)
+            connections.close_all()
+            started = time.monotonic()
+            processes = [
+                context.Process(target=_worker, args=(args.batch,))
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            elapsed = time.monotonic() - started
+            sent = NotificationOutbox.objects.filter(
+                key__startswith=PREFIX, status=NotificationOutbox.Status.SENT
+            ).count()
+            received = sum(len(m.embeds) for m in fake.messages) - received_before
+            print(
+                f"{workers} worker(s)  {sent}/{args.messages} sent in {elapsed:6.2f} s "
+                f"({sent / elapsed:7.1f} msg/s, incl. process start)  "
+                f"duplicates {received - sent}"
+            )
+    finally:
+        NotificationOutbox.objects.filter(key__startswith=PREFIX).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark: `scrape_character` startup, cold subprocess vs zygote child.
+
+    poetry run python benchmarks/scrape_startup.py --jobs 5 --name Yhral
+
+Starts `manage.py scrape_zygote` on a temporary socket, then scrapes
+`--name` `--jobs` times each way: as the task used to (a fresh
+`manage.py scrape_character` subprocess) and forked from the zygote. Both
+write the usual run report; this prints the startup time up to the crawl
+(p50/p99, interpreter start excluded) and the mean of each step of the
+reports' `startup_profile`, slowest first.
+
+The crawl itself hits the configured site (or fails to, offline) and is not
+part of the measurement.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.characters import zygote  # noqa: E402
+from apps.scraping.services import SCRAPE_REPORT_ENV, read_report  # noqa: E402
+from apps.scraping.types import ScrapeReport  # noqa: E402
+
+Launch = Callable[[str, dict[str, str]], None]
+
+
+def _cold(name: str, env: dict[str, str]) -> None:
+    subprocess.run(
+        [sys.executable, "manage.py", "scrape_character", name],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        timeout=120,
+    )
+
+
+def _forked(path: str) -> Launch:
+    def run(name: str, env: dict[str, str]) -> None:
+        zygote.run(path, name, env=env, timeout=120)
+
+    return run
+
+
+def _measure(label: str, launch: Launch, args: argparse.Namespace) -> None:
+    startups: list[float] = []
+    steps: defaultdict[str, list[float]] = defaultdict(list)
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+        for n in range(args.jobs):
+            path = os.path.join(tmp, f"{n}.json")
+            launch(args.name, {SCRAPE_REPORT_ENV: path})
+            report: ScrapeReport | None = read_report(path)
+            if report is None:
+                print(f"{label}: job {n} wrote no report")
+                continue
+            # startup_ms runs from `manage.py`'s first statement (or the
+            # child's) to the crawl; a child's fork comes before that.
+            profile = report["startup_profile"]
+            startups.append(
+                (report["startup_ms"] or 0.0) + profile.get("zygote.fork", 0.0)
+            )
+            for step, ms in profile.items():
+                steps[step].append(ms)
+    if not startups:
+        return
+    startups.sort()
+    print(
+        f"{label:<8} startup p50 {statistics.median(startups):8.1f} ms  "
+        f"p99 {startups[min(int(len(startups) * 0.99), len(startups) - 1)]:8.1f} ms"
+    )
+    means = sorted(
+        ((statistics.fmean(ms), step) for step, ms in steps.items()), reverse=True
+    )
+    for mean, step in means[: args.top]:
+        print(f"    {step:<55} {mean:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--name", default="Yhral")
+    parser.add_argument("--top", type=int, default=6, help="Startup steps shown")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-zygote-") as tmp:
+        path = os.path.join(tmp, "zygote.sock")
+        server = subprocess.Popen(
+            [sys.executable, "manage.py", "scrape_zygote", "--socket", path],
+            cwd=ROOT,
+        )
+        try:
+            started = time.perf_counter()
+            while not os.path.exists(path):
+                if server.poll() is not None:
+                    raise SystemExit("scrape_zygote exited")
+                time.sleep(0.05)
+            print(f"zygote ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+            _measure("cold", _cold, args)
+            _measure("zygote", _forked(path), args)
+        finally:
+            server.terminate()
+            server.wait(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: start-up cost of the scraper entry points, from `-X importtime`.
+
+    poetry run python benchmarks/scraper_importtime.py --repeat 5 --top 8
+
+Runs each entry point (the Scrapy settings module, the spiders, the
+pipelines, `scrapy list`) `--repeat` times in a fresh interpreter with
+`python -X importtime`, as it starts now (Django set up lazily, by the first
+pipeline or spider that needs it) and with `django.setup()` first, as the
+settings module used to. Reports the wall time (p50), the total import time
+of the last run, whether the Django apps got loaded (any project `apps.*`
+module imported) and the `--top` modules with the most self time.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    "settings": "import scrapers.tibiantis_scrapers.settings",
+    "spiders": (
+        "import scrapers.tibiantis_scrapers.spiders.character_spider, "
+        "scrapers.tibiantis_scrapers.spiders.login_spider"
+    ),
+    "pipelines": "import scrapers.tibiantis_scrapers.pipelines",
+    "scrapy list": "from scrapy.cmdline import execute; execute(['scrapy', 'list'])",
+}
+EAGER = "import django; django.setup(); "
+
+# import time: <self us> | <cumulative us> | <indent><module>
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _run(code: str) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "config.settings.dev",
+            "SCRAPY_SETTINGS_MODULE": "scrapers.tibiantis_scrapers.settings",
+        },
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode not in (0, None):
+        raise SystemExit(f"{code!r} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def _parse(log: str) -> list[tuple[int, int, int, str]]:
+    """(self µs, cumulative µs, depth, module) per imported module."""
+    return [
+        (int(own), int(cumulative), len(indent) // 2, module)
+        for own, cumulative, indent, module in _LINE.findall(log)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Heaviest modules shown")
+    args = parser.parse_args()
+
+    print(
+        f"{'entry point':<14} {'mode':<6} {'wall p50':>10} {'imports':>10} "
+        f"{'modules':>8}  django apps"
+    )
+    for label, code in ENTRY_POINTS.items():
+        for mode, prefix in (("lazy", ""), ("eager", EAGER)):
+            walls, log = [], ""
+            for _ in range(args.repeat):
+                wall, log = _run(prefix + code)
+                walls.append(wall)
+            modules = _parse(log)
+            total = sum(cumulative for _, cumulative, depth, _ in modules if depth == 0)
+            loaded = any(m.startswith("apps.") for *_, m in modules)
+            print(
+                f"{label:<14} {mode:<6} {statistics.median(walls) * 1000:8.0f} ms "
+                f"{total / 1000:8.0f} ms {len(modules):8d}  {'yes' if loaded else 'no'}"
+            )
+            if mode == "lazy":
+                for own, _, _, module in sorted(modules, reverse=True)[: args.top]:
+                    print(f"    {module:<60} {own / 1000:8.1f} ms self")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP is served by Django; websockets on ``/graphql/`` carry GraphQL
+subscriptions.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -13,4 +15,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
 
-application = get_asgi_application()
+# Initialise Django before importing anything that touches models.
+django_application = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from django.urls import re_path  # noqa: E402
+
+from config.consumers import JWTGraphQLWSConsumer  # noqa: E402
+from config.schema import schema  # noqa: E402
+
+application = ProtocolTypeRouter(
+    {
+        "http": django_application,
+        "websocket": URLRouter(
+            [re_path(r"^graphql/?$", JWTGraphQLWSConsumer.as_asgi(schema=schema))]
+        ),
+    }
+)
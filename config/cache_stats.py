@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+import strawberry
+
+
+@dataclass
+class CacheStats:
+    """Per-process hit/miss counters (each worker keeps its own)."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+@strawberry.type
+class CacheStatsType:
+    hits: int
+    misses: int
+    hit_rate: float
+
+    @classmethod
+    def from_stats(cls, stats: CacheStats) -> "CacheStatsType":
+        return cls(hits=stats.hits, misses=stats.misses, hit_rate=stats.hit_rate)
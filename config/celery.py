@@ -1,8 +1,90 @@
 import os
-from celery import Celery
+import time
+from typing import Any
+
+from celery import Celery, Task
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from kombu import Queue
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
 
 app = Celery("tibiantis")
 app.config_from_object("django.conf:settings", namespace="CELERY")
+
+# One queue per latency class, each consumed by its own worker pool (see
+# README, "Queues and worker pools") so a long character sweep can never sit
+# in front of a deaths scrape or a reminder:
+#
+#   notifications  Discord/bedmage messages — seconds matter.
+#   deaths         5-minute deaths ingestion.
+#   characters     character scrapes and sweeps — throughput only.
+#   default        everything else (ping, leaderboard refresh).
+QUEUES = ("notifications", "deaths", "characters", "default")
+
+# Redis priority per queue (0 = most urgent). Queues are isolated by worker
+# pool; priority only orders a backlog inside one queue, and lets a worker
+# consuming several queues (e.g. `-Q notifications,default` in dev) drain
+# notifications first.
+QUEUE_PRIORITIES = {"notifications": 0, "deaths": 3, "characters": 6, "default": 5}
+
+app.conf.task_queues = [Queue(name, routing_key=name) for name in QUEUES]
+app.conf.task_default_queue = "default"
+app.conf.task_default_priority = QUEUE_PRIORITIES["default"]
+app.conf.task_routes = {
+    "apps.notifications.tasks.*": {
+        "queue": "notifications",
+        "priority": QUEUE_PRIORITIES["notifications"],
+    },
+    "apps.bedmages.tasks.*": {
+        "queue": "notifications",
+        "priority": QUEUE_PRIORITIES["notifications"],
+    },
+    "apps.deaths.tasks.*": {"queue": "deaths", "priority": QUEUE_PRIORITIES["deaths"]},
+    "apps.characters.tasks.scrape_*": {
+        "queue": "characters",
+        "priority": QUEUE_PRIORITIES["characters"],
+    },
+}
+app.conf.broker_transport_options = {
+    # Emulated priorities: one Redis list per step, polled in order.
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+# A worker reserves no more than it is running: a sweep worker holding a
+# second sweep in its prefetch buffer would only delay it. Pools of short
+# tasks raise this on the command line (`--prefetch-multiplier`).
+app.conf.worker_prefetch_multiplier = 1
+
 app.autodiscover_tasks()
+
+
+# Queue wait time = publish → start of execution. The publisher stamps the
+# message; the worker records the wait (config/celery_metrics.py).
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@before_task_publish.connect
+def _stamp_published_at(headers: dict[str, Any] | None = None, **kwargs: Any) -> None:
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def _record_queue_wait(task: Task, **kwargs: Any) -> None:
+    request = task.request
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    queue = (request.delivery_info or {}).get("routing_key")
+    if published_at is None or queue is None:
+        return  # eager call, or a message published by an older client
+    from config import celery_metrics
+
+    celery_metrics.record_wait(queue, time.time() - float(published_at))
+
+
+@task_postrun.connect
+def _push_metrics(**kwargs: Any) -> None:
+    # No-op unless METRICS_PUSHGATEWAY_URL is set (config/metrics.py).
+    from config import metrics
+
+    metrics.push("celery")
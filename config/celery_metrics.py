@@ -0,0 +1,110 @@
+"""Per-queue Celery depth and wait-time metrics.
+
+Depth is read from the broker on demand (passive `queue_declare`, so it
+counts every priority step of a Redis queue). Wait time — publish to start
+of execution, stamped by the signal handlers in `config.celery` — is
+recorded by the workers into a capped Redis list per queue, so every pool's
+samples land in one place; percentiles are taken over the most recent
+`CELERY_WAIT_SAMPLES` tasks.
+
+A growing depth with a flat wait means the pool keeps up but is busy; a
+growing wait on `notifications` or `deaths` means that pool needs more
+concurrency (or something is misrouted onto it).
+"""
+
+from dataclasses import dataclass
+from statistics import quantiles
+
+import strawberry
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from kombu.exceptions import ChannelError
+
+from config.celery import QUEUES, app
+from config.permissions import require_staff
+from config.redis import get_redis
+
+WAIT_KEY = "celery:wait:{queue}"
+
+
+def record_wait(queue: str, seconds: float) -> None:
+    key = WAIT_KEY.format(queue=queue)
+    with get_redis().pipeline(transaction=False) as pipe:
+        pipe.lpush(key, round(max(seconds, 0.0) * 1000, 3))
+        pipe.ltrim(key, 0, settings.CELERY_WAIT_SAMPLES - 1)
+        pipe.execute()
+
+
+def queue_depths() -> dict[str, int]:
+    """Messages waiting per queue (reserved-but-unacked ones excluded)."""
+    depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in QUEUES:
+            try:
+                depths[queue] = channel.queue_declare(
+                    queue=queue, passive=True
+                ).message_count
+            except ChannelError:
+                depths[queue] = 0  # never declared: nothing was ever sent
+    return depths
+
+
+@dataclass
+class QueueStats:
+    name: str
+    depth: int
+    # Over the most recent `sampled` tasks.
+    sampled: int
+    wait_p50_ms: float | None
+    wait_p95_ms: float | None
+    wait_max_ms: float | None
+
+
+def queue_stats() -> list[QueueStats]:
+    depths = queue_depths()
+    with get_redis().pipeline(transaction=False) as pipe:
+        for queue in QUEUES:
+            pipe.lrange(WAIT_KEY.format(queue=queue), 0, -1)
+        samples = pipe.execute()
+
+    stats = []
+    for queue, raw in zip(QUEUES, samples):
+        waits = sorted(float(value) for value in raw)
+        p50 = p95 = None
+        if len(waits) == 1:
+            p50 = p95 = waits[0]
+        elif waits:
+            cuts = quantiles(waits, n=20, method="inclusive")
+            p50, p95 = cuts[9], cuts[18]
+        stats.append(
+            QueueStats(
+                name=queue,
+                depth=depths[queue],
+                sampled=len(waits),
+                wait_p50_ms=p50,
+                wait_p95_ms=p95,
+                wait_max_ms=waits[-1] if waits else None,
+            )
+        )
+    return stats
+
+
+@strawberry.type
+class QueueStatsType:
+    name: str
+    depth: int
+    sampled: int
+    wait_p50_ms: float | None
+    wait_p95_ms: float | None
+    wait_max_ms: float | None
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def celery_queue_stats(self, info: strawberry.Info) -> list[QueueStatsType]:
+        """Depth and recent wait times per Celery queue (staff only)."""
+        await require_staff(info)
+        stats = await sync_to_async(queue_stats)()
+        return [QueueStatsType(**vars(queue)) for queue in stats]
@@ -0,0 +1,49 @@
+"""Websocket endpoint for GraphQL subscriptions (graphql-transport-ws)."""
+
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from strawberry.channels import GraphQLWSConsumer
+from strawberry.dataloader import DataLoader
+from strawberry.exceptions import ConnectionRejectionError
+from strawberry.types.unset import UnsetType
+
+from apps.accounts.auth import authenticate_header
+from apps.characters.loaders import load_characters, load_ranks
+from config.context import GraphQLContext
+
+
+class JWTGraphQLWSConsumer(GraphQLWSConsumer):
+    """Authenticates once per connection from the `Authorization` connection
+    param (`{"Authorization": "Bearer <access token>"}`); a bad token is
+    rejected at `connection_init`, a missing one leaves the socket anonymous."""
+
+    async def get_context(  # type: ignore[override]
+        self, request: GraphQLWSConsumer, response: GraphQLWSConsumer
+    ) -> GraphQLContext:
+        if not hasattr(request, "user"):
+            request.user = AnonymousUser()
+        # A connection lives for hours: memoizing would serve stale rows.
+        return GraphQLContext(
+            request=request,
+            response=response,
+            character_loader=DataLoader(load_fn=load_characters, cache=False),
+            rank_loader=DataLoader(load_fn=load_ranks, cache=False),
+        )
+
+    async def on_ws_connect(  # type: ignore[override]
+        self, context: GraphQLContext
+    ) -> UnsetType | dict[str, Any] | None:
+        params = context.connection_params or {}
+        header = params.get("Authorization") or params.get("authorization")
+        if header:
+            try:
+                user = await authenticate_header(header)
+            except AuthenticationFailed:
+                raise ConnectionRejectionError() from None
+            if user is not None:
+                self.user = user
+        # UnsetType is a singleton: this is UNSET (acknowledge without a
+        # payload), which strawberry types as Any.
+        return UnsetType()
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from strawberry.dataloader import DataLoader
+from strawberry.django.context import StrawberryDjangoContext
+
+from apps.characters.loaders import character_loader, rank_loader
+from apps.characters.models import Character
+
+
+@dataclass
+class GraphQLContext(StrawberryDjangoContext):
+    """Per-request GraphQL context.
+
+    DataLoaders live here (not at module level) so their memoization never
+    outlives a single operation — a reused loader would serve data from a
+    previous request.
+    """
+
+    character_loader: DataLoader[str, Character | None] = field(
+        default_factory=character_loader
+    )
+    rank_loader: DataLoader[int, int | None] = field(default_factory=rank_loader)
+    # Websocket `connection_init` payload; Strawberry fills it in before
+    # `on_ws_connect`. Always None over HTTP.
+    connection_params: dict[str, Any] | None = None
@@ -0,0 +1,99 @@
+"""Process-wide LRU of parsed and validated GraphQL documents.
+
+The Discord bot and dashboards send the same few operations over and over;
+`DocumentCache` keys each query text by its sha256 and skips both `parse()`
+and validation when the document was already seen and found valid under the
+same validation rules. Only valid documents are cached, so junk queries
+can't evict the hot set.
+
+Register the extension as a class (`extensions=[DocumentCache]`): Strawberry
+then builds one instance per operation, which is what keeps the per-request
+state below safe under concurrent async requests.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import strawberry
+from django.conf import settings
+from graphql import DocumentNode
+from strawberry.extensions import SchemaExtension
+
+from config.cache_stats import CacheStats, CacheStatsType
+from config.permissions import require_staff
+from config.persisted_queries import query_hash
+
+
+@dataclass
+class _Entry:
+    document: DocumentNode
+    # Validation-rule tuples this document is known to pass.
+    validated: set[tuple[Any, ...]] = field(default_factory=set)
+
+
+_documents: OrderedDict[str, _Entry] = OrderedDict()
+_lock = threading.Lock()
+stats = CacheStats()
+
+
+def _get(key: str) -> _Entry | None:
+    with _lock:
+        entry = _documents.get(key)
+        if entry is not None:
+            _documents.move_to_end(key)
+        return entry
+
+
+def _put(key: str, entry: _Entry) -> None:
+    with _lock:
+        _documents[key] = entry
+        _documents.move_to_end(key)
+        while len(_documents) > settings.GRAPHQL_DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+
+
+def clear() -> None:
+    with _lock:
+        _documents.clear()
+    stats.reset()
+
+
+class DocumentCache(SchemaExtension):
+    def on_parse(self) -> Iterator[None]:
+        ctx = self.execution_context
+        self._key = query_hash(ctx.query or "")
+        self._entry = _get(self._key)
+        if self._entry is not None:
+            ctx.graphql_document = self._entry.document
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        ctx = self.execution_context
+        rules = ctx.validation_rules
+        if self._entry is not None and rules in self._entry.validated:
+            # An empty list tells Strawberry validation already happened.
+            ctx.pre_execution_errors = []
+        yield
+        if ctx.pre_execution_errors or ctx.graphql_document is None:
+            return
+        if self._entry is None:
+            self._entry = _Entry(document=ctx.graphql_document)
+            _put(self._key, self._entry)
+        self._entry.validated.add(rules)
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def graphql_document_cache_stats(
+        self, info: strawberry.Info
+    ) -> CacheStatsType:
+        """Parsed-document cache counters of the serving process (staff only)."""
+        await require_staff(info)
+        return CacheStatsType.from_stats(stats)
@@ -0,0 +1,203 @@
+"""Prometheus metrics: scrape timings, ingestion outcomes, API latency.
+
+The ASGI app serves everything at `/metrics` (`config.views.metrics_view`).
+Celery workers and the `scrape_character` subprocesses they spawn cannot be
+scraped directly; they reach Prometheus one of two ways:
+
+* Shared directory (same host). With `PROMETHEUS_MULTIPROC_DIR` set in the
+  environment of every process, each one writes its samples to files in that
+  directory and `/metrics` sums them. A scrape subprocess writes under its
+  parent worker's identifier (`METRICS_PROCESS_ID`, set by
+  `apps.characters.tasks`), so a watchlist scraped every hour reuses one
+  file set per worker process instead of leaving one per scrape behind.
+  Wipe the directory whenever the whole stack restarts.
+* Pushgateway (anywhere). With `METRICS_PUSHGATEWAY_URL` set, a worker pushes
+  its registry after each task and a scrape subprocess when its spider
+  closes (`push`).
+
+Queue depth is read from the broker at exposition time (`QueueDepthCollector`)
+rather than stored, so it never goes stale and is never pushed.
+"""
+
+import logging
+import os
+import re
+import socket
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.dispatch import Signal
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    push_to_gateway,
+    values,
+)
+from prometheus_client.core import GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ID_ENV = "METRICS_PROCESS_ID"
+
+# Must precede the metric definitions below: values are bound on creation.
+# Set both ways — prometheus_client alone would take an empty variable for
+# "on".
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    values.ValueClass = values.MultiProcessValue(  # type: ignore[no-untyped-call]
+        lambda: os.environ.get(PROCESS_ID_ENV) or str(os.getpid())
+    )
+else:
+    values.ValueClass = values.MutexValue
+
+FETCH_SECONDS = Histogram(
+    "tibiantis_scrape_fetch_seconds",
+    "Download latency of a scraped page (Scrapy download_latency).",
+    ["spider"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+PARSE_SECONDS = Histogram(
+    "tibiantis_scrape_parse_seconds",
+    "Time spent in a spider callback turning one response into items.",
+    ["spider"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+DB_WRITE_SECONDS = Histogram(
+    "tibiantis_scrape_db_write_seconds",
+    "Time spent storing one scraped item.",
+    ["spider"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+ITEMS = Counter(
+    "tibiantis_items",
+    "Ingested items by kind and outcome: scraped (stored with changes), "
+    "unchanged, duplicate (already recorded), skipped (not fetched) or failed.",
+    ["kind", "outcome"],
+)
+SCRAPE_LOG_DROPPED = Counter(
+    "tibiantis_scrape_log_dropped",
+    "Scrape log records lost (config/scrape_log.py): queue_full when the "
+    "sink falls behind, sink_error when a batch write fails.",
+    ["reason"],
+)
+REMINDER_LAG_SECONDS = Histogram(
+    "tibiantis_bedmage_reminder_lag_seconds",
+    "How long after its due time a bedmage reminder was sent.",
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+DISCORD_EMBEDS = Counter(
+    "tibiantis_discord_embeds",
+    "Embeds handed to the Discord webhook dispatcher, by how they ended.",
+    ["outcome"],
+)
+DISCORD_MESSAGES = Counter(
+    "tibiantis_discord_messages",
+    "Webhook messages Discord accepted; embeds / messages is the coalescing.",
+)
+DISCORD_RATE_LIMITED = Counter(
+    "tibiantis_discord_rate_limited",
+    "429 responses from Discord, by bucket or global scope.",
+    ["scope"],
+)
+DISCORD_DELIVERY_SECONDS = Histogram(
+    "tibiantis_discord_delivery_seconds",
+    "From an embed being queued to Discord accepting its message.",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+OUTBOX_DELIVERY_SECONDS = Histogram(
+    "tibiantis_outbox_delivery_seconds",
+    "From a notification entering the outbox to Discord accepting it.",
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 300, 3600),
+)
+GRAPHQL_OPERATION_SECONDS = Histogram(
+    "tibiantis_graphql_operation_seconds",
+    "GraphQL operation latency, parse to response, by operation name.",
+    ["operation"],
+)
+
+# Sent with `kind` and `outcome` for every item the ingestion services store
+# or reject; a scrape subprocess tallies them for its run report.
+item_ingested = Signal()
+
+
+def count_ingested(kind: str, outcome: str) -> None:
+    ITEMS.labels(kind=kind, outcome=outcome).inc()
+    item_ingested.send(sender=None, kind=kind, outcome=outcome)
+
+
+# Operation names come from clients; past this many distinct names the rest
+# share one label so a misbehaving client cannot explode the series count.
+MAX_OPERATION_LABELS = 200
+_OPERATION_NAME = re.compile(r"[_A-Za-z][_0-9A-Za-z]{0,63}")
+_operation_labels: set[str] = set()
+
+
+def operation_label(name: str | None) -> str:
+    if not name:
+        return "<anonymous>"
+    if name in _operation_labels:
+        return name
+    if len(_operation_labels) >= MAX_OPERATION_LABELS or not _OPERATION_NAME.fullmatch(
+        name
+    ):
+        return "<other>"
+    _operation_labels.add(name)
+    return name
+
+
+class QueueDepthCollector(Collector):
+    """Messages waiting per Celery queue, read from the broker on collect."""
+
+    def collect(self) -> Iterator[Metric]:
+        from config.celery_metrics import queue_depths
+
+        try:
+            depths = queue_depths()
+        except Exception:  # broker down: export the rest rather than fail
+            logger.warning("Could not read Celery queue depths", exc_info=True)
+            return
+        gauge = GaugeMetricFamily(
+            "tibiantis_celery_queue_depth",
+            "Messages waiting in a Celery queue.",
+            labels=["queue"],
+        )
+        for queue, depth in depths.items():
+            gauge.add_metric([queue], depth)
+        yield gauge
+
+
+def exposition() -> bytes:
+    """Every metric of this host in the Prometheus text format."""
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry.register(REGISTRY)
+    registry.register(QueueDepthCollector())
+    return generate_latest(registry)
+
+
+def push(job: str) -> None:
+    """Push this process's metrics to `METRICS_PUSHGATEWAY_URL`, if set.
+
+    Grouped by host and process so workers never overwrite each other.
+    Failures are logged, not raised — a task must not fail over metrics.
+    """
+    url = settings.METRICS_PUSHGATEWAY_URL
+    if not url:
+        return
+    instance = os.environ.get(PROCESS_ID_ENV) or str(os.getpid())
+    try:
+        push_to_gateway(
+            url,
+            job=job,
+            registry=REGISTRY,
+            grouping_key={"instance": f"{socket.gethostname()}:{instance}"},
+            timeout=5,
+        )
+    except OSError:
+        logger.warning("Could not push metrics to %s", url, exc_info=True)
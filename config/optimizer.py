@@ -0,0 +1,76 @@
+"""Column projection and joins driven by the client's selection set.
+
+`DjangoOptimizerExtension` (registered in `config.schema`) rewrites querysets
+that resolvers return unevaluated. Ours are async and evaluate their own
+querysets — keyset pages, capped searches — so they hand them to
+`optimize` / `optimize_connection` first, which apply the same `.only()`,
+`select_related` and `prefetch_related` the extension would.
+
+`only` names columns the resolver itself reads after the selection set is
+applied (a connection's sort key, for its cursors). Characters resolved
+through `character_loader` are not projected: the loader shares whole rows
+with the Redis character cache.
+"""
+
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+import strawberry
+from django.db.models import Model, QuerySet
+from graphql import FieldNode, GraphQLObjectType, GraphQLResolveInfo, get_named_type
+from strawberry_django.optimizer import OptimizerStore, optimizer
+from strawberry_django.utils.gql_compat import get_sub_field_selections
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+
+def optimize(
+    qs: QuerySet[ModelT],
+    info: strawberry.Info | GraphQLResolveInfo,
+    *,
+    only: Sequence[str] = (),
+) -> QuerySet[ModelT]:
+    """`qs` narrowed to what the field's selection set needs."""
+    extension = optimizer.get()
+    if extension is None:
+        return qs
+    return extension.optimize(qs, info, store=OptimizerStore.with_hints(only=only))
+
+
+def _subfields(
+    info: GraphQLResolveInfo, parent_type: GraphQLObjectType, name: str
+) -> list[FieldNode]:
+    return [
+        node
+        for nodes in get_sub_field_selections(info, parent_type).values()
+        for node in nodes
+        if node.name.value == name
+    ]
+
+
+def optimize_connection(
+    qs: QuerySet[ModelT],
+    info: strawberry.Info,
+    *,
+    only: Sequence[str] = (),
+) -> QuerySet[ModelT]:
+    """Like `optimize`, for a `Connection` field: the node type's selection
+    sits under `edges { node { ... } }`."""
+    raw: Any = info._raw_info
+    connection_type = get_named_type(raw.return_type)
+    edge_type = get_named_type(connection_type.fields["edges"].type)
+    node_type = get_named_type(edge_type.fields["node"].type)
+
+    edges = _subfields(raw, connection_type, "edges")
+    nodes = _subfields(raw._replace(field_nodes=edges), edge_type, "node")
+    if not nodes:
+        # Only `pageInfo` (or edge cursors) asked for.
+        return qs.only(*only)
+    node_info = raw._replace(
+        field_name="node",
+        field_nodes=nodes,
+        return_type=node_type,
+        parent_type=edge_type,
+        path=raw.path.add_key("edges").add_key(0).add_key("node", edge_type.name),
+    )
+    return optimize(qs, node_info, only=only)
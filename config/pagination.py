@@ -0,0 +1,84 @@
+"""Relay-style keyset (cursor) pagination shared by the GraphQL connections.
+
+A cursor is an opaque, URL-safe base64 JSON array: `[kind, *sort_key]`. The
+sort key is the row's position in the connection's ordering, so the next
+page is a `WHERE (sort_key) < (cursor)` range scan on a matching composite
+index — page 1000 costs the same as page 1, unlike OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any, Generic, TypeVar
+
+import strawberry
+from django.db.models import QuerySet
+from strawberry.relay import PageInfo
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NodeT = TypeVar("NodeT")
+
+
+@strawberry.type
+class Edge(Generic[NodeT]):
+    cursor: str
+    node: NodeT
+
+
+@strawberry.type
+class Connection(Generic[NodeT]):
+    edges: list[Edge[NodeT]]
+    page_info: PageInfo
+
+
+def encode_cursor(kind: str, *sort_key: Any) -> str:
+    raw = json.dumps([kind, *sort_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(kind: str, cursor: str) -> list[Any]:
+    """Sort key stored in `cursor`; ValueError if it is malformed or belongs
+    to a different connection."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(payload, list) or not payload or payload[0] != kind:
+        raise ValueError("Invalid cursor")
+    return payload[1:]
+
+
+def page_size(first: int | None) -> int:
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    if first < 1:
+        raise ValueError("`first` must be a positive integer")
+    return min(first, MAX_PAGE_SIZE)
+
+
+async def keyset_page(
+    qs: QuerySet[Any],
+    *,
+    first: int | None,
+    after: str | None,
+    cursor_for: Callable[[Any], str],
+) -> Connection[Any]:
+    """Slice one page off an already filtered-past-`after` and ordered queryset.
+
+    Fetches one extra row to learn `hasNextPage` without a COUNT(*).
+    """
+    size = page_size(first)
+    rows: Sequence[Any] = [row async for row in qs[: size + 1]]
+    edges = [Edge(cursor=cursor_for(row), node=row) for row in rows[:size]]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=len(rows) > size,
+            has_previous_page=after is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
@@ -0,0 +1,28 @@
+"""Permission guards for GraphQL resolvers.
+
+`request.user` may be a lazy session-backed object, so it is evaluated in
+a thread (`sync_to_async`) rather than on the event loop.
+"""
+
+import strawberry
+from asgiref.sync import sync_to_async
+
+
+async def require_authenticated(info: strawberry.Info) -> None:
+    request = info.context.request
+
+    def _check() -> bool:
+        return bool(request.user.is_authenticated)
+
+    if not await sync_to_async(_check)():
+        raise PermissionError("Authentication required")
+
+
+async def require_staff(info: strawberry.Info) -> None:
+    request = info.context.request
+
+    def _check() -> bool:
+        return bool(request.user.is_authenticated and request.user.is_staff)
+
+    if not await sync_to_async(_check)():
+        raise PermissionError("Staff only")
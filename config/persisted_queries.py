@@ -0,0 +1,117 @@
+"""Persisted queries for `/graphql/`: a hash-registered allowlist plus Apollo APQ.
+
+Clients send `extensions.persistedQuery = {"version": 1, "sha256Hash": ...}`
+and omit `query` once the hash is known — a few dozen bytes instead of the
+whole document (and GET-able, so cacheable by a proxy).
+
+- Allowlist: `GRAPHQL_PERSISTED_QUERIES_FILE` is a JSON object mapping the
+  sha256 hex digest of each operation's text to the text itself. Entries
+  whose hash doesn't match their text are rejected at load time.
+- APQ: an unknown hash answers `PersistedQueryNotFound`; the client retries
+  with hash + query, which is verified and stored in the Django cache for
+  `GRAPHQL_APQ_TTL` seconds.
+- `GRAPHQL_PERSISTED_ONLY = True` locks the endpoint down to the allowlist:
+  ad-hoc queries and APQ registration are refused.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLError
+
+logger = logging.getLogger(__name__)
+
+APQ_KEY_PREFIX = "graphql:apq:"
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+    def as_graphql_error(self) -> GraphQLError:
+        return GraphQLError(str(self), extensions={"code": self.code})
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@functools.cache
+def load_allowlist() -> dict[str, str]:
+    path = settings.GRAPHQL_PERSISTED_QUERIES_FILE
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        entries: dict[str, str] = json.load(fh)
+    for digest, query in entries.items():
+        if query_hash(query) != digest.lower():
+            raise ValueError(f"Persisted query {digest} does not match its text")
+    return {digest.lower(): query for digest, query in entries.items()}
+
+
+async def resolve_query(
+    query: str | None, extensions: dict[str, Any] | None
+) -> str | None:
+    """Query text to execute for a request, after allowlist/APQ handling.
+
+    Raises PersistedQueryError with an Apollo-compatible `code`.
+    """
+    allowlist = load_allowlist()
+    persisted = (extensions or {}).get("persistedQuery")
+
+    if persisted is None:
+        if (
+            query is not None
+            and settings.GRAPHQL_PERSISTED_ONLY
+            and query_hash(query) not in allowlist
+        ):
+            raise PersistedQueryError(
+                "Only persisted queries are allowed", "PERSISTED_QUERY_REQUIRED"
+            )
+        return query
+
+    if (
+        not isinstance(persisted, dict)
+        or persisted.get("version") != 1
+        or not isinstance(persisted.get("sha256Hash"), str)
+    ):
+        raise PersistedQueryError(
+            "Unsupported persistedQuery extension", "PERSISTED_QUERY_NOT_SUPPORTED"
+        )
+    digest = persisted["sha256Hash"].lower()
+
+    if query is None:
+        if digest in allowlist:
+            return allowlist[digest]
+        stored: str | None = None
+        if not settings.GRAPHQL_PERSISTED_ONLY:
+            try:
+                stored = await cache.aget(APQ_KEY_PREFIX + digest)
+            except Exception:
+                logger.warning("APQ lookup failed", exc_info=True)
+        if stored is None:
+            raise PersistedQueryError(
+                "PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND"
+            )
+        return stored
+
+    if query_hash(query) != digest:
+        raise PersistedQueryError(
+            "provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH"
+        )
+    if digest not in allowlist:
+        if settings.GRAPHQL_PERSISTED_ONLY:
+            raise PersistedQueryError(
+                "Only persisted queries are allowed", "PERSISTED_QUERY_REQUIRED"
+            )
+        try:
+            await cache.aset(APQ_KEY_PREFIX + digest, query, settings.GRAPHQL_APQ_TTL)
+        except Exception:
+            logger.warning("APQ registration failed", exc_info=True)
+    return query
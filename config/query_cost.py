@@ -0,0 +1,173 @@
+"""Static cost analysis for GraphQL operations.
+
+An operation's cost is computed from the document and its variables before
+anything executes:
+
+- every object-typed field costs 1 (scalars are free), or its entry in
+  `FIELD_WEIGHTS` for resolvers that are heavier than a row fetch;
+- a field that takes a size argument (`first`, `limit`, `names`) multiplies
+  the cost of its selection by the number of items it can return, clamped
+  the same way the resolver clamps it.
+
+`QueryCost` rejects operations above `GRAPHQL_MAX_COST` with a
+`QUERY_TOO_COMPLEX` error, so a deeply nested page-of-pages query is refused
+before it reaches Postgres. List fields added later must take one of the
+size arguments above (or get a weight here) to be costed correctly.
+"""
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from django.conf import settings
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    SelectionSetNode,
+    get_named_type,
+    get_operation_ast,
+)
+from graphql.execution import ExecutionResult as GraphQLExecutionResult
+from graphql.execution.values import get_argument_values
+from strawberry.extensions import SchemaExtension
+
+from apps.characters.services import BATCH_LOOKUP_MAX, SEARCH_LIMIT_MAX
+from config.pagination import page_size
+
+# "<Type>.<field>": cost of one resolution, replacing the default of 1.
+FIELD_WEIGHTS: dict[str, int] = {
+    # Indexed (btree prefix, GIN trigram) and capped at SEARCH_LIMIT_MAX rows,
+    # but every name the index matches is ranked and sorted before the limit
+    # applies: trigram similarity per candidate in fuzzy mode, name length in
+    # prefix mode. Short or common terms match many names.
+    "Query.searchCharacters": 10,
+}
+
+
+class _Walker:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Mapping[str, FragmentDefinitionNode],
+        variables: Mapping[str, Any],
+    ) -> None:
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+
+    def selection_cost(
+        self, parent: GraphQLNamedType, selection_set: SelectionSetNode | None
+    ) -> int:
+        if selection_set is None or not isinstance(
+            parent, (GraphQLObjectType, GraphQLInterfaceType)
+        ):
+            return 0
+        total = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                total += self.field_cost(parent, selection)
+            elif isinstance(selection, InlineFragmentNode):
+                condition = selection.type_condition
+                target = (
+                    self.schema.get_type(condition.name.value) if condition else parent
+                )
+                total += self.selection_cost(target or parent, selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    target = self.schema.get_type(fragment.type_condition.name.value)
+                    total += self.selection_cost(
+                        target or parent, fragment.selection_set
+                    )
+        return total
+
+    def field_cost(
+        self, parent: GraphQLObjectType | GraphQLInterfaceType, node: FieldNode
+    ) -> int:
+        name = node.name.value
+        field = parent.fields.get(name)
+        if field is None or name.startswith("__"):
+            # Unknown fields fail validation; introspection is depth-limited.
+            return 0
+        named = get_named_type(field.type)
+        if node.selection_set is None:
+            return FIELD_WEIGHTS.get(f"{parent.name}.{name}", 0)
+        weight = FIELD_WEIGHTS.get(f"{parent.name}.{name}", 1)
+        children = self.selection_cost(named, node.selection_set)
+        return weight + _multiplier(field, node, self.variables) * children
+
+
+def _multiplier(
+    field: GraphQLField, node: FieldNode, variables: Mapping[str, Any]
+) -> int:
+    """How many items the field can return, as its resolver clamps it."""
+    if not field.args:
+        return 1
+    args = get_argument_values(field, node, dict(variables))
+    if "first" in field.args:
+        first = args.get("first")
+        return page_size(first) if first is None or first > 0 else 1
+    if "limit" in field.args:
+        return max(1, min(int(args.get("limit") or 1), SEARCH_LIMIT_MAX))
+    if "names" in field.args:
+        return max(1, min(len(args.get("names") or ()), BATCH_LOOKUP_MAX))
+    return 1
+
+
+def operation_cost(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: str | None = None,
+    variables: Mapping[str, Any] | None = None,
+) -> int:
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return 0
+    root = schema.get_root_type(operation.operation)
+    if root is None:
+        return 0
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    walker = _Walker(schema, fragments, variables or {})
+    return walker.selection_cost(root, operation.selection_set)
+
+
+class QueryCost(SchemaExtension):
+    """Refuses operations whose static cost exceeds `GRAPHQL_MAX_COST`."""
+
+    def on_execute(self) -> Iterator[None]:
+        ctx = self.execution_context
+        if ctx.graphql_document is not None:
+            try:
+                cost = operation_cost(
+                    ctx.schema._schema,
+                    ctx.graphql_document,
+                    ctx.operation_name,
+                    ctx.variables,
+                )
+            except GraphQLError:
+                # Bad variables: let execution report them properly.
+                cost = 0
+            budget = settings.GRAPHQL_MAX_COST
+            if cost > budget:
+                error = GraphQLError(
+                    f"Query cost {cost} exceeds the maximum of {budget}",
+                    extensions={
+                        "code": "QUERY_TOO_COMPLEX",
+                        "cost": cost,
+                        "maxCost": budget,
+                    },
+                )
+                ctx.result = GraphQLExecutionResult(data=None, errors=[error])
+        yield
@@ -0,0 +1,20 @@
+"""Redis clients for `settings.REDIS_URL` (pub/sub and ad-hoc structures,
+not the Django cache or the Celery broker)."""
+
+import functools
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+
+@functools.cache
+def get_redis() -> redis.Redis:
+    """Process-wide sync client; its connection pool is thread-safe."""
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """A new asyncio client — its pool is bound to the calling event loop,
+    so it must not be shared across loops."""
+    return redis.asyncio.Redis.from_url(settings.REDIS_URL)
@@ -0,0 +1,176 @@
+"""Per-resolver wall time and DB query counts, with slow-operation logging.
+
+`ResolverTiming` times every field that has a resolver of its own (plain
+attribute fields are skipped — they cost nothing and would dominate the
+overhead) and aggregates by `Type.field`, so a list of 200 nodes shows up as
+one line with `calls=200`.
+
+DB queries are attributed through a Django execute wrapper installed on
+every new connection: the wrapper reads the resolver currently running from
+a context variable, which asgiref carries into `sync_to_async` threads. A
+DataLoader batch is charged to the resolver that triggered it.
+
+Operations slower than `GRAPHQL_SLOW_OPERATION_MS` are logged as a warning
+with their heaviest resolvers. With `DEBUG` on, the breakdown is also
+returned in the response's `extensions.timing`. Every operation's latency
+is exported as `tibiantis_graphql_operation_seconds` (config/metrics.py).
+"""
+
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from graphql import GraphQLResolveInfo
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+
+from config import metrics
+
+logger = logging.getLogger(__name__)
+
+TOP_RESOLVERS_LOGGED = 5
+
+
+@dataclass
+class ResolverStats:
+    calls: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+
+
+@dataclass
+class _Operation:
+    queries: int = 0
+    resolvers: dict[str, ResolverStats] = field(default_factory=dict)
+
+
+_operation: ContextVar[_Operation | None] = ContextVar(
+    "graphql_operation", default=None
+)
+_resolver: ContextVar[ResolverStats | None] = ContextVar(
+    "graphql_resolver", default=None
+)
+
+
+def _count_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    operation = _operation.get()
+    if operation is not None:
+        operation.queries += 1
+        stats = _resolver.get()
+        if stats is not None:
+            stats.queries += 1
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def _install_query_counter(sender: Any, connection: Any, **kwargs: Any) -> None:
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _has_own_resolver(info: GraphQLResolveInfo) -> bool:
+    graphql_field = info.parent_type.fields.get(info.field_name)
+    if graphql_field is None:
+        return False
+    definition = graphql_field.extensions.get(GraphQLCoreConverter.DEFINITION_BACKREF)
+    return getattr(definition, "base_resolver", None) is not None
+
+
+class ResolverTiming(SchemaExtension):
+    def on_operation(self) -> Iterator[None]:
+        self._operation = _Operation()
+        token = _operation.set(self._operation)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            _operation.reset(token)
+            self._elapsed = time.perf_counter() - started
+            metrics.GRAPHQL_OPERATION_SECONDS.labels(
+                metrics.operation_label(self.execution_context.operation_name)
+            ).observe(self._elapsed)
+            if self._elapsed * 1000 >= settings.GRAPHQL_SLOW_OPERATION_MS:
+                self._log_slow()
+
+    def resolve(
+        self,
+        _next: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if not _has_own_resolver(info):
+            return _next(root, info, *args, **kwargs)
+
+        key = f"{info.parent_type.name}.{info.field_name}"
+        stats = self._operation.resolvers.setdefault(key, ResolverStats())
+        stats.calls += 1
+        started = time.perf_counter()
+        token = _resolver.set(stats)
+        try:
+            result = _next(root, info, *args, **kwargs)
+        finally:
+            _resolver.reset(token)
+            stats.seconds += time.perf_counter() - started
+        if inspect.isawaitable(result):
+            return self._await(result, stats)
+        return result
+
+    async def _await(self, awaitable: Awaitable[Any], stats: ResolverStats) -> Any:
+        started = time.perf_counter()
+        token = _resolver.set(stats)
+        try:
+            return await awaitable
+        finally:
+            _resolver.reset(token)
+            stats.seconds += time.perf_counter() - started
+
+    def get_results(self) -> dict[str, Any]:
+        if not settings.DEBUG:
+            return {}
+        return {
+            "timing": {
+                "queries": self._operation.queries,
+                "resolvers": {
+                    key: {
+                        "calls": stats.calls,
+                        "ms": round(stats.seconds * 1000, 3),
+                        "queries": stats.queries,
+                    }
+                    for key, stats in self._operation.resolvers.items()
+                },
+            }
+        }
+
+    def _log_slow(self) -> None:
+        ctx = self.execution_context
+        heaviest = sorted(
+            self._operation.resolvers.items(),
+            key=lambda item: item[1].seconds,
+            reverse=True,
+        )[:TOP_RESOLVERS_LOGGED]
+        logger.warning(
+            "Slow GraphQL operation %s: %.1f ms, %d DB queries; top resolvers: %s",
+            ctx.operation_name or "<anonymous>",
+            self._elapsed * 1000,
+            self._operation.queries,
+            ", ".join(
+                f"{key} {stats.seconds * 1000:.1f} ms/{stats.calls} calls/"
+                f"{stats.queries} queries"
+                for key, stats in heaviest
+            ),
+        )
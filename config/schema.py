@@ -1,7 +1,36 @@
 import strawberry
+from django.conf import settings
+from strawberry.extensions import QueryDepthLimiter
 from strawberry.tools import merge_types
+from strawberry_django.optimizer import DjangoOptimizerExtension
 from apps.accounts.schema import Query as AccountsQuery
 from apps.characters.schema import Query as CharactersQuery
+from apps.deaths.schema import Query as DeathsQuery, Subscription as DeathsSubscription
+from apps.scraping.schema import Query as ScrapingQuery
+from config.celery_metrics import Query as CeleryMetricsQuery
+from config.graphql_cache import DocumentCache, Query as GraphQLCacheQuery
+from config.query_cost import QueryCost
+from config.resolver_timing import ResolverTiming
 
-Query = merge_types("Query", (AccountsQuery, CharactersQuery))
-schema = strawberry.Schema(query=Query)
+Query = merge_types(
+    "Query",
+    (
+        AccountsQuery,
+        CharactersQuery,
+        DeathsQuery,
+        ScrapingQuery,
+        GraphQLCacheQuery,
+        CeleryMetricsQuery,
+    ),
+)
+schema = strawberry.Schema(
+    query=Query,
+    subscription=DeathsSubscription,
+    extensions=[
+        ResolverTiming,
+        DocumentCache,
+        QueryDepthLimiter(max_depth=settings.GRAPHQL_MAX_DEPTH),
+        QueryCost,
+        DjangoOptimizerExtension(),
+    ],
+)
@@ -0,0 +1,279 @@
+"""Structured scrape logs, written in batches off the scrape hot path.
+
+Scrapy hooks append one record per fetch (`log_fetch`) and per stored item
+(`log_item`). Appending is a non-blocking put on a bounded in-memory queue;
+a background thread drains it and hands batches of up to
+`SCRAPE_LOG_BATCH_SIZE` records to a `Sink` at least every
+`SCRAPE_LOG_FLUSH_SECONDS`.
+
+Backpressure: when the sink falls behind and the queue
+(`SCRAPE_LOG_QUEUE_SIZE`) is full, new records are dropped and counted in
+`tibiantis_scrape_log_dropped_total` — a slow log store never slows a scrape.
+
+`SCRAPE_LOG_URL` picks the sink:
+
+* ``mongodb://host:27017/tibiantis`` — bulk inserts into the
+  `scrape_logs` collection (needs `pymongo`);
+* ``sqlite:///logs/scrape_logs.sqlite3`` — one row per record, for dev;
+* ``jsonl:///logs/scrape_logs.jsonl`` — one JSON object per line, for dev
+  and tests;
+* empty — logging off; the hooks cost a settings lookup.
+
+File paths follow the `DATABASE_URL` convention: three slashes for a path
+relative to the working directory, four for an absolute one.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Literal, NotRequired, TypedDict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from config import metrics
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "scrape_logs"
+
+
+class ScrapeLogRecord(TypedDict):
+    kind: Literal["fetch", "item"]
+    # Epoch seconds.
+    ts: float
+    spider: str
+    url: str
+    # fetch
+    status: NotRequired[int]
+    bytes: NotRequired[int]
+    latency_ms: NotRequired[float]
+    # item
+    key: NotRequired[str]
+    outcome: NotRequired[str]
+    duration_ms: NotRequired[float]
+    error: NotRequired[str]
+
+
+class Sink(ABC):
+    @abstractmethod
+    def write(self, records: Sequence[ScrapeLogRecord]) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink(Sink):
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+        self._file.writelines(json.dumps(record) + "\n" for record in records)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SqliteSink(Sink):
+    """`scrape_logs(ts, kind, spider, url, record)`; `record` is the JSON."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Created in the caller's thread, used by the writer thread only.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {COLLECTION} "
+            "(ts REAL, kind TEXT, spider TEXT, url TEXT, record TEXT)"
+        )
+
+    def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+        with self._db:
+            self._db.executemany(
+                f"INSERT INTO {COLLECTION} VALUES (?, ?, ?, ?, ?)",
+                [
+                    (r["ts"], r["kind"], r["spider"], r["url"], json.dumps(r))
+                    for r in records
+                ],
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class MongoSink(Sink):
+    def __init__(self, url: str) -> None:
+        try:
+            import pymongo
+        except ImportError:
+            raise ImproperlyConfigured(
+                "A mongodb:// SCRAPE_LOG_URL requires pymongo"
+            ) from None
+        self._client: Any = pymongo.MongoClient(url)
+        self._collection = self._client.get_default_database()[COLLECTION]
+
+    def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+        # insert_many adds `_id` to each document; keep the caller's intact.
+        self._collection.insert_many(
+            [dict(record) for record in records], ordered=False
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def sink_from_url(url: str) -> Sink:
+    parts = urlsplit(url)
+    if parts.scheme in ("mongodb", "mongodb+srv"):
+        return MongoSink(url)
+    path = parts.path[1:]
+    if parts.scheme == "sqlite":
+        return SqliteSink(path)
+    if parts.scheme == "jsonl":
+        return JsonlSink(path)
+    raise ImproperlyConfigured(f"Unsupported SCRAPE_LOG_URL scheme: {url!r}")
+
+
+class ScrapeLogWriter:
+    """Bounded queue in front of a sink, drained by one daemon thread."""
+
+    def __init__(
+        self,
+        sink: Sink,
+        *,
+        queue_size: int,
+        batch_size: int,
+        flush_seconds: float,
+    ) -> None:
+        self._sink = sink
+        self._queue: queue.Queue[ScrapeLogRecord | None] = queue.Queue(queue_size)
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._thread = threading.Thread(
+            target=self._run, name="scrape-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def append(self, record: ScrapeLogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            metrics.SCRAPE_LOG_DROPPED.labels(reason="queue_full").inc()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush what is queued and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Scrape log sink stalled; closing with records queued")
+        else:
+            self._thread.join(timeout)
+        self._sink.close()
+
+    def _run(self) -> None:
+        batch: list[ScrapeLogRecord] = []
+        deadline = time.monotonic() + self._flush_seconds
+        stopping = False
+        while not stopping:
+            try:
+                record = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                pass
+            else:
+                if record is None:
+                    stopping = True
+                else:
+                    batch.append(record)
+                    if len(batch) < self._batch_size and time.monotonic() < deadline:
+                        continue
+            if batch:
+                self._flush(batch)
+                batch = []
+            deadline = time.monotonic() + self._flush_seconds
+
+    def _flush(self, batch: list[ScrapeLogRecord]) -> None:
+        try:
+            self._sink.write(batch)
+        except Exception:
+            logger.warning("Dropped %d scrape log records", len(batch), exc_info=True)
+            metrics.SCRAPE_LOG_DROPPED.labels(reason="sink_error").inc(len(batch))
+
+
+_writer: ScrapeLogWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> ScrapeLogWriter | None:
+    """This process's writer, started on first use; None when logging is off."""
+    global _writer
+    if _writer is None and settings.SCRAPE_LOG_URL:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ScrapeLogWriter(
+                    sink_from_url(settings.SCRAPE_LOG_URL),
+                    queue_size=settings.SCRAPE_LOG_QUEUE_SIZE,
+                    batch_size=settings.SCRAPE_LOG_BATCH_SIZE,
+                    flush_seconds=settings.SCRAPE_LOG_FLUSH_SECONDS,
+                )
+                atexit.register(_writer.close)
+    return _writer
+
+
+def close() -> None:
+    """Flush and stop this process's writer (a spider closing calls this)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+def log_fetch(
+    spider: str, url: str, *, status: int, size: int, latency_ms: float | None
+) -> None:
+    writer = get_writer()
+    if writer is None:
+        return
+    record = ScrapeLogRecord(
+        kind="fetch", ts=time.time(), spider=spider, url=url, status=status, bytes=size
+    )
+    if latency_ms is not None:
+        record["latency_ms"] = round(latency_ms, 3)
+    writer.append(record)
+
+
+def log_item(
+    spider: str,
+    url: str,
+    *,
+    key: str,
+    outcome: str,
+    duration_ms: float,
+    error: str | None = None,
+) -> None:
+    writer = get_writer()
+    if writer is None:
+        return
+    record = ScrapeLogRecord(
+        kind="item",
+        ts=time.time(),
+        spider=spider,
+        url=url,
+        key=key,
+        outcome=outcome,
+        duration_ms=round(duration_ms, 3),
+    )
+    if error is not None:
+        record["error"] = error
+    writer.append(record)
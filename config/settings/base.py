@@ -41,6 +41,7 @@ DJANGO_APPS: list[str] = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS: list[str] = [
@@ -54,6 +55,10 @@ LOCAL_APPS: list[str] = [
     "apps.characters",
     "apps.accounts",
     "apps.deaths",
+    "apps.exports",
+    "apps.scraping",
+    "apps.bedmages",
+    "apps.notifications",
 ]
 
 INSTALLED_APPS: list[str] = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -86,6 +91,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 
 # Database
@@ -94,6 +100,15 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {"default": env.db()}
 
 
+# Cache
+# Redis in production: the ASGI workers and the scrape_character subprocesses
+# must share it for write-through invalidation to reach every reader.
+# The LocMem default is only coherent within a single process.
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+CHARACTER_CACHE_TTL = env.int("CHARACTER_CACHE_TTL", default=60 * 60)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -139,6 +154,32 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
+# In-process cache of JWT-authenticated users (apps/accounts/auth.py).
+# Saves in other processes are only seen once an entry expires.
+JWT_USER_CACHE_TTL = env.int("JWT_USER_CACHE_TTL", default=60)
+JWT_USER_CACHE_SIZE = env.int("JWT_USER_CACHE_SIZE", default=1024)
+
+# GraphQL (config/persisted_queries.py, config/graphql_cache.py)
+GRAPHQL_PERSISTED_QUERIES_FILE = env("GRAPHQL_PERSISTED_QUERIES_FILE", default="")
+GRAPHQL_PERSISTED_ONLY = env.bool("GRAPHQL_PERSISTED_ONLY", default=False)
+GRAPHQL_APQ_TTL = env.int("GRAPHQL_APQ_TTL", default=60 * 60 * 24)
+GRAPHQL_DOCUMENT_CACHE_SIZE = env.int("GRAPHQL_DOCUMENT_CACHE_SIZE", default=256)
+# Query limits and timing (config/query_cost.py, config/resolver_timing.py)
+GRAPHQL_MAX_DEPTH = env.int("GRAPHQL_MAX_DEPTH", default=10)
+GRAPHQL_MAX_COST = env.int("GRAPHQL_MAX_COST", default=1000)
+GRAPHQL_SLOW_OPERATION_MS = env.int("GRAPHQL_SLOW_OPERATION_MS", default=500)
+
+# Real-time death feed (apps/deaths/broadcast.py): Redis pub/sub between the
+# ingestion processes and every ASGI worker.
+REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
+# Default `minLevel` of the deathAdded subscription.
+DEATH_LEVEL_THRESHOLD = env.int("DEATH_LEVEL_THRESHOLD", default=30)
+# Undelivered events kept per subscriber; a slower consumer loses the oldest.
+DEATH_FEED_QUEUE_SIZE = env.int("DEATH_FEED_QUEUE_SIZE", default=100)
+
+# Bulk exports (apps/exports): rows per server-side cursor fetch and per
+# encoded chunk. Parquet output additionally needs `pyarrow` installed.
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", default=5000)
 
 # Celery
 CELERY_BROKER_URL = env("CELERY_BROKER_URL")
@@ -148,3 +189,65 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 60 * 30  # 30 min hard limit
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_SCRAPE_FRESHNESS_MINUTES = env.int("CELERY_SCRAPE_FRESHNESS_MINUTES", default=30)
+# Every watched character is scraped once per interval, at a stable
+# per-character phase (apps/characters/schedule.py, `dispatch_scrapes`).
+CHARACTER_SCRAPE_INTERVAL_MINUTES = env.int(
+    "CHARACTER_SCRAPE_INTERVAL_MINUTES", default=60
+)
+# A bedmage has rested this long after its last login; watchers are reminded
+# then (apps/bedmages/reminders.py, `dispatch_reminders`).
+BEDMAGE_REMINDER_MINUTES = env.int("BEDMAGE_REMINDER_MINUTES", default=100)
+# Login fast lane (`poll_logins`): bedmage-watched characters are polled for
+# a new last login this often, as long as that stays within
+# LOGIN_POLL_BUDGET_RATIO × the request rate of the full-profile schedule.
+LOGIN_POLL_SECONDS = env.int("LOGIN_POLL_SECONDS", default=120)
+LOGIN_POLL_BUDGET_RATIO = env.float("LOGIN_POLL_BUDGET_RATIO", default=1.0)
+# Discord webhook delivery (apps/notifications/discord.py): embeds queued
+# within DISCORD_COALESCE_MS of each other share a message; one pooled HTTP
+# client keeps at most DISCORD_WEBHOOK_CONNECTIONS connections open.
+DISCORD_COALESCE_MS = env.int("DISCORD_COALESCE_MS", default=250)
+DISCORD_WEBHOOK_CONNECTIONS = env.int("DISCORD_WEBHOOK_CONNECTIONS", default=20)
+DISCORD_MAX_RETRIES = env.int("DISCORD_MAX_RETRIES", default=5)
+DISCORD_TIMEOUT_SECONDS = env.float("DISCORD_TIMEOUT_SECONDS", default=10.0)
+# Notification outbox (apps/notifications/outbox.py): where messages go
+# (empty: not sent), and how `drain_outbox` workers claim and retry them.
+DISCORD_DEATHS_WEBHOOK_URL = env("DISCORD_DEATHS_WEBHOOK_URL", default="")
+DISCORD_BEDMAGE_WEBHOOK_URL = env("DISCORD_BEDMAGE_WEBHOOK_URL", default="")
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=100)
+OUTBOX_CLAIM_LEASE_SECONDS = env.int("OUTBOX_CLAIM_LEASE_SECONDS", default=60)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=5)
+# Queues and routing live in config/celery.py. Per-queue wait-time
+# percentiles (config/celery_metrics.py) cover this many recent tasks.
+CELERY_WAIT_SAMPLES = env.int("CELERY_WAIT_SAMPLES", default=500)
+
+# Prometheus metrics (config/metrics.py), served at /metrics. Processes that
+# can't share PROMETHEUS_MULTIPROC_DIR with the ASGI app push here instead.
+METRICS_PUSHGATEWAY_URL = env("METRICS_PUSHGATEWAY_URL", default="")
+# When set, /metrics requires `Authorization: Bearer <token>`.
+METRICS_BEARER_TOKEN = env("METRICS_BEARER_TOKEN", default="")
+
+# Scrape logs (config/scrape_log.py): mongodb://…/db, sqlite:///path or
+# jsonl:///path (relative; four slashes for absolute), empty for off.
+# Records are queued in memory and written in batches; a full queue drops
+# records rather than slowing the scrape.
+SCRAPE_LOG_URL = env("SCRAPE_LOG_URL", default="")
+SCRAPE_LOG_QUEUE_SIZE = env.int("SCRAPE_LOG_QUEUE_SIZE", default=10000)
+SCRAPE_LOG_BATCH_SIZE = env.int("SCRAPE_LOG_BATCH_SIZE", default=500)
+SCRAPE_LOG_FLUSH_SECONDS = env.float("SCRAPE_LOG_FLUSH_SECONDS", default=2.0)
+
+# Scrape tracing (config/tracing.py): jsonl:///path or an OTLP/HTTP endpoint
+# (http://collector:4318/v1/traces); empty for off.
+TRACE_EXPORT_URL = env("TRACE_EXPORT_URL", default="")
+
+# Scrape-run ledger (apps/scraping): a sweep writes its per-target rows and
+# running totals once per this many targets.
+SCRAPE_RUN_BATCH_SIZE = env.int("SCRAPE_RUN_BATCH_SIZE", default=50)
+
+# Scrape zygote (apps/characters/zygote.py, `scrape_zygote`): when set, tasks
+# have the zygote listening on this Unix socket fork each scrape instead of
+# spawning a cold subprocess (and spawn one if nothing listens there).
+SCRAPE_ZYGOTE_SOCKET = env("SCRAPE_ZYGOTE_SOCKET", default="")
+
+# Load tests (`manage.py loadtest`) write and delete rows: they only run
+# against a default database whose NAME is listed here.
+LOADTEST_DATABASES = env.list("LOADTEST_DATABASES", default=[])
@@ -14,6 +14,52 @@ DATABASES = {
 INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.auth",
+    "apps.accounts",
     "apps.characters",
+    "apps.deaths",
+    "apps.scraping",
+    "apps.bedmages",
+    "apps.notifications",
 ]
 USE_TZ = True
+AUTH_USER_MODEL = "accounts.User"
+
+# Project settings read through `django.conf.settings` in apps/ and config/.
+CHARACTER_CACHE_TTL = 3600
+JWT_USER_CACHE_TTL = 60
+JWT_USER_CACHE_SIZE = 1024
+GRAPHQL_PERSISTED_QUERIES_FILE = ""
+GRAPHQL_PERSISTED_ONLY = False
+GRAPHQL_APQ_TTL = 86400
+GRAPHQL_DOCUMENT_CACHE_SIZE = 256
+GRAPHQL_MAX_DEPTH = 10
+GRAPHQL_MAX_COST = 1000
+GRAPHQL_SLOW_OPERATION_MS = 500
+REDIS_URL = "redis://localhost:6379/0"
+DEATH_LEVEL_THRESHOLD = 30
+DEATH_FEED_QUEUE_SIZE = 100
+EXPORT_CHUNK_SIZE = 5000
+CHARACTER_SCRAPE_INTERVAL_MINUTES = 60
+BEDMAGE_REMINDER_MINUTES = 100
+LOGIN_POLL_SECONDS = 120
+LOGIN_POLL_BUDGET_RATIO = 1.0
+DISCORD_COALESCE_MS = 250
+DISCORD_WEBHOOK_CONNECTIONS = 20
+DISCORD_MAX_RETRIES = 5
+DISCORD_TIMEOUT_SECONDS = 10.0
+DISCORD_DEATHS_WEBHOOK_URL = ""
+DISCORD_BEDMAGE_WEBHOOK_URL = ""
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_CLAIM_LEASE_SECONDS = 60
+OUTBOX_MAX_ATTEMPTS = 5
+CELERY_WAIT_SAMPLES = 500
+METRICS_PUSHGATEWAY_URL = ""
+METRICS_BEARER_TOKEN = ""
+SCRAPE_LOG_URL = ""
+SCRAPE_LOG_QUEUE_SIZE = 10000
+SCRAPE_LOG_BATCH_SIZE = 500
+SCRAPE_LOG_FLUSH_SECONDS = 2.0
+TRACE_EXPORT_URL = ""
+SCRAPE_RUN_BATCH_SIZE = 50
+SCRAPE_ZYGOTE_SOCKET = ""
+LOADTEST_DATABASES: list[str] = []
@@ -0,0 +1,280 @@
+"""Lightweight tracing of scrape runs across the Celery → subprocess boundary.
+
+A task run opens a root span and hands its context to the `scrape_character`
+subprocess in the W3C `TRACEPARENT` environment variable, together with the
+spawn time (`TRACE_SPAWNED_AT`). The subprocess continues the same trace:
+startup phases (interpreter, `django.setup()`, Scrapy imports) are recorded
+from timestamps, then the crawl with one span per fetch (robots.txt and
+pages), parse and `upsert_character` call. One trace therefore answers
+"where did this slow scrape spend its time?".
+
+Spans are buffered per process and exported when the process's outermost
+span ends, to `TRACE_EXPORT_URL`:
+
+* ``jsonl:///logs/traces.jsonl`` — one span per line (relative path; four
+  slashes for absolute), for dev and ad-hoc analysis;
+* ``http://localhost:4318/v1/traces`` — OTLP/HTTP JSON, accepted by an
+  OpenTelemetry Collector, Jaeger or Tempo;
+* empty — tracing off: `span` yields None and nothing is propagated.
+
+Context lives in a context variable. Threads that do not inherit it (the
+Twisted reactor thread of the scrape subprocess) fall back to the process
+parent set with `adopt`, or to the parent received in `TRACEPARENT`.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Self
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_ENV = "TRACEPARENT"
+SPAWNED_AT_ENV = "TRACE_SPAWNED_AT"
+# Set by manage.py as its first statement.
+PROCESS_STARTED_AT_ENV = "TRACE_PROCESS_STARTED_AT"
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def parse(cls, traceparent: str | None) -> Self | None:
+        match = _TRACEPARENT.fullmatch(traceparent or "")
+        return cls(*match.groups()) if match else None
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: str | None
+    start: float
+    end: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round((self.end - self.start) * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+_current: ContextVar[SpanContext | None] = ContextVar("trace_span", default=None)
+_remote = SpanContext.parse(os.environ.get(TRACEPARENT_ENV))
+_process_parent: SpanContext | None = None
+_finished: list[Span] = []
+_lock = threading.Lock()
+_marks: dict[str, float] = {}
+
+
+def enabled() -> bool:
+    return bool(settings.TRACE_EXPORT_URL)
+
+
+def current() -> SpanContext | None:
+    return _current.get() or _process_parent or _remote
+
+
+def _child_of(parent: SpanContext | None) -> SpanContext:
+    trace_id = parent.trace_id if parent else secrets.token_hex(16)
+    return SpanContext(trace_id, secrets.token_hex(8))
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[SpanContext | None]:
+    """Time the block as a child of the current span.
+
+    The outermost span of a process exports everything buffered when it ends.
+    """
+    if not enabled():
+        yield None
+        return
+    outermost = _current.get() is None and _process_parent is None
+    parent = current()
+    context = _child_of(parent)
+    started = Span(
+        name, context, parent.span_id if parent else None, time.time(), 0.0, attributes
+    )
+    token = _current.set(context)
+    try:
+        yield context
+    except BaseException as exc:
+        started.attributes["error"] = repr(exc)
+        raise
+    finally:
+        _current.reset(token)
+        started.end = time.time()
+        with _lock:
+            _finished.append(started)
+        if outermost:
+            flush()
+
+
+def record(name: str, start: float, end: float, **attributes: Any) -> None:
+    """Add a span measured elsewhere (signal handlers, startup timestamps)."""
+    if not enabled():
+        return
+    parent = current()
+    with _lock:
+        _finished.append(
+            Span(
+                name,
+                _child_of(parent),
+                parent.span_id if parent else None,
+                start,
+                end,
+                attributes,
+            )
+        )
+
+
+@contextmanager
+def adopt(context: SpanContext | None) -> Iterator[None]:
+    """Make `context` the parent for spans opened in threads that do not
+    inherit this one's context (e.g. the Twisted reactor thread)."""
+    global _process_parent
+    previous, _process_parent = _process_parent, context
+    try:
+        yield
+    finally:
+        _process_parent = previous
+
+
+def child_env(context: SpanContext | None) -> dict[str, str]:
+    """Environment that continues `context` in a subprocess."""
+    if context is None:
+        return {}
+    return {
+        TRACEPARENT_ENV: context.traceparent,
+        SPAWNED_AT_ENV: repr(time.time()),
+    }
+
+
+def continue_from_env() -> None:
+    """Re-read `TRACEPARENT`, for a process forked before it was set (the
+    scrape zygote's children, `apps.characters.zygote`)."""
+    global _remote
+    _remote = SpanContext.parse(os.environ.get(TRACEPARENT_ENV))
+
+
+def mark(name: str) -> None:
+    """Remember when this process reached `name` (see `record_startup`)."""
+    _marks[name] = time.time()
+
+
+def record_startup(ready_mark: str) -> None:
+    """Spans for a subprocess's startup, from its spawn to now:
+    `process.spawn` (interpreter start), `django.setup` (up to `ready_mark`)
+    and `imports` (the rest: command module imports)."""
+    now = time.time()
+    points = [
+        ("process.spawn", os.environ.get(SPAWNED_AT_ENV)),
+        ("django.setup", os.environ.get(PROCESS_STARTED_AT_ENV)),
+        ("imports", _marks.get(ready_mark)),
+    ]
+    bounds = [(phase, float(at)) for phase, at in points if at is not None]
+    for (phase, start), (_, end) in zip(bounds, bounds[1:] + [("", now)]):
+        record(phase, start, end)
+
+
+def flush() -> None:
+    with _lock:
+        spans = _finished[:]
+        _finished.clear()
+    if not spans:
+        return
+    url = settings.TRACE_EXPORT_URL
+    try:
+        if urlsplit(url).scheme == "jsonl":
+            _write_jsonl(urlsplit(url).path[1:], spans)
+        else:
+            _post_otlp(url, spans)
+    except (OSError, ValueError):
+        logger.warning(
+            "Could not export %d spans to %s", len(spans), url, exc_info=True
+        )
+
+
+atexit.register(flush)
+
+
+def _write_jsonl(path: str, spans: list[Span]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(json.dumps(span.as_dict()) + "\n" for span in spans)
+
+
+def _post_otlp(url: str, spans: list[Span]) -> None:
+    def attribute(key: str, value: Any) -> dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    body = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [attribute("service.name", "tibiantis")]},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [
+                            {
+                                "traceId": s.context.trace_id,
+                                "spanId": s.context.span_id,
+                                "parentSpanId": s.parent_id or "",
+                                "name": s.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(int(s.start * 1e9)),
+                                "endTimeUnixNano": str(int(s.end * 1e9)),
+                                "attributes": [
+                                    attribute(k, v) for k, v in s.attributes.items()
+                                ],
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5):
+        pass
@@ -17,12 +17,14 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from config.views import JWTAsyncGraphQLView
+from config.views import JWTAsyncGraphQLView, metrics_view
 from config.schema import schema
 from django.views.decorators.csrf import csrf_exempt
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("apps.accounts.api.urls")),
+    path("api/exports/", include("apps.exports.api.urls")),
     path("graphql/", csrf_exempt(JWTAsyncGraphQLView.as_view(schema=schema))),
+    path("metrics", metrics_view),
 ]
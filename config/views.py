@@ -1,27 +1,74 @@
+import dataclasses
+import hmac
 from typing import Any
-from django.http import HttpRequest, HttpResponseBase
-from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
 from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from strawberry.django.views import AsyncGraphQLView
-from rest_framework.request import Request as DRFRequest
+from strawberry.django.views import AsyncGraphQLView, TemporalHttpResponse
+from strawberry.http import GraphQLRequestData
+from strawberry.types import ExecutionResult
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from apps.accounts.auth import authenticate
+from config import metrics
+from config.context import GraphQLContext
+from config.persisted_queries import PersistedQueryError, resolve_query
 
-class JWTAsyncGraphQLView(AsyncGraphQLView):
+
+class JWTAsyncGraphQLView(AsyncGraphQLView[GraphQLContext, None]):
     async def dispatch(  # type: ignore[override]
         self, request: HttpRequest, *args: Any, **kwargs: Any
     ) -> HttpResponseBase:
-        _authenticator = JWTAuthentication()
         try:
-            auth_result: tuple[Any, Any] | None = await sync_to_async(
-                _authenticator.authenticate  # type: ignore[arg-type]
-            )(DRFRequest(request))
+            user = await authenticate(request)
         except AuthenticationFailed:
             request.user = AnonymousUser()
         else:
-            if auth_result is not None:
-                user, _ = auth_result
+            if user is not None:
                 request.user = user
 
         return await super().dispatch(request, *args, **kwargs)
+
+    async def get_context(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> GraphQLContext:
+        return GraphQLContext(request=request, response=response)
+
+    async def execute_single(
+        self,
+        request: HttpRequest,
+        request_adapter: Any,
+        sub_response: TemporalHttpResponse,
+        context: GraphQLContext,
+        root_value: Any,
+        request_data: GraphQLRequestData,
+    ) -> ExecutionResult:
+        """Swap persisted-query hashes for their text before execution."""
+        try:
+            query = await resolve_query(request_data.query, request_data.extensions)
+        except PersistedQueryError as exc:
+            return ExecutionResult(data=None, errors=[exc.as_graphql_error()])
+
+        return await super().execute_single(
+            request=request,
+            request_adapter=request_adapter,
+            sub_response=sub_response,
+            context=context,
+            root_value=root_value,
+            request_data=dataclasses.replace(request_data, query=query),
+        )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Prometheus scrape endpoint (see config/metrics.py).
+
+    Open unless `METRICS_BEARER_TOKEN` is set, in which case the scraper
+    must send it as `Authorization: Bearer <token>`.
+    """
+    token = settings.METRICS_BEARER_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.exposition(), content_type=CONTENT_TYPE_LATEST)
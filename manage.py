@@ -3,10 +3,13 @@
 
 import os
 import sys
+import time
 
 
 def main():
     """Run administrative tasks."""
+    # Start of the django.setup() span when a command runs traced (config/tracing.py).
+    os.environ["TRACE_PROCESS_STARTED_AT"] = repr(time.time())
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
     try:
         from django.core.management import execute_from_command_line
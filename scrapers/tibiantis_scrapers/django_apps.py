@@ -0,0 +1,33 @@
+"""Django for the Scrapy project, set up on first use.
+
+The project settings only name the Django settings module; reading
+`django.conf.settings` (metrics, tracing, scrape logs) works without more.
+The app registry — every installed app's models, signals and admin, about
+a second — is loaded by the first pipeline or spider that needs a model, so
+`scrapy list`, `scrapy check` and crawls that store nothing start without
+it. Under `manage.py` (`scrape_character`, `poll_logins`) Django is set up
+already and this costs a dict lookup.
+"""
+
+import functools
+import importlib
+from types import ModuleType
+
+import django
+from django.apps import apps
+
+
+def setup() -> None:
+    if not apps.ready:
+        django.setup()
+
+
+@functools.cache
+def services(module: str) -> ModuleType:
+    """`module` (an `apps.*.services`), imported once Django is set up.
+
+    Cached: later calls skip the import machinery. Callers look functions
+    up on the module at call time, so tests can still patch them.
+    """
+    setup()
+    return importlib.import_module(module)
@@ -12,3 +12,10 @@ class CharacterItem(Item):
     guild_membership = Field()
     last_login = Field()
     account_status = Field()
+
+
+class LoginItem(Item):
+    """The `Last Login` row alone, from the login fast lane (`LoginSpider`)."""
+
+    name = Field()
+    last_login = Field()
@@ -0,0 +1,92 @@
+"""Scrapy hooks feeding the Prometheus metrics in `config.metrics`.
+
+`MetricsExtension` records each page's download latency and pushes the
+process's metrics when the spider closes; `ParseTimingMiddleware` times the
+spider callbacks (also recorded as a `parse` span, see `config.tracing`).
+DB write time is recorded by `DjangoPipeline`.
+
+Each phase is also summed into the crawl's stats (`tibiantis/fetch_ms`,
+`tibiantis/parse_ms`, `tibiantis/db_ms`) for the run report the
+`scrape_character` command hands back to its task (`apps.scraping`).
+"""
+
+import time
+
+from scrapy import signals
+
+from config import metrics, tracing
+
+
+class MetricsExtension:
+    @classmethod
+    def from_crawler(cls, crawler):
+        extension = cls()
+        crawler.signals.connect(
+            extension.response_received, signal=signals.response_received
+        )
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def response_received(self, response, request, spider):
+        if request.meta.get("dont_obey_robotstxt"):
+            return  # robots.txt, not a scraped page
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            metrics.FETCH_SECONDS.labels(spider.name).observe(latency)
+            spider.crawler.stats.inc_value("tibiantis/fetch_ms", latency * 1000)
+
+    def spider_closed(self, spider):
+        metrics.push("scraper")
+
+
+class ParseTimingMiddleware:
+    """Times the callback alone: only the spans spent inside the callback's
+    generator count, not the middlewares and pipelines fed between items."""
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    def process_spider_output(self, response, result):
+        first_started = time.time()
+        elapsed = 0.0
+        output = iter(result)
+        while True:
+            started = time.perf_counter()
+            try:
+                entry = next(output)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - started
+            yield entry
+        self._observe(response, first_started, elapsed)
+
+    async def process_spider_output_async(self, response, result):
+        first_started = time.time()
+        elapsed = 0.0
+        output = aiter(result)
+        while True:
+            started = time.perf_counter()
+            try:
+                entry = await anext(output)
+            except StopAsyncIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - started
+            yield entry
+        self._observe(response, first_started, elapsed)
+
+    def _observe(self, response, first_started, elapsed):
+        metrics.PARSE_SECONDS.labels(self.crawler.spider.name).observe(elapsed)
+        self.crawler.stats.inc_value("tibiantis/parse_ms", elapsed * 1000)
+        tracing.record(
+            "parse",
+            first_started,
+            time.time(),
+            url=response.url,
+            busy_ms=round(elapsed * 1000, 3),
+        )
@@ -1,9 +1,28 @@
+import time
+
 from asgiref.sync import sync_to_async
 
+from config import metrics, tracing
+from scrapers.tibiantis_scrapers import django_apps
+
 
 class DjangoPipeline:
     async def process_item(self, item, spider):
-        from apps.characters.services import upsert_character
+        # Sets Django up on the first item, outside the timed write.
+        services = django_apps.services("apps.characters.services")
+        started = time.perf_counter()
+        try:
+            with tracing.span("upsert_character", character=item.get("name")):
+                await sync_to_async(services.upsert_character)(dict(item))
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.DB_WRITE_SECONDS.labels(spider.name).observe(elapsed)
+            spider.crawler.stats.inc_value("tibiantis/db_ms", elapsed * 1000)
+        return item
 
-        await sync_to_async(upsert_character)(dict(item))
+
+class LoginPipeline:
+    async def process_item(self, item, spider):
+        services = django_apps.services("apps.characters.services")
+        await sync_to_async(services.record_login)(item["name"], item["last_login"])
         return item
@@ -0,0 +1,57 @@
+"""Feeds `config.scrape_log`: a record per fetch and per item, flushed in
+batches by the writer thread; the spider closing flushes the rest."""
+
+import time
+
+from scrapy import signals
+
+from config import scrape_log
+
+RECEIVED_AT = "scrape_log_received_at"
+
+
+class ScrapeLogExtension:
+    @classmethod
+    def from_crawler(cls, crawler):
+        extension = cls()
+        crawler.signals.connect(
+            extension.response_received, signal=signals.response_received
+        )
+        crawler.signals.connect(extension.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(extension.item_error, signal=signals.item_error)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def response_received(self, response, request, spider):
+        request.meta[RECEIVED_AT] = time.monotonic()
+        latency = request.meta.get("download_latency")
+        scrape_log.log_fetch(
+            spider.name,
+            response.url,
+            status=response.status,
+            size=len(response.body),
+            latency_ms=latency * 1000 if latency is not None else None,
+        )
+
+    def item_scraped(self, item, response, spider):
+        self._log_item(item, response, spider, outcome="stored")
+
+    def item_error(self, item, response, spider, failure):
+        self._log_item(
+            item, response, spider, outcome="failed", error=repr(failure.value)
+        )
+
+    def spider_closed(self, spider):
+        scrape_log.close()
+
+    def _log_item(self, item, response, spider, *, outcome, error=None):
+        # Parse plus pipelines (the DB write), since the page arrived.
+        received_at = response.meta.get(RECEIVED_AT, time.monotonic())
+        scrape_log.log_item(
+            spider.name,
+            response.url,
+            key=str(item.get("name") or ""),
+            outcome=outcome,
+            duration_ms=(time.monotonic() - received_at) * 1000,
+            error=error,
+        )
@@ -1,8 +1,8 @@
 import os
-import django
 
+# Django settings only: the app registry is set up by the first pipeline or
+# spider that needs it (django_apps.py), not by importing this module.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
-django.setup()
 
 BOT_NAME = "tibiantis_scrapers"
 
@@ -11,9 +11,22 @@ NEWSPIDER_MODULE = "scrapers.tibiantis_scrapers.spiders"
 
 USER_AGENT = "TibiantisMonitor/1.0 (contact: bartlomiej.gozlinski@gmail.com)"
 ROBOTSTXT_OBEY = True
+# Where the spiders find tibiantis.online; load tests point it at
+# `manage.py fake_tibiantis` (apps/scraping/fake_tibiantis.py).
+TIBIANTIS_BASE_URL = os.environ.get("TIBIANTIS_BASE_URL", "https://tibiantis.online")
 DOWNLOAD_DELAY = 2.5
 CONCURRENT_REQUESTS_PER_DOMAIN = 1
 
+# Closest to the spider, so the parse time excludes the other middlewares.
+SPIDER_MIDDLEWARES = {
+    "scrapers.tibiantis_scrapers.metrics.ParseTimingMiddleware": 1000,
+}
+EXTENSIONS = {
+    "scrapers.tibiantis_scrapers.metrics.MetricsExtension": 500,
+    "scrapers.tibiantis_scrapers.scrape_log.ScrapeLogExtension": 500,
+    "scrapers.tibiantis_scrapers.tracing.TracingExtension": 500,
+}
+
 ITEM_PIPELINES = {
     "scrapers.tibiantis_scrapers.pipelines.DjangoPipeline": 300,
 }
@@ -3,6 +3,22 @@ from scrapers.tibiantis_scrapers.items import CharacterItem
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
+# Overridden by the TIBIANTIS_BASE_URL setting (e.g. a local fake site).
+BASE_URL = "https://tibiantis.online"
+
+
+def character_url(name: str, base_url: str = BASE_URL) -> str:
+    return f"{base_url}/?page=character&name={name}"
+
+
+def parse_last_login(raw: str) -> datetime | None:
+    """The `Last Login` value of a character page; None for "Never logged in"."""
+    if not raw or "never" in raw.lower():
+        return None
+    naive_part, _tz = raw.rsplit(" ", 1)  # "CEST" / "CET"
+    dt = datetime.strptime(naive_part, "%d %b %Y %H:%M:%S")
+    return dt.replace(tzinfo=ZoneInfo("Europe/Berlin"))
+
 
 class CharacterSpider(scrapy.Spider):
     name = "character"
@@ -14,14 +30,17 @@ class CharacterSpider(scrapy.Spider):
             raise ValueError("CharacterSpider requires -a name=<character>")
 
         self.character_name = name
-        self.start_urls = [f"https://tibiantis.online/?page=character&name={name}"]
+        self.start_urls = [character_url(name)]
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        base_url = crawler.settings.get("TIBIANTIS_BASE_URL", BASE_URL)
+        spider.start_urls = [character_url(spider.character_name, base_url)]
+        return spider
 
     def _parse_last_login(self, raw: str) -> datetime | None:
-        if not raw or "never" in raw.lower():
-            return None
-        naive_part, _tz = raw.rsplit(" ", 1)  # "CEST" / "CET"
-        dt = datetime.strptime(naive_part, "%d %b %Y %H:%M:%S")
-        return dt.replace(tzinfo=ZoneInfo("Europe/Berlin"))
+        return parse_last_login(raw)
 
     def parse(self, response):
         rows = response.css("table.tabi tr.hover")
@@ -51,7 +70,8 @@ class CharacterSpider(scrapy.Spider):
         item["world"] = data.get("World")
         item["residence"] = data.get("Residence")
         item["house"] = data.get("House")
-        item["guild_membership"] = data.get("Guild Membership")
+        # No guild: the row's cell has no link (or there is no row).
+        item["guild_membership"] = data.get("Guild Membership") or ""
         item["last_login"] = self._parse_last_login(data.get("Last Login"))
         item["account_status"] = data.get("Account Status")
 
@@ -0,0 +1,96 @@
+"""Login fast lane: polls the `Last Login` row of bedmage-watched characters.
+
+Full profile scrapes come once per `CHARACTER_SCRAPE_INTERVAL_MINUTES`, but a
+bedmage reminder is only as accurate as the `last_login` it is scheduled
+from. This spider runs as one long crawl (`poll_logins` command) that re-polls
+the watched characters every round, paced by
+`apps.bedmages.services.login_poll_round`:
+
+* the crawl never ends between rounds, so Scrapy keeps its connection to the
+  site open instead of paying a TCP + TLS handshake per character;
+* requests are conditional (`If-None-Match` / `If-Modified-Since`) once the
+  site sent validators, so an unchanged page costs a 304 without a body;
+* `parse` pulls the one row out of the raw body with a regex instead of
+  building a selector tree of the whole page.
+"""
+
+import asyncio
+import re
+import time
+
+import scrapy
+from asgiref.sync import sync_to_async
+
+from scrapers.tibiantis_scrapers import django_apps
+from scrapers.tibiantis_scrapers.items import LoginItem
+from scrapers.tibiantis_scrapers.spiders.character_spider import (
+    BASE_URL,
+    character_url,
+    parse_last_login,
+)
+
+_LAST_LOGIN_ROW = re.compile(
+    rb"<td[^>]*>\s*Last Login:?\s*</td>\s*<td[^>]*>([^<]*)</td>", re.IGNORECASE
+)
+
+
+class LoginSpider(scrapy.Spider):
+    name = "login"
+    handle_httpstatus_list = [304]
+    custom_settings = {
+        "ITEM_PIPELINES": {"scrapers.tibiantis_scrapers.pipelines.LoginPipeline": 300},
+    }
+
+    def __init__(self, *args, rounds=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rounds to poll before closing; None polls until stopped.
+        self.rounds = int(rounds) if rounds else None
+        self.validators: dict[str, dict[str, str]] = {}
+        self.base_url = BASE_URL
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.base_url = crawler.settings.get("TIBIANTIS_BASE_URL", BASE_URL)
+        return spider
+
+    async def start(self):
+        services = django_apps.services("apps.bedmages.services")
+        done = 0
+        while self.rounds is None or done < self.rounds:
+            started = time.monotonic()
+            names, period = await sync_to_async(services.login_poll_round)()
+            for name in names:
+                yield self.login_request(name)
+            done += 1
+            if self.rounds is None or done < self.rounds:
+                await asyncio.sleep(max(period - (time.monotonic() - started), 0.0))
+
+    def login_request(self, name):
+        url = character_url(name, self.base_url)
+        return scrapy.Request(
+            url,
+            headers=self.validators.get(url, {}),
+            callback=self.parse,
+            cb_kwargs={"character": name},
+            dont_filter=True,  # the same URL every round
+        )
+
+    def parse(self, response, character):
+        if response.status == 304:
+            return  # not modified since the last round
+        self._remember_validators(response)
+        match = _LAST_LOGIN_ROW.search(response.body)
+        if match is None:
+            self.logger.warning(f"No Last Login row for {character}")
+            return
+        raw = match.group(1).decode(response.encoding, "replace").strip()
+        yield LoginItem(name=character, last_login=parse_last_login(raw))
+
+    def _remember_validators(self, response):
+        headers = {}
+        if etag := response.headers.get("ETag"):
+            headers["If-None-Match"] = etag.decode()
+        if modified := response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = modified.decode()
+        self.validators[response.url] = headers
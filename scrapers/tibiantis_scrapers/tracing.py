@@ -0,0 +1,44 @@
+"""Scrapy hooks for `config.tracing`: one span per download, robots.txt
+included, parented to the subprocess's crawl span. Each request carries the
+trace context in `meta["traceparent"]`."""
+
+import time
+
+from scrapy import signals
+
+from config import tracing
+
+DOWNLOAD_STARTED_AT = "trace_download_started_at"
+
+
+class TracingExtension:
+    @classmethod
+    def from_crawler(cls, crawler):
+        extension = cls()
+        crawler.signals.connect(
+            extension.request_reached_downloader,
+            signal=signals.request_reached_downloader,
+        )
+        crawler.signals.connect(
+            extension.response_downloaded, signal=signals.response_downloaded
+        )
+        return extension
+
+    def request_reached_downloader(self, request, spider):
+        context = tracing.current()
+        if context is not None:
+            request.meta["traceparent"] = context.traceparent
+        request.meta[DOWNLOAD_STARTED_AT] = time.time()
+
+    def response_downloaded(self, response, request, spider):
+        started_at = request.meta.get(DOWNLOAD_STARTED_AT)
+        if started_at is None:
+            return
+        robots = request.meta.get("dont_obey_robotstxt", False)
+        tracing.record(
+            "fetch robots.txt" if robots else "fetch",
+            started_at,
+            time.time(),
+            url=request.url,
+            status=response.status,
+        )
@@ -0,0 +1,37 @@
+"""Shared fixtures for the whole test suite."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from django.core.cache import cache
+
+from apps.accounts.auth import user_cache
+from apps.characters import cache as character_cache
+from apps.notifications import subscriptions
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Iterator[None]:
+    """Cache entries must not leak between tests (LocMem lives per process)."""
+    cache.clear()
+    character_cache.stats.reset()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_jwt_user_cache() -> Iterator[None]:
+    """The in-process JWT user cache outlives DB rollbacks between tests."""
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_subscription_index() -> Iterator[None]:
+    """The in-process subscription index outlives DB rollbacks between tests."""
+    subscriptions.clear()
+    yield
+    subscriptions.clear()
@@ -62,6 +62,7 @@ def test_scrape_watched_characters_full_flow_mixed_freshness(
         [sys.executable, "manage.py", "scrape_character", "Yhral"],
         timeout=60,
         check=False,
+        env=mock.ANY,
     )
 
     tester_last_scraped_after = Character.objects.get(pk=tester.pk).last_scraped_at
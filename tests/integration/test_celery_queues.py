@@ -0,0 +1,125 @@
+"""Celery queue routing and per-queue depth / wait-time metrics.
+
+Runs a real (in-thread, solo pool) worker against an in-memory broker, so
+publish → route → consume goes through the same signals as production. The
+broker is swapped in whatever `CELERY_BROKER_URL` says: the tests purge the
+queues and count every message in them.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from celery.contrib.testing.worker import start_worker
+from django.test import AsyncClient
+
+from apps.accounts.models import User
+from apps.characters.tasks import ping
+from config.celery import QUEUES, app
+from config.celery_metrics import WAIT_KEY, queue_depths, queue_stats
+from config.redis import get_redis
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+def _reconnect() -> None:
+    """Drop the app's pooled broker connections and result backend, so the
+    next use connects to what the environment says now."""
+    app._pool = None
+    app.amqp._producer_pool = None
+    app._backend_cache = None
+    vars(app._local).pop("backend", None)
+
+
+@pytest.fixture()
+def _memory_broker(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Use an in-memory broker and result backend; the environment variables
+    take precedence over Celery's settings, so they are what is overridden."""
+    monkeypatch.setenv("CELERY_BROKER_URL", "memory://")
+    monkeypatch.setenv("CELERY_RESULT_BACKEND", "cache+memory://")
+    monkeypatch.delenv("CELERY_BROKER_READ_URL", raising=False)
+    monkeypatch.delenv("CELERY_BROKER_WRITE_URL", raising=False)
+    _reconnect()
+    yield
+    monkeypatch.undo()
+    _reconnect()
+
+
+@pytest.fixture(autouse=True)
+def _empty_queues(_memory_broker: None) -> Iterator[None]:
+    """Drop messages other tests published (the memory broker is per process)
+    and wait samples left in Redis."""
+    keys = [WAIT_KEY.format(queue=queue) for queue in QUEUES]
+    app.control.purge()
+    get_redis().delete(*keys)
+    yield
+    get_redis().delete(*keys)
+
+
+def _route(name: str) -> dict[str, Any]:
+    return dict(app.amqp.router.route({}, name, (), {}))
+
+
+def test_tasks_are_routed_by_latency_class() -> None:
+    """Sweeps, ingestion and notifications each get their own queue."""
+    sweep = _route("apps.characters.tasks.scrape_watched_characters")
+    deaths = _route("apps.deaths.tasks.scrape_deaths")
+    reminder = _route("apps.notifications.tasks.send_reminder")
+    other = _route("apps.characters.tasks.ping")
+
+    assert sweep["queue"].name == "characters"
+    assert deaths["queue"].name == "deaths"
+    assert reminder["queue"].name == "notifications"
+    assert other["queue"].name == "default"
+    assert reminder["priority"] < deaths["priority"] < sweep["priority"]
+
+
+def test_depth_and_wait_time_are_reported_per_queue() -> None:
+    """Queued messages count towards depth; consumed ones leave a wait sample."""
+    results = [ping.apply_async() for _ in range(3)]
+
+    assert queue_depths()["default"] == 3
+
+    with start_worker(app, pool="solo", perform_ping_check=False):
+        assert [result.get(timeout=10) for result in results] == ["pong"] * 3
+
+    stats = {queue.name: queue for queue in queue_stats()}
+    default = stats["default"]
+    assert default.depth == 0
+    assert default.sampled == 3
+    assert default.wait_p50_ms is not None and default.wait_max_ms is not None
+    assert 0 <= default.wait_p50_ms <= default.wait_max_ms
+    assert stats["characters"].sampled == 0
+    assert stats["characters"].wait_p95_ms is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_queue_stats_query_is_staff_only() -> None:
+    """`celeryQueueStats` lists every queue for staff and refuses everyone else."""
+    staff = await sync_to_async(User.objects.create_user)(
+        username="admin",
+        email="admin@example.com",
+        password="KomplexHaslo!23",
+        is_staff=True,
+    )
+    query = json.dumps({"query": "{ celeryQueueStats { name depth sampled } }"})
+    anonymous = await AsyncClient().post(
+        GRAPHQL_URL, data=query, content_type="application/json"
+    )
+    client = AsyncClient()
+    await sync_to_async(client.force_login)(staff)
+    response = await client.post(
+        GRAPHQL_URL, data=query, content_type="application/json"
+    )
+
+    assert anonymous.json()["errors"][0]["message"] == "Staff only"
+    payload = response.json()
+    assert [queue["name"] for queue in payload["data"]["celeryQueueStats"]] == list(
+        QUEUES
+    )
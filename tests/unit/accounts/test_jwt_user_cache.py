@@ -0,0 +1,128 @@
+"""Tests for native async JWT auth and its in-process user cache."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpRequest
+from django.test import RequestFactory, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts import auth
+from apps.accounts.auth import UserCache, authenticate, user_cache
+from apps.accounts.models import User
+
+
+def _request(bearer: str | None) -> HttpRequest:
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {bearer}"} if bearer else {}
+    return RequestFactory().post("/graphql/", **headers)
+
+
+def _authenticate(bearer: str | None) -> User | None:
+    return async_to_sync(authenticate)(_request(bearer))
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+
+
+@pytest.mark.django_db
+def test_repeat_requests_skip_user_select(
+    user: User, django_assert_num_queries: Any
+) -> None:
+    """First request loads the user; later ones with the same token don't."""
+    token = str(AccessToken.for_user(user))
+
+    with django_assert_num_queries(1):
+        assert _authenticate(token) == user
+    with django_assert_num_queries(0):
+        cached = _authenticate(token)
+
+    assert cached == user
+    assert cached is not _authenticate(token)  # per-request copies
+
+
+@pytest.mark.django_db
+def test_no_header_is_anonymous_without_queries(
+    django_assert_num_queries: Any,
+) -> None:
+    """Anonymous traffic never touches the DB."""
+    with django_assert_num_queries(0):
+        assert _authenticate(None) is None
+
+
+@pytest.mark.django_db
+def test_save_invalidates_and_deactivation_is_enforced(user: User) -> None:
+    """Deactivating a user evicts the cached entry, so the next request fails."""
+    token = str(AccessToken.for_user(user))
+    _authenticate(token)
+
+    user.is_active = False
+    user.save()
+
+    assert len(user_cache) == 0
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(token)
+
+
+@pytest.mark.django_db
+def test_deleted_user_is_rejected(user: User) -> None:
+    """post_delete evicts too — a deleted account's token stops working."""
+    token = str(AccessToken.for_user(user))
+    _authenticate(token)
+
+    user.delete()
+
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(token)
+
+
+@pytest.mark.django_db
+def test_invalid_token_raises() -> None:
+    """Garbage tokens keep raising AuthenticationFailed (view maps it to anon)."""
+    with pytest.raises(AuthenticationFailed):
+        _authenticate("this.is.not.a.valid.jwt")
+
+
+@override_settings(JWT_USER_CACHE_SIZE=2)
+def test_cache_evicts_least_recently_used() -> None:
+    """Size bound drops the least recently used entry first."""
+    cache = UserCache()
+    users = [User(pk=i, username=f"u{i}") for i in range(3)]
+
+    cache.put(("0", None), users[0], cache.generation)
+    cache.put(("1", None), users[1], cache.generation)
+    cache.get(("0", None))
+    cache.put(("2", None), users[2], cache.generation)
+
+    assert cache.get(("1", None)) is None
+    assert cache.get(("0", None)) == users[0]
+    assert cache.get(("2", None)) == users[2]
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entries older than JWT_USER_CACHE_TTL are treated as misses."""
+    cache = UserCache()
+    now = 1_000.0
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now)
+    cache.put(("1", None), User(pk=1, username="u1"), cache.generation)
+
+    now += 61
+    assert cache.get(("1", None)) is None
+
+
+def test_put_after_concurrent_invalidation_is_dropped() -> None:
+    """A DB read that raced an invalidation must not repopulate stale data."""
+    cache = UserCache()
+    generation = cache.generation
+
+    cache.invalidate_user(1)
+    cache.put(("1", None), User(pk=1, username="u1"), generation)
+
+    assert len(cache) == 0
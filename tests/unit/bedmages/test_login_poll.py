@@ -0,0 +1,89 @@
+"""Tests for the login fast lane: `record_login` and the poll budget."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.test import override_settings
+
+from apps.accounts.models import User
+from apps.bedmages import reminders
+from apps.bedmages.models import BedmageWatch
+from apps.bedmages.services import login_poll_round, poll_period
+from apps.characters.models import Character
+from apps.characters.services import record_login
+from config.redis import get_redis
+
+
+@pytest.fixture(autouse=True)
+def _empty_queue() -> Iterator[None]:
+    get_redis().delete(reminders.DUE_KEY, reminders.WAKE_KEY)
+    yield
+    get_redis().delete(reminders.DUE_KEY, reminders.WAKE_KEY)
+
+
+def _ago(seconds: float) -> datetime:
+    return datetime.now(tz=timezone.utc) - timedelta(seconds=seconds)
+
+
+def _watch(name: str, last_login: datetime | None = None) -> Character:
+    user, _ = User.objects.get_or_create(username="yhral")
+    character = Character.objects.create(name=name, last_login=last_login)
+    BedmageWatch.objects.create(user=user, character=character)
+    return character
+
+
+@pytest.mark.django_db(transaction=True)
+def test_newer_login_is_stored_and_scheduled() -> None:
+    """A login newer than the stored one lands and queues its reminder;
+    the full-scrape bookkeeping is left alone."""
+    character = _watch("Yhral", last_login=_ago(3600))
+    scraped_at = character.last_scraped_at
+    login = _ago(60)
+
+    assert record_login("Yhral", login) is True
+
+    character.refresh_from_db()
+    assert character.last_login == login
+    assert character.last_scraped_at == scraped_at
+    assert get_redis().zscore(reminders.DUE_KEY, "Yhral") == reminders.due_at(login)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_same_or_older_login_is_ignored() -> None:
+    """The lane never moves a login backwards nor re-queues an unchanged one."""
+    login = _ago(60)
+    _watch("Yhral", last_login=login)
+    get_redis().delete(reminders.DUE_KEY)  # scheduled when the watch was added
+
+    assert record_login("Yhral", login) is False
+    assert record_login("Yhral", _ago(3600)) is False
+    assert record_login("Yhral", None) is False
+    assert get_redis().zscore(reminders.DUE_KEY, "Yhral") is None
+
+
+@override_settings(
+    LOGIN_POLL_SECONDS=120,
+    LOGIN_POLL_BUDGET_RATIO=1.0,
+    CHARACTER_SCRAPE_INTERVAL_MINUTES=60,
+)
+def test_poll_period_stretches_to_stay_within_the_budget() -> None:
+    """Rounds come every LOGIN_POLL_SECONDS unless that would outpace the
+    full-profile schedule's request rate."""
+    assert poll_period(0, 0) == 120
+    assert poll_period(10, 3600) == 120  # 1 req/s budget, 0.08 req/s used
+    assert poll_period(100, 1800) == 200  # 0.5 req/s budget
+
+
+@pytest.mark.django_db
+def test_round_polls_watched_characters_only() -> None:
+    """Unwatched characters are left to the full-profile schedule."""
+    _watch("Yhral")
+    _watch("Bubble")
+    Character.objects.create(name="Unwatched")
+
+    names, _ = login_poll_round()
+
+    assert names == ["Bubble", "Yhral"]
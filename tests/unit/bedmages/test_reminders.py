@@ -0,0 +1,142 @@
+"""Tests for the bedmage reminder queue and the `dispatch_reminders` command."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from apps.accounts.models import User
+from apps.bedmages import reminders
+from apps.bedmages.models import BedmageWatch
+from apps.bedmages.tasks import send_bedmage_reminder
+from apps.characters.models import Character
+from apps.characters.services import upsert_character
+from config.redis import get_redis
+
+
+DISPATCH = "apps.bedmages.management.commands.dispatch_reminders"
+REST = 100 * 60
+
+
+@pytest.fixture(autouse=True)
+def _empty_queue() -> Iterator[None]:
+    get_redis().delete(reminders.DUE_KEY, reminders.WAKE_KEY)
+    yield
+    get_redis().delete(reminders.DUE_KEY, reminders.WAKE_KEY)
+
+
+def _due(name: str) -> float | None:
+    return get_redis().zscore(reminders.DUE_KEY, name)  # type: ignore[return-value]
+
+
+def _ago(seconds: float) -> datetime:
+    return datetime.now(tz=timezone.utc) - timedelta(seconds=seconds)
+
+
+def _watch(name: str, last_login: datetime | None = None) -> BedmageWatch:
+    user, _ = User.objects.get_or_create(username="yhral")
+    character = Character.objects.create(name=name, last_login=last_login)
+    return BedmageWatch.objects.create(user=user, character=character)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_new_login_of_watched_character_is_scheduled_100_minutes_later() -> None:
+    """Only a changed `last_login` of a watched character enters the queue."""
+    _watch("Yhral")
+    login = _ago(60)
+
+    upsert_character({"name": "Yhral", "last_login": login})
+    upsert_character({"name": "Unwatched", "last_login": login})
+
+    assert _due("Yhral") == login.timestamp() + REST
+    assert _due("Unwatched") is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unchanged_login_does_not_reschedule() -> None:
+    """Re-scraping the same login leaves a claimed entry alone."""
+    login = _ago(60)
+    _watch("Yhral", last_login=login)
+    get_redis().zadd(reminders.DUE_KEY, {"Yhral": 42})
+
+    upsert_character({"name": "Yhral", "last_login": login, "level": 50})
+
+    assert _due("Yhral") == 42
+
+
+def test_an_earlier_reminder_wakes_the_dispatcher() -> None:
+    """A sleeping dispatcher is woken when a reminder lands ahead of the head."""
+    login = _ago(REST - 3600)
+    reminders.schedule("Later", login, now=time.time())
+    assert reminders.wait(0.05) is True  # the first entry is the head too
+
+    woke: list[bool] = []
+    waiter = threading.Thread(target=lambda: woke.append(reminders.wait(5)))
+    waiter.start()
+    started = time.monotonic()
+    reminders.schedule("Sooner", _ago(REST - 60), now=time.time())
+    waiter.join()
+
+    assert woke == [True]
+    assert time.monotonic() - started < 1
+    reminders.schedule("Even later", _ago(REST - 7200), now=time.time())
+    assert reminders.wait(0.05) is False
+
+
+def test_ack_keeps_entries_rescheduled_after_the_claim() -> None:
+    """A newer login arriving while its old reminder is in flight survives."""
+    now = time.time()
+    get_redis().zadd(reminders.DUE_KEY, {"Fired": now - 1, "Relogged": now - 1})
+
+    names, lease = reminders.claim_due(now, limit=10)
+    reminders.schedule("Relogged", _ago(REST - 600), now=now)
+
+    assert sorted(names) == ["Fired", "Relogged"]
+    assert reminders.ack(names, lease) == 1
+    assert _due("Fired") is None
+    assert _due("Relogged") is not None
+
+
+@pytest.mark.django_db
+def test_reminder_reaches_each_watcher_once_per_login() -> None:
+    """Firing twice for the same login reminds nobody the second time."""
+    login = _ago(REST + 5)
+    watch = _watch("Yhral", last_login=login)
+
+    assert send_bedmage_reminder("Yhral") == 1
+    assert send_bedmage_reminder("Yhral") == 0
+
+    watch.refresh_from_db()
+    assert watch.reminded_login == login
+
+
+@pytest.mark.django_db
+def test_reminder_for_a_login_not_yet_rested_is_a_noop() -> None:
+    """A reminder overtaken by a newer login does not fire early."""
+    _watch("Yhral", last_login=_ago(60))
+
+    assert send_bedmage_reminder("Yhral") == 0
+
+
+@pytest.mark.django_db
+@mock.patch(f"{DISPATCH}.send_bedmage_reminder")
+def test_dispatcher_reseeds_lost_reminders_and_queues_the_due_ones(
+    mock_send: mock.MagicMock,
+) -> None:
+    """After a Redis loss, recent logins are re-queued; long-missed ones are not."""
+    _watch("Due", last_login=_ago(REST + 60))
+    _watch("Resting", last_login=_ago(60))
+    _watch("Missed", last_login=_ago(REST + reminders.MISSED_GRACE + 60))
+
+    call_command("dispatch_reminders", "--once")
+
+    mock_send.delay.assert_called_once_with("Due")
+    assert _due("Due") is None
+    assert _due("Resting") is not None
+    assert _due("Missed") is None
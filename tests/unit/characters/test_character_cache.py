@@ -0,0 +1,127 @@
+"""Tests for the read-through character cache and its write-through refresh."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from apps.characters import cache as character_cache
+from apps.characters.loaders import load_characters
+from apps.characters.models import Character
+from apps.characters.services import upsert_character
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+def _load(*keys: str) -> list[Character | None]:
+    return async_to_sync(load_characters)(list(keys))
+
+
+@pytest.mark.django_db
+def test_repeated_read_is_served_from_cache(django_assert_num_queries: Any) -> None:
+    """First read fills the cache; the second never reaches Postgres."""
+    Character.objects.create(name="Yhral", level=124)
+
+    with django_assert_num_queries(1):
+        _load("yhral")
+    with django_assert_num_queries(0):
+        (character,) = _load("yhral")
+
+    assert character is not None
+    assert character.name == "Yhral"
+    assert character.level == 124
+    assert character.pk is not None
+    assert (character_cache.stats.hits, character_cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.django_db
+def test_unknown_name_is_negatively_cached(django_assert_num_queries: Any) -> None:
+    """Lookups of missing characters are cached too — no repeated DB probes."""
+    with django_assert_num_queries(1):
+        assert _load("ghost") == [None]
+    with django_assert_num_queries(0):
+        assert _load("ghost") == [None]
+
+
+@pytest.mark.django_db
+def test_upsert_refreshes_cached_row(
+    django_assert_num_queries: Any, django_capture_on_commit_callbacks: Any
+) -> None:
+    """A completed scrape overwrites the entry — readers see it without a DB hit."""
+    Character.objects.create(name="Yhral", level=124)
+    _load("yhral")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upsert_character({"name": "Yhral", "level": 125})
+
+    with django_assert_num_queries(0):
+        (character,) = _load("yhral")
+    assert character is not None
+    assert character.level == 125
+
+
+@pytest.mark.django_db
+def test_upsert_replaces_negative_entry(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    """A character scraped for the first time is no longer reported missing."""
+    assert _load("new guy") == [None]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upsert_character({"name": "New Guy", "level": 8})
+
+    (character,) = _load("new guy")
+    assert character is not None
+    assert character.level == 8
+
+
+@pytest.mark.django_db
+def test_stale_reader_fill_cannot_overwrite_fresh_entry(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    """A reader that loaded the row before the scrape committed fills with
+    `add()`, so the write-through value survives."""
+    old = Character.objects.create(name="Yhral", level=124)
+    with django_capture_on_commit_callbacks(execute=True):
+        upsert_character({"name": "Yhral", "level": 125})
+
+    async_to_sync(character_cache.afill)({"yhral": old})
+
+    (character,) = _load("yhral")
+    assert character is not None
+    assert character.level == 125
+
+
+@pytest.mark.django_db
+def test_cache_outage_falls_back_to_database() -> None:
+    """Backend errors are logged and treated as misses, never raised."""
+    Character.objects.create(name="Yhral", level=124)
+
+    with patch.object(
+        character_cache.cache, "aget_many", side_effect=ConnectionError("down")
+    ):
+        (character,) = _load("yhral")
+
+    assert character is not None
+    assert character.level == 124
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cache_stats_require_staff() -> None:
+    """Counters are operational data — anonymous callers get an error."""
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": "{ characterCacheStats { hits misses hitRate } }"}),
+        content_type="application/json",
+    )
+
+    payload = response.json()
+    assert payload["data"] is None
+    assert payload["errors"][0]["message"] == "Staff only"
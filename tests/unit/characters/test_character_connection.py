@@ -0,0 +1,76 @@
+"""Tests for the keyset-paginated `allCharacters` connection."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+
+from apps.characters.models import Character
+from apps.characters.services import characters_by_level_after
+
+
+GRAPHQL_URL = "/graphql/"
+
+PAGE_QUERY = """
+query ($first: Int, $after: String) {
+  allCharacters(first: $first, after: $after) {
+    edges { node { name level } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+def _seed() -> None:
+    Character.objects.bulk_create(
+        [
+            Character(name="Low", level=8),
+            Character(name="TieA", level=100),
+            Character(name="TieB", level=100),
+            Character(name="Top", level=300),
+            Character(name="Unscraped"),
+        ]
+    )
+
+
+async def _page(**variables: Any) -> dict[str, Any]:
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": PAGE_QUERY, "variables": variables}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.content
+    payload = response.json()
+    assert "errors" not in payload, payload
+    return payload["data"]["allCharacters"]
+
+
+@pytest.mark.django_db
+def test_characters_by_level_after_skips_unscraped_and_breaks_ties() -> None:
+    """(level, id) keyset excludes NULL levels and orders ties by id desc."""
+    _seed()
+    tie_a, tie_b = Character.objects.filter(name__startswith="Tie").order_by("id")
+
+    names = [c.name for c in characters_by_level_after((tie_b.level or 0, tie_b.pk))]
+
+    assert names == ["TieA", "Low"]
+    assert tie_a.pk < tie_b.pk
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_all_characters_pages_by_level() -> None:
+    """Pages follow the default `-level` ordering and stop on the last row."""
+    await sync_to_async(_seed)()
+
+    first = await _page(first=2)
+    second = await _page(first=2, after=first["pageInfo"]["endCursor"])
+
+    assert [e["node"]["name"] for e in first["edges"]] == ["Top", "TieB"]
+    assert first["pageInfo"]["hasNextPage"] is True
+    assert [e["node"]["name"] for e in second["edges"]] == ["TieA", "Low"]
+    assert second["pageInfo"]["hasNextPage"] is False
@@ -0,0 +1,87 @@
+"""Tests for the per-request character DataLoader and `characters(names)` query.
+
+The point of the loader is query count: N aliased `character(...)` fields plus
+a `characters([...])` list in one operation must collapse into one SELECT.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory
+
+from apps.characters.loaders import load_characters
+from apps.characters.models import Character
+from apps.characters.services import BATCH_LOOKUP_MAX
+from config.context import GraphQLContext
+from config.schema import schema
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+def _execute(query: str) -> Any:
+    context = GraphQLContext(
+        request=RequestFactory().post(GRAPHQL_URL), response=HttpResponse()
+    )
+    return async_to_sync(schema.execute)(query, context_value=context)
+
+
+@pytest.mark.django_db
+def test_aliased_lookups_are_batched_into_one_query(
+    django_assert_num_queries: Any,
+) -> None:
+    """Three `character` aliases + a `characters` list → exactly one SELECT."""
+    Character.objects.create(name="Yhral", level=124)
+    Character.objects.create(name="Tester", level=300)
+
+    with django_assert_num_queries(1):
+        result = _execute(
+            '{ a: character(name: "Yhral") { level } '
+            'b: character(name: "tester") { level } '
+            'c: character(name: "Nobody") { level } '
+            'characters(names: ["YHRAL", "Ghost", "Tester"]) { name } }'
+        )
+
+    assert result.errors is None
+    assert result.data == {
+        "a": {"level": 124},
+        "b": {"level": 300},
+        "c": None,
+        "characters": [{"name": "Yhral"}, None, {"name": "Tester"}],
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_load_characters_aligns_results_with_keys() -> None:
+    """Batch fn returns one slot per key, in key order, None for misses."""
+    await sync_to_async(Character.objects.create)(name="Go Diego Go")
+
+    result = await load_characters(["missing", "go diego go"])
+
+    assert result[0] is None
+    assert result[1] is not None
+    assert result[1].name == "Go Diego Go"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_characters_query_rejects_oversized_batch() -> None:
+    """More than BATCH_LOOKUP_MAX names is a GraphQL error, not a huge IN list."""
+    names = json.dumps([f"Alt {i}" for i in range(BATCH_LOOKUP_MAX + 1)])
+
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": f"{{ characters(names: {names}) {{ name }} }}"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200, response.content
+    payload = response.json()
+    assert payload["data"] is None
+    assert "At most" in payload["errors"][0]["message"]
@@ -0,0 +1,118 @@
+"""Tests for normalized name lookup and `searchCharacters` (prefix + pg_trgm fuzzy)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+
+from apps.characters.models import Character
+from apps.characters.services import (
+    SEARCH_LIMIT_MAX,
+    find_characters_by_name,
+    normalize_character_name,
+    search_characters,
+)
+
+
+GRAPHQL_URL = "/graphql/"
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("Go Diego Go", "go diego go"),
+        ("go diego go", "go diego go"),
+        ("  Go   Diego\tGo ", "go diego go"),
+        ("", ""),
+    ],
+)
+def test_normalize_character_name(raw: str, expected: str) -> None:
+    """Casing and whitespace runs are folded the same way SQL LOWER() would."""
+    assert normalize_character_name(raw) == expected
+
+
+@pytest.mark.django_db
+def test_find_by_name_ignores_case_and_spacing() -> None:
+    """Inconsistently typed name resolves to the stored character."""
+    Character.objects.create(name="Go Diego Go", level=50)
+
+    character = find_characters_by_name("go  diego GO").first()
+
+    assert character is not None
+    assert character.name == "Go Diego Go"
+
+
+@pytest.mark.django_db
+def test_prefix_search_ranks_exact_match_first() -> None:
+    """Shorter names lead, so the exact match is always the first result."""
+    Character.objects.create(name="Yhral the Second", level=200)
+    Character.objects.create(name="Yhral", level=10)
+    Character.objects.create(name="Yhralik", level=100)
+    Character.objects.create(name="Tester", level=300)
+
+    names = [c.name for c in search_characters("yhral")]
+
+    assert names == ["Yhral", "Yhralik", "Yhral the Second"]
+
+
+@pytest.mark.django_db
+def test_fuzzy_search_tolerates_typos() -> None:
+    """pg_trgm similarity finds the character despite a misspelled query."""
+    Character.objects.create(name="Go Diego Go", level=50)
+    Character.objects.create(name="Tester", level=300)
+
+    names = [c.name for c in search_characters("go diego goo", fuzzy=True)]
+
+    assert names == ["Go Diego Go"]
+
+
+@pytest.mark.django_db
+def test_search_limit_is_capped() -> None:
+    """`limit` above the cap is clamped — no runaway result sets."""
+    Character.objects.bulk_create(
+        Character(name=f"Alt {i:03d}") for i in range(SEARCH_LIMIT_MAX + 10)
+    )
+
+    assert len(search_characters("alt", limit=10_000)) == SEARCH_LIMIT_MAX
+
+
+@pytest.mark.django_db
+def test_blank_query_returns_nothing() -> None:
+    """Whitespace-only query must not degrade into "match everything"."""
+    Character.objects.create(name="Yhral")
+
+    assert list(search_characters("   ")) == []
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_graphql_character_and_search_use_normalized_name() -> None:
+    """`character(name)` tolerates casing; `searchCharacters` returns ranked hits."""
+    await sync_to_async(Character.objects.create)(name="Go Diego Go", level=50)
+    await sync_to_async(Character.objects.create)(name="Go Diego", level=70)
+    await sync_to_async(Character.objects.create)(name="Yhral", level=124)
+
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps(
+            {
+                "query": '{ character(name: "go diego go") { name } '
+                'searchCharacters(query: "GO DIEGO") { name } '
+                'fuzzy: searchCharacters(query: "yhrall", mode: FUZZY, limit: 1) '
+                "{ name } }"
+            }
+        ),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200, response.content
+    payload = response.json()
+    assert "errors" not in payload, payload
+    assert payload["data"] == {
+        "character": {"name": "Go Diego Go"},
+        "searchCharacters": [{"name": "Go Diego"}, {"name": "Go Diego Go"}],
+        "fuzzy": [{"name": "Yhral"}],
+    }
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from typing import Any
 from unittest.mock import patch
 
 import pytest
@@ -66,20 +67,22 @@ def test_upsert_retries_after_race_integrity_error(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Simulates the race: a concurrent scrape inserts the row between our
-    SELECT and INSERT, so update_or_create raises IntegrityError. The retry
+    SELECT and INSERT, so the INSERT raises IntegrityError. The retry
     must find the row and UPDATE it in place — not re-raise, not duplicate."""
     Character.objects.create(name="Yhral", level=40, vocation="Knight")
 
-    real_update_or_create = Character.objects.update_or_create
+    real_select_for_update = Character.objects.select_for_update
     calls: list[int] = []
 
-    def flaky_update_or_create(*args: object, **kwargs: object) -> object:
+    def racing_select_for_update(*args: object, **kwargs: object) -> object:
         calls.append(1)
         if len(calls) == 1:
-            raise IntegrityError("duplicate key value violates unique constraint")
-        return real_update_or_create(*args, **kwargs)
+            return Character.objects.none()  # the winner hasn't committed yet
+        return real_select_for_update(*args, **kwargs)
 
-    monkeypatch.setattr(Character.objects, "update_or_create", flaky_update_or_create)
+    monkeypatch.setattr(
+        Character.objects, "select_for_update", racing_select_for_update
+    )
 
     character = upsert_character({"name": "Yhral", "level": 41, "vocation": "Paladin"})
 
@@ -95,10 +98,24 @@ def test_upsert_propagates_integrity_error_after_single_retry() -> None:
     """If IntegrityError persists on the retry (unlikely in practice — would
     require someone deleting the row between attempts), propagate instead of
     looping forever."""
-    with patch.object(Character.objects, "update_or_create") as mock_uoc:
-        mock_uoc.side_effect = IntegrityError("persistent")
+    with patch.object(Character.objects, "create") as mock_create:
+        mock_create.side_effect = IntegrityError("persistent")
 
         with pytest.raises(IntegrityError):
             upsert_character({"name": "Yhral", "level": 41})
 
-        assert mock_uoc.call_count == 2
+        assert mock_create.call_count == 2
+
+
+@pytest.mark.django_db
+def test_upsert_of_a_stored_character_reads_its_row_once(
+    django_assert_num_queries: Any,
+) -> None:
+    """The previous values come from the locked row the update writes: a
+    savepoint, SELECT … FOR UPDATE and UPDATE, no separate read."""
+    Character.objects.create(name="Yhral", level=40, vocation="Knight")
+
+    with django_assert_num_queries(4) as captured:
+        upsert_character({"name": "Yhral", "level": 41, "vocation": "Knight"})
+
+    assert "FOR UPDATE" in captured.captured_queries[1]["sql"]
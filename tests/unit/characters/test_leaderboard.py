@@ -0,0 +1,177 @@
+"""Tests for the materialized leaderboard view and its GraphQL fields."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+
+from apps.characters.models import Character, LeaderboardEntry
+from apps.characters.services import leaderboard_after, refresh_leaderboard
+from apps.characters.tasks import scrape_watched_characters
+
+
+GRAPHQL_URL = "/graphql/"
+
+LEADERBOARD_QUERY = """
+query ($world: String, $vocation: String, $first: Int, $after: String) {
+  leaderboard(world: $world, vocation: $vocation, first: $first, after: $after) {
+    edges { node { rank level character { name } } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+def _seed() -> None:
+    Character.objects.bulk_create(
+        [
+            Character(name="Top", level=300, world="Tibiantis", vocation="Knight"),
+            Character(name="TieA", level=100, world="Tibiantis", vocation="Sorcerer"),
+            Character(name="TieB", level=100, world="Other", vocation="Knight"),
+            Character(name="Low", level=8, world="Tibiantis", vocation="Knight"),
+            Character(name="Unscraped", world="Tibiantis"),
+        ]
+    )
+    refresh_leaderboard()
+
+
+async def _execute(query: str, **variables: Any) -> dict[str, Any]:
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": query, "variables": variables}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.content
+    payload = response.json()
+    assert "errors" not in payload, payload
+    return payload
+
+
+async def _post(query: str, **variables: Any) -> dict[str, Any]:
+    return (await _execute(query, **variables))["data"]
+
+
+@pytest.mark.django_db
+def test_refresh_ranks_ties_and_skips_unscraped() -> None:
+    """RANK() semantics: ties share a rank, the next rank skips; NULL levels
+    are left out; per-scope ranks restart in each partition."""
+    _seed()
+
+    entries = {
+        e.character.name: e
+        for e in LeaderboardEntry.objects.select_related("character")
+    }
+
+    assert {name: e.rank for name, e in entries.items()} == {
+        "Top": 1,
+        "TieA": 2,
+        "TieB": 2,
+        "Low": 4,
+    }
+    assert entries["Low"].world_rank == 3
+    assert entries["Low"].vocation_rank == 3
+    assert entries["Low"].world_vocation_rank == 2
+    assert entries["TieB"].world_rank == 1
+
+
+@pytest.mark.django_db
+def test_leaderboard_is_a_snapshot_until_refreshed() -> None:
+    """Level changes show up only after the next refresh."""
+    _seed()
+    Character.objects.filter(name="Low").update(level=500)
+
+    assert LeaderboardEntry.objects.get(character__name="Low").rank == 4
+
+    refresh_leaderboard()
+
+    assert LeaderboardEntry.objects.get(character__name="Low").rank == 1
+
+
+@pytest.mark.django_db
+def test_leaderboard_after_filters_scope_and_continues_past_ties() -> None:
+    """Scoped pages rank within the scope; the keyset breaks ties by id desc."""
+    _seed()
+    tie_a, tie_b = Character.objects.filter(name__startswith="Tie").order_by("id")
+
+    scoped = leaderboard_after(None, world="Tibiantis", vocation="Knight")
+    after_tie = leaderboard_after((100, tie_b.pk))
+
+    assert [(e.character.name, e.scope_rank) for e in scoped] == [
+        ("Top", 1),
+        ("Low", 2),
+    ]
+    assert [e.character.name for e in after_tie] == ["TieA", "Low"]
+    assert tie_a.pk < tie_b.pk
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_leaderboard_query_pages_with_scope_ranks() -> None:
+    """`leaderboard` walks the snapshot page by page within a world."""
+    await sync_to_async(_seed)()
+
+    first = (await _post(LEADERBOARD_QUERY, world="Tibiantis", first=2))["leaderboard"]
+    rest = (
+        await _post(
+            LEADERBOARD_QUERY,
+            world="Tibiantis",
+            first=2,
+            after=first["pageInfo"]["endCursor"],
+        )
+    )["leaderboard"]
+
+    rows = [
+        (edge["node"]["character"]["name"], edge["node"]["rank"])
+        for page in (first, rest)
+        for edge in page["edges"]
+    ]
+    assert rows == [("Top", 1), ("TieA", 2), ("Low", 3)]
+    assert first["pageInfo"]["hasNextPage"] is True
+    assert rest["pageInfo"]["hasNextPage"] is False
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_character_rank_is_batched() -> None:
+    """`rank` on many characters is one primary-key lookup, not one per node."""
+    await sync_to_async(_seed)()
+    query = """
+    { characters(names: ["Top", "TieB", "Low", "Unscraped"]) { name rank } }
+    """
+
+    with override_settings(DEBUG=True):
+        payload = await _execute(query)
+
+    assert {c["name"]: c["rank"] for c in payload["data"]["characters"]} == {
+        "Top": 1,
+        "TieB": 2,
+        "Low": 4,
+        "Unscraped": None,
+    }
+    rank = payload["extensions"]["timing"]["resolvers"]["CharacterType.rank"]
+    assert rank == {"calls": 4, "queries": 1, "ms": rank["ms"]}
+
+
+@pytest.mark.django_db
+@mock.patch("apps.characters.tasks.refresh_leaderboard.delay")
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_scrape_batch_queues_leaderboard_refresh(
+    mock_run: mock.MagicMock, mock_refresh: mock.MagicMock
+) -> None:
+    """A batch that scraped anything refreshes the snapshot; an idle one doesn't."""
+    Character.objects.create(name="Yhral", level=50)
+    scrape_watched_characters.apply().get()
+    mock_refresh.assert_not_called()
+
+    Character.objects.update(last_scraped_at=timezone.now() - timedelta(hours=2))
+    mock_run.return_value = subprocess.CompletedProcess(args=[], returncode=0)
+    scrape_watched_characters.apply().get()
+    mock_refresh.assert_called_once_with()
@@ -0,0 +1,213 @@
+"""Tests for the Redis due-time scrape schedule and the `dispatch_scrapes` command."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import redis
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import RequestFactory
+from pytest_django.fixtures import SettingsWrapper
+
+from apps.characters import schedule
+from apps.characters.models import Character
+from apps.characters.services import upsert_character
+from apps.characters.tasks import scrape_character
+from apps.scraping.services import SCRAPE_REPORT_ENV
+from config.redis import get_redis
+
+
+DISPATCH = "apps.characters.management.commands.dispatch_scrapes"
+HOUR = 3600
+NOW = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture(autouse=True)
+def _empty_schedule() -> Iterator[None]:
+    get_redis().delete(schedule.DUE_KEY)
+    yield
+    get_redis().delete(schedule.DUE_KEY)
+
+
+def _due(name: str) -> float | None:
+    return get_redis().zscore(schedule.DUE_KEY, name)  # type: ignore[return-value]
+
+
+def test_due_times_are_spread_over_the_interval() -> None:
+    """600 characters scraped together come due ~10 a minute, not all at once."""
+    names = [f"Char {i}" for i in range(600)]
+
+    per_minute = Counter(int(schedule.next_due(name, NOW) // 60) for name in names)
+
+    assert len(per_minute) == 60
+    assert max(per_minute.values()) <= 25
+
+
+def test_steady_state_is_one_interval_apart() -> None:
+    """Once in step, a character is due exactly one interval after its slot."""
+    first = schedule.next_due("Yhral", NOW)
+
+    # Scraped a few seconds after coming due.
+    assert schedule.next_due("Yhral", first + 7) == first + HOUR
+    assert NOW + HOUR / 2 <= first < NOW + 1.5 * HOUR
+
+
+def test_seed_spreads_new_and_overdue_characters_and_keeps_existing() -> None:
+    """Seeding never bursts: stale rows land within the next interval."""
+    get_redis().zadd(schedule.DUE_KEY, {"Scheduled": 42})
+    stale = datetime.fromtimestamp(NOW - 10 * HOUR, tz=timezone.utc)
+
+    added = schedule.seed(
+        [("Scheduled", None), ("New", None), ("Stale", stale)], now=NOW
+    )
+
+    assert added == 2
+    assert _due("Scheduled") == 42
+    for name in ("New", "Stale"):
+        due = _due(name)
+        assert due is not None and NOW <= due < NOW + HOUR
+
+
+def test_claim_leases_due_entries() -> None:
+    """Claimed names are held back for the lease, then come due again."""
+    get_redis().zadd(
+        schedule.DUE_KEY, {"Due A": NOW - 10, "Due B": NOW - 5, "Later": NOW + 60}
+    )
+
+    assert schedule.claim_due(NOW, limit=1) == ["Due A"]
+    assert schedule.claim_due(NOW, limit=10) == ["Due B"]
+    assert schedule.claim_due(NOW, limit=10) == []
+    assert schedule.next_wakeup() == NOW + 60
+    assert sorted(schedule.claim_due(NOW + schedule.CLAIM_LEASE, limit=10)) == [
+        "Due A",
+        "Due B",
+        "Later",
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_upsert_reschedules_after_commit() -> None:
+    """A stored scrape puts the character back one interval ahead."""
+    character = upsert_character({"name": "Yhral", "level": 45})
+
+    assert _due("Yhral") == schedule.next_due(
+        "Yhral", character.last_scraped_at.timestamp()
+    )
+
+
+@pytest.mark.django_db
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_scrape_of_deleted_character_is_dropped(mock_run: mock.MagicMock) -> None:
+    """A name deleted after it was scheduled is unscheduled, not re-created."""
+    get_redis().zadd(schedule.DUE_KEY, {"Gone": NOW})
+
+    assert scrape_character("Gone") is False
+    mock_run.assert_not_called()
+    assert _due("Gone") is None
+
+
+@pytest.mark.django_db
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_scrape_that_finds_nothing_waits_an_interval(mock_run: mock.MagicMock) -> None:
+    """A name the site no longer has is rescheduled at the normal interval,
+    not re-claimed every lease."""
+    Character.objects.create(name="Renamed")
+    claimed_at = time.time()
+    get_redis().zadd(schedule.DUE_KEY, {"Renamed": claimed_at + schedule.CLAIM_LEASE})
+
+    def finds_nothing(*args: Any, **kwargs: Any) -> Any:
+        report = {
+            "startup_ms": None,
+            "fetches": 1,
+            "bytes": 2048,
+            "items": 0,
+            "fetch_ms": 12.0,
+            "parse_ms": 1.0,
+            "db_ms": 0.0,
+            "outcomes": {},
+            "error_class": "",
+            "startup_profile": {},
+        }
+        Path(kwargs["env"][SCRAPE_REPORT_ENV]).write_text(json.dumps(report))
+        return subprocess.CompletedProcess(args=[], returncode=0)
+
+    mock_run.side_effect = finds_nothing
+
+    assert scrape_character("Renamed") is True
+
+    due = _due("Renamed")
+    assert due is not None and due >= claimed_at + HOUR / 2
+    assert due == schedule.next_due("Renamed", due - HOUR)
+
+
+@pytest.mark.django_db
+@mock.patch(f"{DISPATCH}.refresh_leaderboard")
+@mock.patch(f"{DISPATCH}.scrape_character")
+def test_dispatcher_queues_exactly_the_due_characters(
+    mock_scrape: mock.MagicMock, mock_refresh: mock.MagicMock
+) -> None:
+    """Seeds from the table, then queues one task per due name and no others."""
+    Character.objects.bulk_create([Character(name="Overdue"), Character(name="Later")])
+    get_redis().zadd(
+        schedule.DUE_KEY,
+        {"Overdue": time.time() - 1, "Later": time.time() + HOUR},
+    )
+
+    call_command("dispatch_scrapes", "--once")
+
+    mock_scrape.delay.assert_called_once_with("Overdue")
+    mock_refresh.apply_async.assert_called_once()
+    assert _due("Overdue") == pytest.approx(time.time() + schedule.CLAIM_LEASE, abs=5)
+
+
+def test_interval_follows_settings(settings: SettingsWrapper) -> None:
+    """`CHARACTER_SCRAPE_INTERVAL_MINUTES` sets the period."""
+    settings.CHARACTER_SCRAPE_INTERVAL_MINUTES = 10
+
+    first = schedule.next_due("Yhral", NOW)
+
+    assert schedule.next_due("Yhral", first) == first + 600
+
+
+def _admin_save(name: str) -> None:
+    model_admin = admin.site._registry[Character]
+    form = mock.Mock(changed_data=[])
+    model_admin.save_model(
+        RequestFactory().post("/admin/"), Character(name=name), form, change=False
+    )
+
+
+@pytest.mark.django_db
+def test_admin_schedules_a_new_character_after_commit(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    """A character added in the admin is scheduled once its save commits."""
+    with django_capture_on_commit_callbacks(execute=True):
+        _admin_save("Fresh")
+        assert _due("Fresh") is None
+
+    assert _due("Fresh") is not None
+
+
+@pytest.mark.django_db
+def test_admin_save_survives_a_redis_outage(
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    """Scheduling is bookkeeping: Redis being down must not fail the save."""
+    with (
+        mock.patch.object(schedule, "seed", side_effect=redis.ConnectionError),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        _admin_save("Fresh")
+
+    assert Character.objects.filter(name="Fresh").exists()
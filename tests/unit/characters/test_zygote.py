@@ -0,0 +1,127 @@
+"""Tests for the pre-forked scrape zygote (apps.characters.zygote)."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from apps.characters import zygote
+from apps.scraping import startup
+
+OUT_ENV = "ZYGOTE_TEST_OUT"
+
+
+def _job(name: str) -> int:
+    """Stands in for `zygote.crawl` in the served children."""
+    Path(os.environ[OUT_ENV]).write_text(
+        json.dumps(
+            {
+                "pid": os.getpid(),
+                "profile": startup.profile,
+                "preloaded": "scrapy.crawler" in sys.modules,
+            }
+        )
+    )
+    if name == "hang":
+        time.sleep(60)
+    if name == "nap":
+        time.sleep(1)
+    return 3 if name == "fail" else 0
+
+
+@pytest.fixture(scope="module")
+def zygote_path(tmp_path_factory: pytest.TempPathFactory) -> Iterator[str]:
+    path = str(tmp_path_factory.mktemp("zygote") / "z.sock")
+    # A fresh interpreter, like `manage.py scrape_zygote`: no test database
+    # connections or threads to fork.
+    server = multiprocessing.get_context("spawn").Process(
+        target=zygote.serve, args=(path, _job)
+    )
+    server.start()
+    deadline = time.monotonic() + 60
+    while not os.path.exists(path):
+        assert server.is_alive() and time.monotonic() < deadline
+        time.sleep(0.05)
+    yield path
+    server.terminate()
+    server.join(10)
+
+
+def test_child_runs_the_job_preloaded_with_its_env(
+    zygote_path: str, tmp_path: Path
+) -> None:
+    """The child sees the job's environment and the zygote's imports, and its
+    exit code comes back; its startup profile starts at the fork."""
+    out = tmp_path / "out.json"
+
+    assert zygote.run(zygote_path, "Yhral", env={OUT_ENV: str(out)}, timeout=10) == 0
+    report = json.loads(out.read_text())
+    assert report["preloaded"]
+    assert list(report["profile"]) == ["zygote.fork"]
+    assert report["pid"] != os.getpid()
+
+    assert zygote.run(zygote_path, "fail", env={OUT_ENV: str(out)}, timeout=10) == 3
+
+
+def test_jobs_run_concurrently(zygote_path: str, tmp_path: Path) -> None:
+    """Each job gets its own child: four one-second jobs take about a second."""
+    codes: list[int] = []
+
+    def submit(n: int) -> None:
+        env = {OUT_ENV: str(tmp_path / f"{n}.json")}
+        codes.append(zygote.run(zygote_path, "nap", env=env, timeout=10))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert codes == [0, 0, 0, 0]
+    assert time.monotonic() - started < 3
+
+
+def test_timeout_kills_the_child(zygote_path: str, tmp_path: Path) -> None:
+    """A client that gives up raises like `subprocess.run`, and the zygote
+    kills and reaps the child it was waiting for."""
+    out = tmp_path / "out.json"
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        zygote.run(zygote_path, "hang", env={OUT_ENV: str(out)}, timeout=1)
+
+    pid = json.loads(out.read_text())["pid"]
+    deadline = time.monotonic() + 5
+    with pytest.raises(ProcessLookupError):
+        while time.monotonic() < deadline:
+            os.kill(pid, 0)
+            time.sleep(0.05)
+
+
+def test_task_spawns_a_subprocess_when_no_zygote_listens(tmp_path: Path) -> None:
+    """A configured but absent zygote degrades to the cold subprocess."""
+    from apps.characters.tasks import _spawn
+
+    missing = str(tmp_path / "missing.sock")
+    with pytest.raises(zygote.ZygoteUnavailable):
+        zygote.run(missing, "Yhral", env={}, timeout=1)
+
+    with (
+        mock.patch("apps.characters.tasks.subprocess.run") as run,
+        mock.patch("apps.characters.tasks.settings.SCRAPE_ZYGOTE_SOCKET", missing),
+    ):
+        run.return_value = subprocess.CompletedProcess(args=[], returncode=0)
+        assert _spawn("Yhral", {"X": "1"}) == 0
+
+    assert run.call_args.args[0][-2:] == ["scrape_character", "Yhral"]
+    assert run.call_args.kwargs["env"]["X"] == "1"
@@ -0,0 +1,255 @@
+"""Tests for the real-time `deathAdded` feed (save → Redis → websocket)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.deaths import broadcast
+from apps.deaths.broadcast import DeathBroadcaster, broadcaster
+from apps.deaths.models import DeathEvent
+from apps.deaths.services import save_death_event
+from apps.deaths.types import DeathPayload
+from config.asgi import application
+from config.redis import get_async_redis
+
+GRAPHQL_URL = "/graphql/"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+SUBSCRIPTION = """
+subscription ($minLevel: Int) {
+  deathAdded(minLevel: $minLevel) { characterName levelAtDeath killedBy diedAt }
+}
+"""
+
+
+def _payload(name: str = "Yhral", level: int = 45) -> DeathPayload:
+    return {
+        "character_name": name,
+        "level_at_death": level,
+        "killed_by": "a dragon lord",
+        "died_at": T0,
+    }
+
+
+def _event(level: int) -> DeathEvent:
+    return DeathEvent(
+        id=level, character_name=f"Char {level}", level_at_death=level, died_at=T0
+    )
+
+
+class _Socket(ApplicationCommunicator):
+    """Minimal graphql-transport-ws client over the ASGI app.
+
+    (channels.testing would pull in daphne just for its live-server helper.)
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            application,
+            {
+                "type": "websocket",
+                "path": GRAPHQL_URL,
+                "query_string": b"",
+                "headers": [],
+                "subprotocols": ["graphql-transport-ws"],
+            },
+        )
+
+    async def send_json(self, message: dict[str, Any]) -> None:
+        await self.send_input(
+            {"type": "websocket.receive", "text": json.dumps(message)}
+        )
+
+    async def receive_json(self, timeout: float = 5) -> dict[str, Any]:
+        output = await self.receive_output(timeout)
+        assert output["type"] == "websocket.send", output
+        message: dict[str, Any] = json.loads(output["text"])
+        return message
+
+    async def init(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Connect and send connection_init; returns the server's answer."""
+        await self.send_input({"type": "websocket.connect"})
+        assert (await self.receive_output(5))["type"] == "websocket.accept"
+        await self.send_json({"type": "connection_init", "payload": params})
+        answer: dict[str, Any] = await self.receive_output(5)
+        if answer["type"] == "websocket.send":
+            return dict(json.loads(answer["text"]))
+        return answer
+
+    async def subscribe(self, variables: dict[str, Any] | None = None) -> None:
+        await self.send_json(
+            {
+                "id": "1",
+                "type": "subscribe",
+                "payload": {"query": SUBSCRIPTION, "variables": variables or {}},
+            }
+        )
+
+
+@pytest.fixture
+async def _stop_listener() -> AsyncIterator[None]:
+    """The listener task belongs to the test's event loop; stop it with it."""
+    yield
+    await broadcaster.aclose()
+
+
+@pytest.mark.django_db
+def test_save_death_event_publishes_after_commit(
+    monkeypatch: pytest.MonkeyPatch, django_capture_on_commit_callbacks: Any
+) -> None:
+    """A new death is published once, and only when the transaction commits."""
+    published: list[DeathEvent] = []
+    monkeypatch.setattr(broadcast, "publish", published.append)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        event = save_death_event(_payload())
+        assert published == []
+
+    assert event is not None
+    assert len(callbacks) == 1
+    assert published == [event]
+
+
+@pytest.mark.django_db
+def test_save_death_event_ignores_duplicates(
+    monkeypatch: pytest.MonkeyPatch, django_capture_on_commit_callbacks: Any
+) -> None:
+    """Re-scraping the same death inserts nothing and publishes nothing."""
+    published: list[DeathEvent] = []
+    monkeypatch.setattr(broadcast, "publish", published.append)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = save_death_event(_payload())
+        second = save_death_event(_payload())
+
+    assert first is not None
+    assert second is None
+    assert DeathEvent.objects.count() == 1
+    assert published == [first]
+
+
+def test_message_round_trip() -> None:
+    """Subscribers get the full row from the message — no DB read needed."""
+    event = _event(77)
+    event.killed_by = "Ferumbras"
+
+    restored = broadcast.deserialize(broadcast.serialize(event))
+
+    assert restored.pk == 77
+    assert restored.character_name == "Char 77"
+    assert restored.killed_by == "Ferumbras"
+    assert restored.died_at == T0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_filters_by_subscriber_level() -> None:
+    """Each subscriber only receives deaths at or above its own minLevel."""
+    feed = DeathBroadcaster()
+    async with feed.subscribe(20) as low, feed.subscribe(100) as high:
+        assert feed.subscriber_count == 2
+        assert feed.dispatch(_event(50)) == 1
+        assert feed.dispatch(_event(150)) == 2
+
+        assert [low.get_nowait().level_at_death for _ in range(2)] == [50, 150]
+        assert high.get_nowait().level_at_death == 150
+        assert high.empty()
+    await feed.aclose()
+
+    assert feed.subscriber_count == 0
+
+
+@override_settings(DEATH_FEED_QUEUE_SIZE=2)
+@pytest.mark.asyncio
+async def test_slow_subscriber_loses_oldest_events() -> None:
+    """A full queue drops its oldest event rather than growing or blocking."""
+    feed = DeathBroadcaster()
+    async with feed.subscribe(0) as queue:
+        for level in (1, 2, 3):
+            feed.dispatch(_event(level))
+
+        assert feed.dropped == 1
+        assert [queue.get_nowait().level_at_death for _ in range(2)] == [2, 3]
+    await feed.aclose()
+
+
+async def _wait_for_redis_subscriber() -> None:
+    client = get_async_redis()
+    async with client:
+        for _ in range(100):
+            [(_, count)] = await client.pubsub_numsub(broadcast.CHANNEL)
+            if count:
+                return
+            await asyncio.sleep(0.05)
+    raise AssertionError("Broadcaster never subscribed to Redis")
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_subscription_delivers_saved_death(_stop_listener: None) -> None:
+    """End to end: save_death_event → Redis → broadcaster → websocket."""
+    user = await sync_to_async(User.objects.create_user)(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+    token = await sync_to_async(lambda: str(AccessToken.for_user(user)))()
+
+    ws = _Socket()
+    assert await ws.init({"Authorization": f"Bearer {token}"}) == {
+        "type": "connection_ack"
+    }
+    await ws.subscribe({"minLevel": 40})
+    await _wait_for_redis_subscriber()
+
+    await sync_to_async(save_death_event)(_payload("Below Threshold", 39))
+    await sync_to_async(save_death_event)(_payload("Yhral", 45))
+    message = await ws.receive_json()
+    await ws.send_input({"type": "websocket.disconnect", "code": 1000})
+    await ws.wait(timeout=5)
+
+    assert message["type"] == "next"
+    assert message["payload"] == {
+        "data": {
+            "deathAdded": {
+                "characterName": "Yhral",
+                "levelAtDeath": 45,
+                "killedBy": "a dragon lord",
+                "diedAt": T0.isoformat(),
+            }
+        }
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_subscription_requires_authentication() -> None:
+    """Anonymous sockets may connect, but deathAdded itself needs a JWT."""
+    ws = _Socket()
+    assert await ws.init({}) == {"type": "connection_ack"}
+    await ws.subscribe()
+    message = await ws.receive_json()
+    await ws.send_input({"type": "websocket.disconnect", "code": 1000})
+    await ws.wait(timeout=5)
+
+    assert message["type"] == "next"
+    assert message["payload"]["errors"][0]["message"] == "Authentication required"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_invalid_token_rejects_connection() -> None:
+    """A bad token closes the socket at connection_init (4403)."""
+    ws = _Socket()
+
+    answer = await ws.init({"Authorization": "Bearer not-a-jwt"})
+
+    assert answer == {"type": "websocket.close", "code": 4403, "reason": "Forbidden"}
@@ -0,0 +1,187 @@
+"""Tests for the keyset-paginated `deaths` connection."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.models import User
+from apps.characters.models import Character
+from apps.deaths.models import DeathEvent
+from apps.deaths.services import deaths_after
+from config.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+
+GRAPHQL_URL = "/graphql/"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+PAGE_QUERY = """
+query ($first: Int, $after: String, $minLevel: Int) {
+  deaths(first: $first, after: $after, minLevel: $minLevel) {
+    edges { cursor node { characterName levelAtDeath character { level } } }
+    pageInfo { hasNextPage hasPreviousPage endCursor }
+  }
+}
+"""
+
+
+def _seed_deaths() -> None:
+    # Two deaths share a timestamp: the id tiebreaker must keep them apart.
+    DeathEvent.objects.bulk_create(
+        [
+            DeathEvent(character_name="Alpha", level_at_death=10, died_at=T0),
+            DeathEvent(character_name="Bravo", level_at_death=60, died_at=T0),
+            DeathEvent(
+                character_name="Charlie",
+                level_at_death=80,
+                died_at=T0 - timedelta(minutes=5),
+            ),
+            DeathEvent(
+                character_name="Delta",
+                level_at_death=30,
+                died_at=T0 - timedelta(minutes=10),
+            ),
+        ]
+    )
+
+
+async def _logged_in_client() -> AsyncClient:
+    user = await sync_to_async(User.objects.create_user)(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+    client = AsyncClient()
+    await sync_to_async(client.force_login)(user)
+    return client
+
+
+async def _page(client: AsyncClient, **variables: Any) -> dict[str, Any]:
+    response = await client.post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": PAGE_QUERY, "variables": variables}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+@pytest.mark.django_db
+def test_deaths_after_walks_ties_without_gaps_or_duplicates() -> None:
+    """Paging (died_at, id) visits every row once, even with equal died_at."""
+    _seed_deaths()
+    expected = list(DeathEvent.objects.order_by("-died_at", "-id"))
+
+    seen: list[DeathEvent] = []
+    position = None
+    while page := list(deaths_after(position)[:1]):
+        seen.extend(page)
+        position = (page[-1].died_at, page[-1].pk)
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_deaths_after_uses_range_predicate_not_offset() -> None:
+    """Deep pages are a keyset range scan — no OFFSET in the SQL."""
+    _seed_deaths()
+
+    with CaptureQueriesContext(connection) as ctx:
+        list(deaths_after((T0, 10_000))[:50])
+
+    sql = ctx.captured_queries[0]["sql"]
+    assert "OFFSET" not in sql
+    assert '"died_at" <=' in sql
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_deaths_connection_pages_through_feed() -> None:
+    """Two pages of size 2 cover the feed; the nested character is resolved."""
+    await sync_to_async(_seed_deaths)()
+    await sync_to_async(Character.objects.create)(name="Bravo", level=61)
+    client = await _logged_in_client()
+
+    first = await _page(client, first=2)
+    assert "errors" not in first, first
+    conn = first["data"]["deaths"]
+    assert [e["node"]["characterName"] for e in conn["edges"]] == ["Bravo", "Alpha"]
+    assert conn["edges"][0]["node"]["character"] == {"level": 61}
+    assert conn["edges"][1]["node"]["character"] is None
+    assert conn["pageInfo"]["hasNextPage"] is True
+    assert conn["pageInfo"]["hasPreviousPage"] is False
+
+    second = await _page(client, first=2, after=conn["pageInfo"]["endCursor"])
+    conn = second["data"]["deaths"]
+    assert [e["node"]["characterName"] for e in conn["edges"]] == ["Charlie", "Delta"]
+    assert conn["pageInfo"]["hasNextPage"] is False
+    assert conn["pageInfo"]["hasPreviousPage"] is True
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_deaths_connection_filters_by_min_level() -> None:
+    """`minLevel` drops low-level deaths from the feed."""
+    await sync_to_async(_seed_deaths)()
+    client = await _logged_in_client()
+
+    payload = await _page(client, minLevel=50)
+
+    names = [e["node"]["characterName"] for e in payload["data"]["deaths"]["edges"]]
+    assert names == ["Bravo", "Charlie"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_deaths_connection_requires_auth() -> None:
+    """Anonymous callers are rejected."""
+    payload = await _page(AsyncClient())
+
+    assert payload["data"] is None
+    assert payload["errors"][0]["message"] == "Authentication required"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "after", ["not-base64!", encode_cursor("character", 10, 1), encode_cursor("death")]
+)
+async def test_deaths_connection_rejects_bad_cursor(after: str) -> None:
+    """Garbage or another connection's cursor is an error, not a silent page 1."""
+    client = await _logged_in_client()
+
+    payload = await _page(client, after=after)
+
+    assert payload["errors"][0]["message"] == "Invalid cursor"
+
+
+def test_cursor_roundtrip_is_opaque() -> None:
+    """Cursors are URL-safe strings that decode back to the sort key."""
+    cursor = encode_cursor("death", T0.isoformat(), 42)
+
+    assert "/" not in cursor and "+" not in cursor
+    assert decode_cursor("death", cursor) == [T0.isoformat(), 42]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_page_size_is_capped() -> None:
+    """`first` above the cap returns at most MAX_PAGE_SIZE edges."""
+    await sync_to_async(DeathEvent.objects.bulk_create)(
+        DeathEvent(
+            character_name=f"Alt {i}",
+            level_at_death=10,
+            died_at=T0 - timedelta(seconds=i),
+        )
+        for i in range(MAX_PAGE_SIZE + 5)
+    )
+    client = await _logged_in_client()
+
+    payload = await _page(client, first=MAX_PAGE_SIZE * 10)
+
+    assert len(payload["data"]["deaths"]["edges"]) == MAX_PAGE_SIZE
@@ -0,0 +1,172 @@
+"""Tests for the streaming bulk exports (HTTP endpoint and `export_data`)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.characters.models import Character
+from apps.deaths.models import DeathEvent
+
+
+EXPORT_URL = "/api/exports/{dataset}/"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _seed() -> None:
+    DeathEvent.objects.bulk_create(
+        [
+            DeathEvent(
+                character_name=f"Char {i}",
+                level_at_death=10 * i,
+                killed_by="a dragon",
+                died_at=T0 + timedelta(hours=i),
+            )
+            for i in range(1, 8)
+        ]
+    )
+    Character.objects.bulk_create(
+        [Character(name="Yhral", level=45), Character(name="Nobody", level=None)]
+    )
+
+
+async def _auth_headers() -> dict[str, str]:
+    user = await sync_to_async(User.objects.create_user)(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+    token = await sync_to_async(lambda: str(AccessToken.for_user(user)))()
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _download(dataset: str, **params: Any) -> tuple[Any, bytes]:
+    headers = await _auth_headers()
+    response = await AsyncClient().get(
+        EXPORT_URL.format(dataset=dataset), params, headers=headers
+    )
+    if not response.streaming:
+        return response, response.content
+    body = b"".join([chunk async for chunk in response.streaming_content])
+    return response, body
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_export_requires_authentication() -> None:
+    """Anonymous requests are refused before any row is read."""
+    response = await AsyncClient().get(EXPORT_URL.format(dataset="deaths"))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_filtered_rows_in_small_chunks() -> None:
+    """Time range and min level filter rows; output arrives chunk by chunk."""
+    await sync_to_async(_seed)()
+
+    with override_settings(EXPORT_CHUNK_SIZE=2):
+        response, body = await _download(
+            "deaths",
+            since=(T0 + timedelta(hours=2)).isoformat(),
+            until=(T0 + timedelta(hours=7)).isoformat(),
+            min_level=40,
+        )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == 'attachment; filename="deaths.ndjson"'
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert [row["level_at_death"] for row in rows] == [40, 50, 60]
+    assert rows[0]["died_at"] == (T0 + timedelta(hours=4)).isoformat()
+    assert set(rows[0]) == {
+        "id",
+        "character_name",
+        "level_at_death",
+        "killed_by",
+        "died_at",
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_csv_export_has_header_and_blank_nulls() -> None:
+    """CSV starts with the column names; NULL levels come out empty."""
+    await sync_to_async(_seed)()
+
+    response, body = await _download("characters", format="csv")
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert {row["name"]: row["level"] for row in rows} == {"Yhral": "45", "Nobody": ""}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_parquet_export_round_trips() -> None:
+    """Parquet output (one row group per chunk) reads back with proper types."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    await sync_to_async(_seed)()
+
+    with override_settings(EXPORT_CHUNK_SIZE=3):
+        response, body = await _download("deaths", format="parquet")
+
+    assert response.status_code == 200
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    assert parquet.metadata.num_rows == 7
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("level_at_death").to_pylist() == [10, 20, 30, 40, 50, 60, 70]
+    assert table.column("died_at").to_pylist()[0] == T0 + timedelta(hours=1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_invalid_parameters_are_rejected() -> None:
+    """Bad formats, filters and datasets answer 400, not a broken stream."""
+    client = AsyncClient()
+    headers = await _auth_headers()
+
+    for url, params in [
+        (EXPORT_URL.format(dataset="deaths"), {"format": "xlsx"}),
+        (EXPORT_URL.format(dataset="deaths"), {"min_level": "high"}),
+        (EXPORT_URL.format(dataset="deaths"), {"since": "yesterday"}),
+        (EXPORT_URL.format(dataset="houses"), {}),
+    ]:
+        response = await client.get(url, params, headers=headers)
+        assert response.status_code == 400, (url, params)
+
+
+@pytest.mark.django_db
+def test_export_command_writes_file(tmp_path: Path) -> None:
+    """`export_data` streams the same encoding to a file."""
+    _seed()
+    output = tmp_path / "deaths.csv"
+
+    call_command(
+        "export_data",
+        "deaths",
+        "--format=csv",
+        "--since=2026-05-01T15:00",
+        f"--output={output}",
+    )
+
+    rows = list(csv.DictReader(output.open()))
+    assert [row["character_name"] for row in rows] == [f"Char {i}" for i in range(3, 8)]
+
+
+@pytest.mark.django_db
+def test_export_command_rejects_bad_filters() -> None:
+    """Bad filter values fail as a CommandError."""
+    with pytest.raises(CommandError, match="since"):
+        call_command("export_data", "deaths", "--since", "yesterday")
@@ -0,0 +1,120 @@
+"""Tests for persisted queries (allowlist + APQ) and the parsed-document cache."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.test import AsyncClient, override_settings
+
+from config import graphql_cache
+from config.persisted_queries import load_allowlist, query_hash
+
+
+GRAPHQL_URL = "/graphql/"
+QUERY = '{ character(name: "Yhral") { name } }'
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state() -> Iterator[None]:
+    load_allowlist.cache_clear()
+    graphql_cache.clear()
+    yield
+    load_allowlist.cache_clear()
+
+
+def _persisted(digest: str) -> dict[str, Any]:
+    return {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+
+
+async def _post(body: dict[str, Any]) -> dict[str, Any]:
+    response = await AsyncClient().post(
+        GRAPHQL_URL, data=json.dumps(body), content_type="application/json"
+    )
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def _error_code(payload: dict[str, Any]) -> str:
+    return payload["errors"][0]["extensions"]["code"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_apq_registers_then_serves_hash_only_requests() -> None:
+    """Unknown hash → NotFound; hash + query registers; hash alone then works."""
+    extensions = _persisted(query_hash(QUERY))
+
+    missing = await _post({"extensions": extensions})
+    assert _error_code(missing) == "PERSISTED_QUERY_NOT_FOUND"
+
+    registered = await _post({"query": QUERY, "extensions": extensions})
+    assert registered == {"data": {"character": None}}
+
+    by_hash = await _post({"extensions": extensions})
+    assert by_hash == {"data": {"character": None}}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_apq_rejects_hash_mismatch() -> None:
+    """A hash that doesn't match the query text is never stored."""
+    payload = await _post({"query": QUERY, "extensions": _persisted("0" * 64)})
+
+    assert _error_code(payload) == "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_persisted_only_mode_enforces_allowlist(tmp_path: Path) -> None:
+    """Allowlisted hashes resolve; ad-hoc queries and APQ registration are refused."""
+    allowlist = tmp_path / "persisted.json"
+    allowlist.write_text(json.dumps({query_hash(QUERY): QUERY}))
+    other = "{ me { username } }"
+
+    with override_settings(
+        GRAPHQL_PERSISTED_QUERIES_FILE=str(allowlist), GRAPHQL_PERSISTED_ONLY=True
+    ):
+        allowed = await _post({"extensions": _persisted(query_hash(QUERY))})
+        ad_hoc = await _post({"query": other})
+        apq = await _post({"query": other, "extensions": _persisted(query_hash(other))})
+
+    assert allowed == {"data": {"character": None}}
+    assert _error_code(ad_hoc) == "PERSISTED_QUERY_REQUIRED"
+    assert _error_code(apq) == "PERSISTED_QUERY_REQUIRED"
+
+
+def test_allowlist_with_wrong_hash_fails_loudly(tmp_path: Path) -> None:
+    """A typo'd allowlist entry is a startup error, not a silent miss."""
+    allowlist = tmp_path / "persisted.json"
+    allowlist.write_text(json.dumps({"0" * 64: QUERY}))
+
+    with override_settings(GRAPHQL_PERSISTED_QUERIES_FILE=str(allowlist)):
+        with pytest.raises(ValueError):
+            load_allowlist()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_repeated_query_hits_document_cache() -> None:
+    """Second execution of the same text reuses the parsed, validated document."""
+    await _post({"query": QUERY})
+    await _post({"query": QUERY})
+
+    assert (graphql_cache.stats.hits, graphql_cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_invalid_query_is_not_cached() -> None:
+    """Validation errors are reported every time and never enter the cache."""
+    bad = "{ character(name: 1) { nope } }"
+
+    first = await _post({"query": bad})
+    second = await _post({"query": bad})
+
+    assert first["errors"] and second["errors"]
+    assert graphql_cache.stats.hits == 0
@@ -0,0 +1,157 @@
+"""Tests for query cost limits and the per-resolver timing extension."""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, override_settings
+from graphql import parse
+
+from apps.accounts.models import User
+from apps.characters.models import Character
+from apps.deaths.models import DeathEvent
+from config.query_cost import operation_cost
+from config.schema import schema
+
+
+GRAPHQL_URL = "/graphql/"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+DEATHS_QUERY = """
+query ($first: Int) {
+  deaths(first: $first) {
+    edges { node { characterName character { level } } }
+  }
+}
+"""
+
+
+def _cost(query: str, **variables: Any) -> int:
+    return operation_cost(schema._schema, parse(query), variables=variables)
+
+
+async def _post(client: AsyncClient, query: str, **variables: Any) -> dict[str, Any]:
+    response = await client.post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": query, "variables": variables}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+async def _logged_in_client() -> AsyncClient:
+    user = await sync_to_async(User.objects.create_user)(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+    client = AsyncClient()
+    await sync_to_async(client.force_login)(user)
+    return client
+
+
+def _seed() -> None:
+    Character.objects.bulk_create(
+        [Character(name="Alpha", level=10), Character(name="Bravo", level=60)]
+    )
+    DeathEvent.objects.bulk_create(
+        [
+            DeathEvent(
+                character_name=name,
+                level_at_death=level,
+                died_at=T0 - timedelta(minutes=i),
+            )
+            for i, (name, level) in enumerate(
+                [("Alpha", 10), ("Bravo", 60), ("Alpha", 9)]
+            )
+        ]
+    )
+
+
+def test_cost_multiplies_nested_selections_by_page_size() -> None:
+    """deaths(first: N) costs 1 + N × (edges + node + character)."""
+    assert _cost(DEATHS_QUERY, first=200) == 1 + 200 * 3
+    assert _cost(DEATHS_QUERY) == 1 + 50 * 3
+    # `first` is clamped like the resolver clamps it.
+    assert _cost(DEATHS_QUERY, first=10_000) == 1 + 200 * 3
+
+
+def test_cost_follows_fragments_and_ignores_scalars() -> None:
+    """Fragment spreads are costed like inline selections; scalars are free."""
+    query = """
+    query { allCharacters(first: 20) { ...Page } }
+    fragment Page on CharacterTypeConnection {
+      edges { cursor node { name level } }
+      pageInfo { hasNextPage }
+    }
+    """
+    # allCharacters + 20 × (edges + node) + 20 × pageInfo
+    assert _cost(query) == 1 + 20 * (2 + 1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_over_budget_query_is_rejected_before_execution() -> None:
+    """The cost check runs before resolvers — even before the auth check."""
+    with override_settings(GRAPHQL_MAX_COST=100):
+        payload = await _post(AsyncClient(), DEATHS_QUERY, first=200)
+
+    assert payload["data"] is None
+    [error] = payload["errors"]
+    assert error["extensions"] == {
+        "code": "QUERY_TOO_COMPLEX",
+        "cost": 601,
+        "maxCost": 100,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_timing_reports_resolver_calls_and_queries() -> None:
+    """With DEBUG on, responses break down wall time and DB queries per resolver."""
+    await sync_to_async(_seed)()
+    client = await _logged_in_client()
+
+    with override_settings(DEBUG=True):
+        payload = await _post(client, DEATHS_QUERY, first=10)
+
+    assert "errors" not in payload, payload
+    timing = payload["extensions"]["timing"]
+    resolvers = timing["resolvers"]
+    assert resolvers["Query.deaths"]["calls"] == 1
+    assert resolvers["Query.deaths"]["queries"] >= 1
+    # Three nodes, one batched loader query.
+    assert resolvers["DeathEventType.character"]["calls"] == 3
+    assert resolvers["DeathEventType.character"]["queries"] == 1
+    assert timing["queries"] == sum(r["queries"] for r in resolvers.values())
+    assert "DeathEventType.characterName" not in resolvers
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_timing_is_not_exposed_without_debug() -> None:
+    """Production responses carry no timing extension."""
+    payload = await _post(AsyncClient(), '{ character(name: "Yhral") { name } }')
+
+    assert payload == {"data": {"character": None}}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_slow_operation_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Operations over the threshold log their heaviest resolvers."""
+    query = 'query Lookup { character(name: "Yhral") { name } }'
+
+    with (
+        override_settings(GRAPHQL_SLOW_OPERATION_MS=0),
+        caplog.at_level(logging.WARNING, logger="config.resolver_timing"),
+    ):
+        await _post(AsyncClient(), query)
+
+    [record] = caplog.records
+    assert "Slow GraphQL operation Lookup" in record.getMessage()
+    assert "Query.character" in record.getMessage()
@@ -0,0 +1,155 @@
+"""Tests for selection-driven column projection and joins (`config.optimizer`)."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+from unittest import mock
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db.backends.utils import CursorWrapper
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.characters.models import Character
+from apps.characters.services import refresh_leaderboard
+from apps.deaths.models import DeathEvent
+
+
+GRAPHQL_URL = "/graphql/"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+COLUMN = re.compile(r'"(\w+)"\."(\w+)"')
+
+
+def _seed() -> None:
+    Character.objects.bulk_create(
+        [
+            Character(name="Yhral", level=45, world="Tibiantis", residence="Thais"),
+            Character(name="Yhrael", level=30, world="Tibiantis", residence="Venore"),
+        ]
+    )
+    DeathEvent.objects.create(
+        character_name="Yhral", level_at_death=44, killed_by="a dragon", died_at=T0
+    )
+    refresh_leaderboard()
+
+
+@contextmanager
+def _captured_sql() -> Iterator[list[str]]:
+    """SQL run inside the block, on any thread's connection (each ASGI request
+    runs its ORM calls in a thread of its own)."""
+    statements: list[str] = []
+    execute = CursorWrapper.execute
+
+    def capture(self: CursorWrapper, sql: str, params: Any = None) -> Any:
+        statements.append(sql)
+        return execute(self, sql, params)
+
+    with mock.patch.object(CursorWrapper, "execute", capture):
+        yield statements
+
+
+def _selected(sql: str, table: str) -> set[str]:
+    """Columns of `table` in the statement's SELECT list."""
+    select_list = sql.split(" FROM ", 1)[0]
+    return {column for name, column in COLUMN.findall(select_list) if name == table}
+
+
+async def _post(
+    query: str, headers: dict[str, str] | None = None, **variables: Any
+) -> list[str]:
+    with _captured_sql() as statements:
+        response = await AsyncClient().post(
+            GRAPHQL_URL,
+            data=json.dumps({"query": query, "variables": variables}),
+            content_type="application/json",
+            headers=headers or {},
+        )
+    assert response.status_code == 200, response.content
+    payload = response.json()
+    assert "errors" not in payload, payload
+    return [sql for sql in statements if sql.lstrip().startswith("SELECT")]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_connection_selects_requested_columns_and_sort_key() -> None:
+    """`allCharacters` loads the node's fields plus the cursor's sort key."""
+    await sync_to_async(_seed)()
+
+    [sql] = await _post("{ allCharacters(first: 5) { edges { node { name } } } }")
+
+    assert _selected(sql, "characters_character") == {"id", "name", "level"}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_connection_without_nodes_selects_only_the_sort_key() -> None:
+    """Asking for `pageInfo` alone reads no payload columns."""
+    await sync_to_async(_seed)()
+
+    [sql] = await _post("{ allCharacters { pageInfo { hasNextPage } } }")
+
+    assert _selected(sql, "characters_character") == {"id", "level"}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_search_selects_requested_columns() -> None:
+    """List fields are projected too."""
+    await sync_to_async(_seed)()
+
+    [sql] = await _post('{ searchCharacters(query: "yh") { name world } }')
+
+    assert _selected(sql, "characters_character") == {"id", "name", "world"}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_leaderboard_joins_character_only_when_selected() -> None:
+    """The character relation becomes a single JOIN with its own projection."""
+    await sync_to_async(_seed)()
+    query = "{ leaderboard { edges { node { rank %s } } } }"
+
+    [joined] = await _post(query % "character { name }")
+    [plain] = await _post(query % "level")
+
+    assert _selected(joined, "characters_character") == {"id", "name"}
+    # `rank` is read through the `scope_rank` annotation.
+    assert _selected(joined, "characters_leaderboard") == {
+        "character_id",
+        "level",
+        "rank",
+    }
+    assert "characters_character" not in plain
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_field_hints_keep_columns_custom_resolvers_read() -> None:
+    """`DeathEventType.character` declares the column it resolves from."""
+    await sync_to_async(_seed)()
+    user = await sync_to_async(User.objects.create_user)(
+        username="yhral", email="yhral@example.com", password="KomplexHaslo!23"
+    )
+    token = await sync_to_async(lambda: str(AccessToken.for_user(user)))()
+
+    statements = await _post(
+        "{ deaths { edges { node { levelAtDeath character { name } } } } }",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    [sql] = [sql for sql in statements if '"deaths_deathevent"' in sql]
+    assert _selected(sql, "deaths_deathevent") == {
+        "id",
+        "level_at_death",
+        "character_name",
+        "died_at",
+    }
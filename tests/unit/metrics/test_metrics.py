@@ -0,0 +1,159 @@
+"""Tests for the Prometheus exporter (`config.metrics`, `/metrics`)."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+from django.test import AsyncClient, Client
+from prometheus_client import REGISTRY
+from pytest_django.fixtures import SettingsWrapper
+
+from apps.characters.services import upsert_character
+from apps.characters.tasks import _run_scrape
+from apps.deaths.services import save_death_event
+from config import metrics
+
+
+GRAPHQL_URL = "/graphql/"
+METRICS_URL = "/metrics"
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _items(kind: str, outcome: str) -> float:
+    return _sample("tibiantis_items_total", kind=kind, outcome=outcome)
+
+
+def test_metrics_endpoint_serves_text_format_with_queue_depth() -> None:
+    """`/metrics` answers in the exposition format, queue depth included."""
+    response = Client().get(METRICS_URL)
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=")
+    body = response.content.decode()
+    assert 'tibiantis_celery_queue_depth{queue="notifications"}' in body
+    assert "# TYPE tibiantis_scrape_fetch_seconds histogram" in body
+
+
+def test_metrics_endpoint_requires_token_when_configured(
+    settings: SettingsWrapper,
+) -> None:
+    """With `METRICS_BEARER_TOKEN` set, only the matching bearer gets in."""
+    settings.METRICS_BEARER_TOKEN = "s3cret"
+
+    assert Client().get(METRICS_URL).status_code == 401
+    assert (
+        Client().get(METRICS_URL, HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+    )
+    assert (
+        Client().get(METRICS_URL, HTTP_AUTHORIZATION="Bearer s3cret").status_code == 200
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_graphql_latency_is_recorded_per_operation() -> None:
+    """Each executed operation lands in the histogram under its name."""
+    before = _sample("tibiantis_graphql_operation_seconds_count", operation="Probe")
+
+    response = await AsyncClient().post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": "query Probe { __typename }"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert (
+        _sample("tibiantis_graphql_operation_seconds_count", operation="Probe")
+        == before + 1
+    )
+
+
+def test_operation_label_bounds_client_chosen_names() -> None:
+    """Unnamed, malformed and overflow names collapse into shared labels."""
+    assert metrics.operation_label(None) == "<anonymous>"
+    assert metrics.operation_label("Leaderboard") == "Leaderboard"
+    assert metrics.operation_label("x" * 100) == "<other>"
+
+    with mock.patch.object(metrics, "MAX_OPERATION_LABELS", 0):
+        assert metrics.operation_label("Leaderboard") == "Leaderboard"
+        assert metrics.operation_label("NeverSeenBefore") == "<other>"
+
+
+@pytest.mark.django_db
+def test_upsert_counts_changed_and_unchanged_scrapes() -> None:
+    """A scrape that changes nothing is `unchanged`; any new value is `scraped`."""
+    scraped = _items("character", "scraped")
+    unchanged = _items("character", "unchanged")
+
+    upsert_character({"name": "Yhral", "level": 45, "last_login": T0})
+    upsert_character({"name": "Yhral", "level": 45, "last_login": T0})
+    upsert_character({"name": "Yhral", "level": 46, "last_login": T0})
+
+    assert _items("character", "scraped") == scraped + 2
+    assert _items("character", "unchanged") == unchanged + 1
+
+
+@pytest.mark.django_db
+def test_repeated_death_counts_as_duplicate() -> None:
+    """The second ingestion of one death is a `duplicate`, not a new event."""
+    payload = {
+        "character_name": "Yhral",
+        "level_at_death": 45,
+        "killed_by": "a dragon lord",
+        "died_at": T0,
+    }
+    scraped = _items("death", "scraped")
+    duplicate = _items("death", "duplicate")
+
+    save_death_event(payload)  # type: ignore[arg-type]
+    save_death_event(payload)  # type: ignore[arg-type]
+
+    assert _items("death", "scraped") == scraped + 1
+    assert _items("death", "duplicate") == duplicate + 1
+
+
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_failed_scrape_is_counted_and_tagged_with_worker_id(
+    mock_run: mock.MagicMock,
+) -> None:
+    """A failing subprocess counts as `failed`; it writes metrics as its worker."""
+    mock_run.return_value = subprocess.CompletedProcess(args=[], returncode=1)
+    failed = _items("character", "failed")
+
+    assert _run_scrape("Yhral") is False
+
+    assert _items("character", "failed") == failed + 1
+    env = mock_run.call_args.kwargs["env"]
+    assert env[metrics.PROCESS_ID_ENV].startswith("scrape-")
+
+
+@mock.patch("config.metrics.push_to_gateway")
+def test_push_is_a_noop_without_gateway(mock_push: mock.MagicMock) -> None:
+    """Nothing is sent unless `METRICS_PUSHGATEWAY_URL` is configured."""
+    metrics.push("celery")
+
+    mock_push.assert_not_called()
+
+
+@mock.patch("config.metrics.push_to_gateway")
+def test_push_groups_by_process_and_swallows_errors(
+    mock_push: mock.MagicMock, settings: SettingsWrapper
+) -> None:
+    """Pushes are grouped per host:process; an unreachable gateway only logs."""
+    settings.METRICS_PUSHGATEWAY_URL = "pushgateway:9091"
+    mock_push.side_effect = OSError("connection refused")
+
+    metrics.push("celery")
+
+    (url,), kwargs = mock_push.call_args
+    assert url == "pushgateway:9091"
+    assert kwargs["job"] == "celery"
+    assert kwargs["grouping_key"]["instance"].count(":") == 1
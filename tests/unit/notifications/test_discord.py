@@ -0,0 +1,99 @@
+"""Tests for the Discord webhook dispatcher against the local fake server."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from apps.notifications.discord import MAX_EMBED_CHARS, WebhookDispatcher
+from apps.notifications.fake_discord import FakeDiscord
+
+
+@pytest_asyncio.fixture
+async def fake() -> AsyncIterator[FakeDiscord]:
+    async with FakeDiscord(limit=5, per=0.5) as server:
+        yield server
+
+
+def _embed(n: int, description: str = "") -> dict[str, str]:
+    return {"title": f"Death {n}", "description": description}
+
+
+@pytest.mark.asyncio
+async def test_burst_is_coalesced_into_full_messages(fake: FakeDiscord) -> None:
+    """25 embeds for one channel go out as 10 + 10 + 5, in order."""
+    async with WebhookDispatcher(coalesce=0.05) as dispatcher:
+        futures = [dispatcher.submit(fake.webhook_url(1), _embed(n)) for n in range(25)]
+        results = await asyncio.gather(*futures)
+
+    assert all(results)
+    assert [len(m.embeds) for m in fake.messages] == [10, 10, 5]
+    titles = [e["title"] for m in fake.messages for e in m.embeds]
+    assert titles == [f"Death {n}" for n in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_bucket_headers_keep_the_sender_under_the_limit(
+    fake: FakeDiscord,
+) -> None:
+    """One message per embed, 12 messages: the sender waits out the bucket
+    from the response headers instead of collecting 429s."""
+    started = time.monotonic()
+    async with WebhookDispatcher(coalesce=0, max_embeds=1) as dispatcher:
+        futures = [dispatcher.submit(fake.webhook_url(1), _embed(n)) for n in range(12)]
+        assert all(await asyncio.gather(*futures))
+
+    assert len(fake.messages) == 12
+    assert fake.rate_limited == 0
+    assert time.monotonic() - started >= 2 * fake.per  # three windows of five
+
+
+@pytest.mark.asyncio
+async def test_429_from_a_shared_limit_is_retried_after_retry_after() -> None:
+    """A global 429 pauses every channel, and the message is sent afterwards."""
+    async with FakeDiscord(global_limit=2) as server:
+        async with WebhookDispatcher(coalesce=0) as dispatcher:
+            futures = [
+                dispatcher.submit(server.webhook_url(channel), _embed(channel))
+                for channel in range(3)
+            ]
+            assert all(await asyncio.gather(*futures))
+
+    assert server.rate_limited >= 1
+    assert len(server.messages) == 3
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried_and_client_errors_are_not(
+    fake: FakeDiscord, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A 502 is retried; a 404 (deleted webhook) fails the embed at once."""
+    monkeypatch.setattr("apps.notifications.discord.RETRY_BACKOFF", 0.01)
+    fake.fail_next = [502, 502]
+    async with WebhookDispatcher(coalesce=0, max_retries=2) as dispatcher:
+        assert await dispatcher.submit(fake.webhook_url(1), _embed(1)) is True
+
+        fake.fail_next = [404]
+        assert await dispatcher.submit(fake.webhook_url(2), _embed(2)) is False
+
+    assert fake.fail_next == []
+    assert len(fake.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_messages_stay_within_the_embed_character_budget(
+    fake: FakeDiscord,
+) -> None:
+    """Large embeds are split across messages before Discord would reject them."""
+    big = "x" * (MAX_EMBED_CHARS // 3)
+    async with WebhookDispatcher(coalesce=0.05) as dispatcher:
+        futures = [
+            dispatcher.submit(fake.webhook_url(1), _embed(n, big)) for n in range(5)
+        ]
+        assert all(await asyncio.gather(*futures))
+
+    assert [len(m.embeds) for m in fake.messages] == [2, 2, 1]
@@ -0,0 +1,170 @@
+"""Tests for the notification outbox: transactional enqueue, SKIP LOCKED
+claims and settling against the fake Discord."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone as dj_timezone
+
+from apps.accounts.models import User
+from apps.bedmages.models import BedmageWatch
+from apps.bedmages.services import remind
+from apps.characters.models import Character
+from apps.deaths.services import save_death_event
+from apps.deaths.types import DeathPayload
+from apps.notifications import outbox
+from apps.notifications.discord import WebhookDispatcher
+from apps.notifications.fake_discord import FakeDiscord
+from apps.notifications.models import NotificationOutbox
+
+WEBHOOK = "http://discord.invalid/api/webhooks/1/token"
+Status = NotificationOutbox.Status
+
+
+@pytest.fixture(autouse=True)
+def _webhooks() -> Iterator[None]:
+    with override_settings(
+        DISCORD_DEATHS_WEBHOOK_URL=WEBHOOK,
+        DISCORD_BEDMAGE_WEBHOOK_URL=WEBHOOK,
+        DEATH_LEVEL_THRESHOLD=30,
+        OUTBOX_MAX_ATTEMPTS=2,
+    ):
+        yield
+
+
+def _death(name: str = "Yhral", level: int = 100) -> DeathPayload:
+    return {
+        "character_name": name,
+        "level_at_death": level,
+        "killed_by": "a dragon lord",
+        "died_at": datetime(2026, 4, 12, 21, 25, tzinfo=timezone.utc),
+    }
+
+
+def _queue(n: int, url: str = WEBHOOK) -> None:
+    for i in range(n):
+        outbox.enqueue("death", f"death:{i}", url, {"title": f"Death {i}"})
+
+
+@pytest.mark.django_db
+def test_new_death_is_queued_once_and_low_levels_not_at_all() -> None:
+    """A re-scraped death and one under the threshold add no rows."""
+    save_death_event(_death())
+    save_death_event(_death())
+    save_death_event(_death("Rookie", level=8))
+
+    row = NotificationOutbox.objects.get()
+    assert row.kind == NotificationOutbox.Kind.DEATH
+    assert row.embed["title"] == "Yhral died at level 100"
+    assert row.status == Status.PENDING
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_ingestion_leaves_no_message() -> None:
+    """The outbox row lives and dies with the death in one transaction."""
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            save_death_event(_death())
+            raise RuntimeError("scrape crashed after storing the death")
+
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bedmage_reminder_queues_one_message_per_watcher() -> None:
+    """Each watcher gets a message mentioning them, once per login."""
+    login = datetime.now(tz=timezone.utc) - timedelta(minutes=101)
+    character = Character.objects.create(name="Yhral", last_login=login)
+    for username, discord_id in [("a", "111"), ("b", None)]:
+        user = User.objects.create(
+            username=username, email=f"{username}@x.io", discord_id=discord_id
+        )
+        BedmageWatch.objects.create(user=user, character=character)
+
+    remind("Yhral", now=datetime.now(tz=timezone.utc))
+    remind("Yhral", now=datetime.now(tz=timezone.utc))
+
+    descriptions = sorted(
+        row.embed["description"]
+        for row in NotificationOutbox.objects.filter(kind="bedmage")
+    )
+    assert len(descriptions) == 2
+    assert descriptions[0].startswith("<@111>: 100 minutes")
+    assert descriptions[1].startswith("b: 100 minutes")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claims_skip_rows_locked_by_another_worker() -> None:
+    """A worker never waits on, nor takes, rows another one is claiming,
+    and a claimed row is leased away from the next claim."""
+    _queue(6)
+    locked = threading.Event()
+    release = threading.Event()
+
+    def other_worker() -> None:
+        with transaction.atomic():
+            list(
+                NotificationOutbox.objects.select_for_update()
+                .order_by("id")
+                .filter(key__in=["death:0", "death:1"])
+            )
+            locked.set()
+            release.wait(5)
+        connection.close()
+
+    thread = threading.Thread(target=other_worker)
+    thread.start()
+    locked.wait(5)
+    try:
+        first = outbox.claim(3)
+        second = outbox.claim(10)
+    finally:
+        release.set()
+        thread.join()
+
+    assert [row.key for row in first] == ["death:2", "death:3", "death:4"]
+    assert [row.key for row in second] == ["death:5"]
+    # Once unlocked, only the rows nobody leased are left.
+    assert [row.key for row in outbox.claim(10)] == ["death:0", "death:1"]
+    assert outbox.claim(10) == []
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_drain_marks_sent_and_retries_refused_until_failed() -> None:
+    """Accepted messages are marked sent; a refused one backs off, then is
+    marked failed after OUTBOX_MAX_ATTEMPTS."""
+    async with FakeDiscord(deleted={"gone"}) as fake:
+        await sync_to_async(_queue)(3, fake.webhook_url(1))
+        await sync_to_async(outbox.enqueue)(
+            "death", "gone", fake.webhook_url("gone"), {"title": "gone"}
+        )
+
+        async with WebhookDispatcher(coalesce=0.05) as dispatcher:
+            assert await outbox.drain_once(dispatcher, 10) == 4
+            first = await sync_to_async(_rows)()
+            await sync_to_async(NotificationOutbox.objects.filter(key="gone").update)(
+                available_at=dj_timezone.now()
+            )
+            assert await outbox.drain_once(dispatcher, 10) == 1
+
+    assert len(fake.messages) == 1  # the three embeds shared one message
+    assert [first[f"death:{i}"] for i in range(3)] == [(Status.SENT, 1)] * 3
+    assert first["gone"] == (Status.PENDING, 1)
+    assert (await sync_to_async(_rows)())["gone"] == (Status.FAILED, 2)
+
+
+def _rows() -> dict[str, tuple[str, int]]:
+    return {
+        key: (status, attempts)
+        for key, status, attempts in NotificationOutbox.objects.values_list(
+            "key", "status", "attempts"
+        )
+    }
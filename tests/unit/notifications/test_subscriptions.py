@@ -0,0 +1,111 @@
+"""Tests for the death subscription index and its refresh on change."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+import pytest
+from django.test import override_settings
+
+from apps.characters.models import Character
+from apps.deaths.services import save_death_event
+from apps.notifications import subscriptions
+from apps.notifications.models import DeathSubscription, NotificationOutbox
+from apps.notifications.subscriptions import SubscriptionIndex
+
+WORLDS = ["Concordia", "Tibiantis", ""]
+NAMES = ["Yhral", "Bubble", "Go Diego Go", ""]
+
+
+def _sub(
+    channel: str, min_level: int, world: str = "", character_name: str = ""
+) -> DeathSubscription:
+    return DeathSubscription(
+        guild_id="1",
+        channel_id=channel,
+        webhook_url=f"http://discord.invalid/api/webhooks/{channel}/t",
+        min_level=min_level,
+        world=world,
+        character_name=character_name,
+    )
+
+
+def _naive(
+    subs: list[DeathSubscription], level: int, name: str, world: str
+) -> set[str]:
+    return {
+        s.channel_id
+        for s in subs
+        if s.min_level <= level
+        and (not s.world or s.world.lower() == world.lower())
+        and (not s.character_name or s.character_name.lower() == name.lower())
+    }
+
+
+def test_index_matches_the_same_channels_as_a_full_scan() -> None:
+    """Binary search + lookups agree with checking every subscription."""
+    rng = random.Random(7)
+    subs = [
+        _sub(
+            str(rng.randrange(300)),
+            rng.randrange(1, 400),
+            rng.choice(WORLDS),
+            rng.choice(NAMES),
+        )
+        for _ in range(2000)
+    ]
+    index = SubscriptionIndex(subs)
+
+    for _ in range(500):
+        level, name, world = (
+            rng.randrange(1, 500),
+            rng.choice(NAMES[:-1]),
+            rng.choice(WORLDS),
+        )
+        matched = index.match(level, name, world)
+        assert {s.channel_id for s in matched} == _naive(subs, level, name, world)
+        assert len(matched) == len({s.channel_id for s in matched})
+
+
+def test_threshold_is_inclusive_and_filters_ignore_case_and_spacing() -> None:
+    """`min_level` itself matches; world and name compare like the site does."""
+    index = SubscriptionIndex(
+        [_sub("a", 100), _sub("b", 1, "concordia", "go  diego go"), _sub("c", 1, "x")]
+    )
+
+    assert {s.channel_id for s in index.match(100, "Go Diego Go", "Concordia")} == {
+        "a",
+        "b",
+    }
+    assert index.match(99, "Someone", "Concordia") == []
+    assert index.needs_world
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saved_subscription_reaches_the_index_and_the_outbox() -> None:
+    """A new subscription is picked up after commit and routes matching
+    deaths, with the world taken from the character's row."""
+    Character.objects.create(name="Yhral", world="Concordia")
+    assert subscriptions.current_index().size == 0
+
+    DeathSubscription.objects.create(
+        guild_id="1",
+        channel_id="9",
+        webhook_url="http://discord.invalid/api/webhooks/9/t",
+        min_level=50,
+        world="Concordia",
+    )
+    with override_settings(DISCORD_DEATHS_WEBHOOK_URL=""):
+        save_death_event(
+            {
+                "character_name": "Yhral",
+                "level_at_death": 118,
+                "killed_by": "a dragon lord",
+                "died_at": datetime(2026, 4, 12, 21, 25, tzinfo=timezone.utc),
+            }
+        )
+
+    row = NotificationOutbox.objects.get()
+    assert row.key.endswith(":9")
+    assert row.webhook_url.endswith("/9/t")
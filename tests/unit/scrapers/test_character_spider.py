@@ -169,6 +169,7 @@ def test_parse_character_never_logged_handles_gracefully() -> None:
     assert len(items) == 1
     assert items[0]["last_login"] is None
     assert items[0]["name"] == "Newbie"
+    assert items[0]["guild_membership"] == ""  # no guild link: not NULL
 
 
 def test_warning_log_contains_queried_character_name(
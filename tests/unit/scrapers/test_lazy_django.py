@@ -0,0 +1,53 @@
+"""Tests for the Scrapy project's lazy Django setup (django_apps.py)."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def _python(code: str) -> str:
+    """Run `code` in a fresh interpreter, as a Scrapy process would start."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings.dev"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_importing_the_project_does_not_set_django_up() -> None:
+    """Settings, spiders and pipelines load without the app registry."""
+    out = _python(
+        "import sys\n"
+        "import scrapers.tibiantis_scrapers.settings\n"
+        "import scrapers.tibiantis_scrapers.spiders.character_spider\n"
+        "import scrapers.tibiantis_scrapers.spiders.login_spider\n"
+        "import scrapers.tibiantis_scrapers.pipelines\n"
+        "from django.apps import apps\n"
+        "print(apps.ready, any(m.startswith('apps.') for m in sys.modules))"
+    )
+
+    assert out == "False False"
+
+
+def test_first_service_lookup_sets_django_up_once() -> None:
+    """The pipelines' service lookup sets Django up and is cached after."""
+    out = _python(
+        "from scrapers.tibiantis_scrapers import django_apps\n"
+        "from django.apps import apps\n"
+        "first = django_apps.services('apps.characters.services')\n"
+        "print(apps.ready, first is django_apps.services('apps.characters.services'),"
+        " hasattr(first, 'upsert_character'))"
+    )
+
+    assert out == "True True True"
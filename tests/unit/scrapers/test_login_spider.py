@@ -0,0 +1,73 @@
+"""Offline tests for LoginSpider — the login fast lane's parse and requests."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from scrapy.http import HtmlResponse, Request
+
+from scrapers.tibiantis_scrapers.spiders.login_spider import LoginSpider
+
+FIXTURE_PATH = (
+    Path(__file__).resolve().parents[3] / "tests" / "fixtures" / "character_yhral.html"
+)
+URL = "https://tibiantis.online/?page=character&name=Yhral"
+
+
+def _response(
+    body: bytes, status: int = 200, headers: dict[str, str] | None = None
+) -> HtmlResponse:
+    return HtmlResponse(
+        url=URL,
+        status=status,
+        body=body,
+        headers=headers,
+        encoding="utf-8",
+        request=Request(URL),
+    )
+
+
+def test_parse_yields_the_last_login_from_the_raw_page() -> None:
+    """The Last Login row is found in the real page without a selector tree."""
+    spider = LoginSpider()
+
+    items = list(spider.parse(_response(FIXTURE_PATH.read_bytes()), "Yhral"))
+
+    assert len(items) == 1
+    assert items[0]["name"] == "Yhral"
+    assert items[0]["last_login"] == datetime(
+        2026, 4, 18, 1, 25, 30, tzinfo=ZoneInfo("Europe/Berlin")
+    )
+
+
+def test_never_logged_in_yields_none() -> None:
+    """A character that never logged in is reported as such, not skipped."""
+    body = b"<tr class='hover'><td>Last Login:</td><td>Never logged in.</td></tr>"
+
+    items = list(LoginSpider().parse(_response(body), "Fresh"))
+
+    assert [item["last_login"] for item in items] == [None]
+
+
+def test_not_modified_page_yields_nothing() -> None:
+    """A 304 means the login did not move since the last round."""
+    items = list(LoginSpider().parse(_response(b"", status=304), "Yhral"))
+
+    assert items == []
+
+
+def test_next_request_is_conditional_on_the_validators_sent() -> None:
+    """ETag / Last-Modified of a response make the next round's request
+    conditional; until then requests carry no validators."""
+    spider = LoginSpider()
+    assert "If-None-Match" not in spider.login_request("Yhral").headers
+
+    headers = {"ETag": '"abc"', "Last-Modified": "Sat, 18 Apr 2026 00:00:00 GMT"}
+    list(spider.parse(_response(FIXTURE_PATH.read_bytes(), headers=headers), "Yhral"))
+    request = spider.login_request("Yhral")
+
+    assert request.headers["If-None-Match"] == b'"abc"'
+    assert request.headers["If-Modified-Since"] == b"Sat, 18 Apr 2026 00:00:00 GMT"
+    assert request.dont_filter
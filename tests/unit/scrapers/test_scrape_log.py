@@ -0,0 +1,190 @@
+"""Tests for the batched scrape-log writer, its sinks and the Scrapy hooks."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from prometheus_client import REGISTRY
+from pytest_django.fixtures import SettingsWrapper
+from scrapy.http import HtmlResponse, Request
+
+from config import scrape_log
+from config.scrape_log import ScrapeLogRecord, ScrapeLogWriter, Sink, sink_from_url
+from scrapers.tibiantis_scrapers.items import CharacterItem
+from scrapers.tibiantis_scrapers.scrape_log import ScrapeLogExtension
+
+
+URL = "https://tibiantis.online/?page=character&name=Yhral"
+
+
+class RecordingSink(Sink):
+    def __init__(self) -> None:
+        self.batches: list[list[ScrapeLogRecord]] = []
+
+    def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+        self.batches.append(list(records))
+
+
+def _record(n: int = 0) -> ScrapeLogRecord:
+    return ScrapeLogRecord(kind="fetch", ts=float(n), spider="character", url=URL)
+
+
+def _dropped(reason: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "tibiantis_scrape_log_dropped_total", {"reason": reason}
+        )
+        or 0.0
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_process_writer() -> Iterator[None]:
+    scrape_log.close()
+    yield
+    scrape_log.close()
+
+
+def test_records_are_written_in_batches() -> None:
+    """Full batches go out as they fill; closing flushes the remainder."""
+    sink = RecordingSink()
+    writer = ScrapeLogWriter(sink, queue_size=100, batch_size=3, flush_seconds=60)
+
+    for n in range(7):
+        writer.append(_record(n))
+    writer.close()
+
+    assert [len(batch) for batch in sink.batches] == [3, 3, 1]
+    assert [r["ts"] for batch in sink.batches for r in batch] == list(range(7))
+
+
+def test_partial_batch_is_flushed_after_the_interval() -> None:
+    """A trickle of records still reaches the sink within the flush interval."""
+    sink = RecordingSink()
+    writer = ScrapeLogWriter(sink, queue_size=100, batch_size=500, flush_seconds=0.05)
+
+    writer.append(_record())
+    deadline = time.monotonic() + 2
+    while not sink.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(sink.batches) == 1
+    writer.close()
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    """With the sink stuck, appends return at once and overflow is counted."""
+    release = threading.Event()
+
+    class StuckSink(RecordingSink):
+        def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+            release.wait(5)
+            super().write(records)
+
+    writer = ScrapeLogWriter(StuckSink(), queue_size=5, batch_size=1, flush_seconds=60)
+    before = _dropped("queue_full")
+
+    started = time.monotonic()
+    for n in range(50):
+        writer.append(_record(n))
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert _dropped("queue_full") - before >= 50 - 5 - 1
+    release.set()
+    writer.close()
+
+
+def test_sink_error_drops_the_batch_and_keeps_writing() -> None:
+    """A failed write loses that batch only; the next one goes through."""
+
+    class FlakySink(RecordingSink):
+        calls = 0
+
+        def write(self, records: Sequence[ScrapeLogRecord]) -> None:
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("log store down")
+            super().write(records)
+
+    sink = FlakySink()
+    writer = ScrapeLogWriter(sink, queue_size=100, batch_size=2, flush_seconds=60)
+    before = _dropped("sink_error")
+
+    for n in range(4):
+        writer.append(_record(n))
+    writer.close()
+
+    assert _dropped("sink_error") == before + 2
+    assert [[r["ts"] for r in batch] for batch in sink.batches] == [[2.0, 3.0]]
+
+
+def test_sqlite_and_jsonl_sinks_store_every_record(tmp_path: Path) -> None:
+    """The dev sinks persist each record as JSON; four slashes = absolute path."""
+    sqlite_sink = sink_from_url(f"sqlite:///{tmp_path}/logs.sqlite3")
+    jsonl_sink = sink_from_url(f"jsonl:///{tmp_path}/logs/scrape.jsonl")
+
+    for sink in (sqlite_sink, jsonl_sink):
+        sink.write([_record(1), _record(2)])
+        sink.close()
+
+    rows = sqlite3.connect(tmp_path / "logs.sqlite3").execute(
+        "SELECT ts, kind, record FROM scrape_logs ORDER BY ts"
+    )
+    assert [(ts, kind) for ts, kind, _ in rows] == [(1.0, "fetch"), (2.0, "fetch")]
+    lines = (tmp_path / "logs" / "scrape.jsonl").read_text().splitlines()
+    assert [json.loads(line)["ts"] for line in lines] == [1.0, 2.0]
+
+
+def test_unusable_urls_are_configuration_errors() -> None:
+    """Unknown schemes, and MongoDB without pymongo, fail loudly at start."""
+    with pytest.raises(ImproperlyConfigured, match="scheme"):
+        sink_from_url("ftp://logs")
+    with patch.dict(sys.modules, {"pymongo": None}):
+        with pytest.raises(ImproperlyConfigured, match="pymongo"):
+            sink_from_url("mongodb://localhost:27017/tibiantis")
+
+
+def test_logging_off_by_default(settings: SettingsWrapper) -> None:
+    """Without `SCRAPE_LOG_URL` no writer thread is started."""
+    settings.SCRAPE_LOG_URL = ""
+
+    scrape_log.log_fetch("character", URL, status=200, size=10, latency_ms=1.0)
+
+    assert scrape_log.get_writer() is None
+
+
+def test_extension_logs_fetch_and_item(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    """One fetch record and one item record per page, flushed on spider close."""
+    settings.SCRAPE_LOG_URL = f"jsonl:///{tmp_path}/scrape.jsonl"
+    extension = ScrapeLogExtension()
+    spider = MagicMock()
+    spider.name = "character"
+    request = Request(URL, meta={"download_latency": 0.25})
+    response = HtmlResponse(url=URL, body=b"<html></html>", request=request)
+
+    extension.response_received(response, request, spider)
+    extension.item_scraped(CharacterItem(name="Yhral"), response, spider)
+    extension.spider_closed(spider)
+
+    fetch, item = (
+        json.loads(line)
+        for line in (tmp_path / "scrape.jsonl").read_text().splitlines()
+    )
+    assert fetch["kind"] == "fetch"
+    assert (fetch["url"], fetch["status"], fetch["bytes"]) == (URL, 200, 13)
+    assert fetch["latency_ms"] == 250.0
+    assert item["kind"] == "item"
+    assert (item["key"], item["outcome"]) == ("Yhral", "stored")
+    assert item["duration_ms"] >= 0
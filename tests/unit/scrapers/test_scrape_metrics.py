@@ -0,0 +1,91 @@
+"""Unit tests for the Scrapy metrics hooks — no network, no DB."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+from scrapy.http import HtmlResponse, Request
+
+from scrapers.tibiantis_scrapers.items import CharacterItem
+from scrapers.tibiantis_scrapers.metrics import MetricsExtension, ParseTimingMiddleware
+from scrapers.tibiantis_scrapers.pipelines import DjangoPipeline
+
+
+def _count(metric: str, spider: str = "character") -> float:
+    return REGISTRY.get_sample_value(f"{metric}_count", {"spider": spider}) or 0.0
+
+
+@pytest.fixture()
+def spider() -> MagicMock:
+    spider = MagicMock()
+    spider.name = "character"
+    return spider
+
+
+def test_fetch_latency_is_recorded_for_pages_not_robots(spider: MagicMock) -> None:
+    """Scraped pages feed the fetch histogram; robots.txt is left out."""
+    extension = MetricsExtension()
+    page = Request("https://tibiantis.online/?page=character&name=Yhral")
+    page.meta["download_latency"] = 0.42
+    robots = Request(
+        "https://tibiantis.online/robots.txt", meta={"dont_obey_robotstxt": True}
+    )
+    robots.meta["download_latency"] = 0.1
+    before = _count("tibiantis_scrape_fetch_seconds")
+
+    extension.response_received(MagicMock(), page, spider)
+    extension.response_received(MagicMock(), robots, spider)
+
+    assert _count("tibiantis_scrape_fetch_seconds") == before + 1
+
+
+def test_parse_time_is_recorded_once_per_response(spider: MagicMock) -> None:
+    """The middleware passes items through and times the callback once."""
+    response = HtmlResponse(url="https://tibiantis.online/", body=b"")
+    items = [CharacterItem(name="Yhral"), CharacterItem(name="Tester")]
+    before = _count("tibiantis_scrape_parse_seconds")
+
+    middleware = ParseTimingMiddleware(MagicMock(spider=spider))
+    output = list(middleware.process_spider_output(response, iter(items)))
+
+    assert output == items
+    assert _count("tibiantis_scrape_parse_seconds") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_parse_time_is_recorded_for_async_callbacks(spider: MagicMock) -> None:
+    """Async spider output is timed the same way."""
+    response = HtmlResponse(url="https://tibiantis.online/", body=b"")
+
+    async def callback_output() -> AsyncIterator[CharacterItem]:
+        yield CharacterItem(name="Yhral")
+
+    before = _count("tibiantis_scrape_parse_seconds")
+
+    middleware = ParseTimingMiddleware(MagicMock(spider=spider))
+    output = [
+        entry
+        async for entry in middleware.process_spider_output_async(
+            response, callback_output()
+        )
+    ]
+
+    assert output == [CharacterItem(name="Yhral")]
+    assert _count("tibiantis_scrape_parse_seconds") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_db_write_time_even_on_error(spider: MagicMock) -> None:
+    """The upsert is timed whether it succeeds or raises."""
+    before = _count("tibiantis_scrape_db_write_seconds")
+
+    with patch("apps.characters.services.upsert_character") as mock_upsert:
+        await DjangoPipeline().process_item(CharacterItem(name="Yhral"), spider)
+        mock_upsert.side_effect = RuntimeError("db unavailable")
+        with pytest.raises(RuntimeError):
+            await DjangoPipeline().process_item(CharacterItem(name="Yhral"), spider)
+
+    assert _count("tibiantis_scrape_db_write_seconds") == before + 2
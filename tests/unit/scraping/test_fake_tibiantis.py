@@ -0,0 +1,138 @@
+"""Tests for the synthetic Tibiantis pages and the fake site serving them."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from parsel import Selector
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from apps.characters.models import Character
+from apps.scraping import loadtest, synthetic
+from apps.scraping.fake_tibiantis import FakeTibiantis
+from scrapers.tibiantis_scrapers.spiders.character_spider import CharacterSpider
+
+
+@pytest.mark.parametrize("n", [0, 1, 31, 32, 1_000, 999_999, 10_000_000])
+def test_names_are_unique_and_map_back_to_their_index(n: int) -> None:
+    """`index` inverts `name`, so the fake site can serve any character."""
+    assert synthetic.index(synthetic.name(n)) == n
+    assert synthetic.name(n) != synthetic.name(n + 1)
+
+
+def test_unknown_names_have_no_index() -> None:
+    """Real character names are not synthetic ones, even when they spell one."""
+    assert synthetic.index("Yhral") is None
+    assert synthetic.index(synthetic.name(5).removesuffix(synthetic.MARKER)) is None
+    assert synthetic.name(5).endswith(synthetic.MARKER)
+
+
+def test_character_page_parses_back_into_the_character() -> None:
+    """The spider reads a generated profile as it reads the real site's."""
+    for n in range(50):
+        c = synthetic.character(n)
+        response = HtmlResponse(
+            url=f"https://tibiantis.online/?page=character&name={c.name}",
+            body=synthetic.character_page(c).encode(),
+            encoding="utf-8",
+        )
+
+        item = next(iter(CharacterSpider(name=c.name).parse(response)))
+
+        assert dict(item) == {
+            "name": c.name,
+            "sex": c.sex,
+            "vocation": c.vocation,
+            "level": c.level,
+            "world": c.world,
+            "residence": c.residence,
+            "house": c.house,
+            "guild_membership": c.guild_membership.partition(" of the ")[2],
+            "last_login": c.last_login,
+            "account_status": c.account_status,
+        }
+
+
+def test_deaths_page_has_the_listing_rows_and_pagination() -> None:
+    """A deaths page matches the site's `table.mytab.long` layout."""
+    html = synthetic.deaths_page(2, pages=5, per_page=50, characters=100)
+
+    page = Selector(text=html)
+
+    assert len(page.css("table.mytab.long tr td.ld")) == 50
+    assert page.css("table.pagination td.mu a::text").get() == "2"
+    assert page.css("table.pagination td.rd a::attr(href)").get() == ("/stats/deaths/3")
+
+
+async def test_fake_site_serves_characters_deaths_and_not_found() -> None:
+    """Known names get a profile, unknown ones the site's "not found" page."""
+    async with (
+        FakeTibiantis(characters=10, deaths_pages=2) as fake,
+        aiohttp.ClientSession(fake.base_url) as session,
+    ):
+        params = {"page": "character", "name": synthetic.name(3)}
+        async with session.get("/", params=params) as response:
+            assert response.status == 200
+            assert synthetic.name(3) in await response.text()
+        params["name"] = synthetic.name(10)
+        async with session.get("/", params=params) as response:
+            assert not Selector(text=await response.text()).css("table.tabi tr.hover")
+        async with session.get("/stats/deaths/2") as response:
+            assert response.status == 200
+        async with session.get("/stats/deaths/3") as response:
+            assert response.status == 404
+        async with session.get("/robots.txt") as response:
+            assert "Allow: /" in await response.text()
+
+    assert fake.requests == 4
+
+
+async def test_fake_site_injects_errors_at_the_configured_rate() -> None:
+    """`error_rate` answers that share of requests with 503."""
+    async with (
+        FakeTibiantis(error_rate=1.0) as fake,
+        aiohttp.ClientSession(fake.base_url) as session,
+    ):
+        async with session.get("/stats/deaths") as response:
+            assert response.status == 503
+
+    assert fake.errors == 1
+
+
+def test_base_url_setting_points_the_character_spider_elsewhere() -> None:
+    """`TIBIANTIS_BASE_URL` redirects the spider, e.g. to the fake site."""
+    crawler = get_crawler(
+        CharacterSpider, {"TIBIANTIS_BASE_URL": "http://127.0.0.1:8766"}
+    )
+
+    spider = CharacterSpider.from_crawler(crawler, name="Baba Baba")
+
+    assert spider.start_urls == ["http://127.0.0.1:8766/?page=character&name=Baba Baba"]
+
+
+def test_loadtest_refuses_a_database_not_listed_for_it(settings: Any) -> None:
+    """The load test writes and deletes rows: only throwaway databases."""
+    settings.LOADTEST_DATABASES = []
+
+    with pytest.raises(CommandError, match="LOADTEST_DATABASES"):
+        call_command("loadtest", characters=1)
+
+
+@pytest.mark.django_db
+def test_loadtest_cleanup_deletes_only_the_rows_its_run_created() -> None:
+    """Synthetic characters that were there before the run stay."""
+    Character.objects.create(name=synthetic.name(0))
+    Character.objects.create(name="Yhral")
+    keep = loadtest.existing(range(3))
+    Character.objects.create(name=synthetic.name(1))
+
+    assert loadtest.delete(range(3), keep) == 1
+    assert set(Character.objects.values_list("name", flat=True)) == {
+        synthetic.name(0),
+        "Yhral",
+    }
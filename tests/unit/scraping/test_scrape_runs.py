@@ -0,0 +1,277 @@
+"""Tests for the scrape-run ledger (`apps.scraping`) and its GraphQL fields."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.characters.models import Character
+from apps.characters.tasks import scrape_character, scrape_watched_characters
+from apps.scraping import services
+from apps.scraping.models import ScrapeRun, ScrapeRunItem
+from apps.scraping.types import ScrapeReport
+
+
+GRAPHQL_URL = "/graphql/"
+
+RUNS_QUERY = """
+query ($first: Int, $after: String) {
+  scrapeRuns(first: $first, after: $after) {
+    edges { node { kind targets failed durationMs entries { target outcome } } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+def _report(**overrides: Any) -> ScrapeReport:
+    report: ScrapeReport = {
+        "startup_ms": 900.0,
+        "fetches": 2,
+        "bytes": 4096,
+        "items": 1,
+        "fetch_ms": 120.0,
+        "parse_ms": 3.5,
+        "db_ms": 8.0,
+        "outcomes": {"scraped": 1},
+        "error_class": "",
+        "startup_profile": {"django.setup": 400.0, "scrapy": 60.0},
+    }
+    report.update(overrides)  # type: ignore[typeddict-item]
+    return report
+
+
+def _item(report: ScrapeReport | None, returncode: int | None = 0) -> ScrapeRunItem:
+    return services.item_from_report(
+        "Yhral",
+        started_at=timezone.now(),
+        total_ms=1500.0,
+        returncode=returncode,
+        report=report,
+    )
+
+
+def test_outcome_follows_the_report() -> None:
+    """Stored changes, nothing new, nothing found and logged errors are told apart."""
+    Outcome = ScrapeRunItem.Outcome
+
+    assert _item(_report()).outcome == Outcome.SCRAPED
+    assert _item(_report(outcomes={"unchanged": 1})).outcome == Outcome.UNCHANGED
+    assert _item(_report(items=0, outcomes={})).outcome == Outcome.EMPTY
+    failed = _item(_report(error_class="TCPTimedOutError"))
+    assert (failed.outcome, failed.error_class) == (Outcome.FAILED, "TCPTimedOutError")
+    assert _item(None, returncode=1).error_class == "NonZeroExit"
+
+
+def test_download_error_retried_into_a_stored_item_is_not_a_failure() -> None:
+    """DownloaderStats counts an exception before RetryMiddleware retries it:
+    a timeout followed by a 200 that stored the character is a success."""
+    timeout = "downloader/exception_type_count/twisted.internet.error.TimeoutError"
+    retried = {
+        "downloader/exception_count": 1,
+        timeout: 1,
+        "retry/count": 1,
+        "retry/reason_count/twisted.internet.error.TimeoutError": 1,
+        "downloader/response_status_count/200": 1,
+        "response_received_count": 1,
+        "item_scraped_count": 1,
+    }
+
+    assert services.crawl_error(retried) == ""
+    item = _item(_report(error_class=services.crawl_error(retried)))
+    assert item.outcome == ScrapeRunItem.Outcome.SCRAPED
+
+    gave_up = {timeout: 3, "retry/count": 2, "retry/max_reached": 1}
+    assert services.crawl_error(gave_up) == "TimeoutError"
+    assert services.crawl_error({**retried, "retry/max_reached": 1}) == "TimeoutError"
+    assert services.crawl_error({**retried, "item_scraped_count": 0}) == "TimeoutError"
+    callback_error = {"spider_exceptions/count": 1, "spider_exceptions/KeyError": 1}
+    assert services.crawl_error({**retried, **callback_error}) == "KeyError"
+
+
+def test_report_round_trips_through_the_env_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The subprocess writes where the task asked; a missing file reads as None."""
+    path = tmp_path / "report.json"
+    assert services.read_report(path) is None
+
+    monkeypatch.setenv(services.SCRAPE_REPORT_ENV, str(path))
+    services.write_report(_report())
+
+    assert services.read_report(path) == _report()
+
+
+@pytest.mark.django_db
+def test_recorder_writes_items_in_batches_with_running_totals(
+    django_assert_num_queries: Any,
+) -> None:
+    """Nothing is written until a batch fills; totals are summed as items arrive."""
+    recorder = services.RunRecorder(ScrapeRun.Kind.SWEEP, batch_size=2)
+
+    with django_assert_num_queries(0):
+        recorder.add(_item(_report()))
+    recorder.add(_item(None, returncode=1))
+    assert ScrapeRunItem.objects.count() == 2
+
+    recorder.add(services.skipped_item("Tester"))
+    assert ScrapeRunItem.objects.count() == 2
+    run = recorder.finish()
+
+    run.refresh_from_db()
+    assert (run.targets, run.items, run.failed, run.skipped) == (3, 1, 1, 1)
+    assert (run.bytes_downloaded, run.fetch_ms) == (4096, 120.0)
+    assert run.finished_at is not None
+    assert ScrapeRunItem.objects.filter(run=run).count() == 3
+
+
+@pytest.mark.django_db
+def test_recorder_records_the_exception_that_ended_the_run() -> None:
+    """A task-level error finishes the run with its class; it still propagates."""
+    with pytest.raises(ConnectionError):
+        with services.RunRecorder(ScrapeRun.Kind.SWEEP) as recorder:
+            recorder.add(_item(_report()))
+            raise ConnectionError("db unavailable")
+
+    run = ScrapeRun.objects.get()
+    assert (run.error_class, run.targets) == ("ConnectionError", 1)
+
+
+def _write_report_from_subprocess(*args: Any, **kwargs: Any) -> Any:
+    Path(kwargs["env"][services.SCRAPE_REPORT_ENV]).write_text(
+        json.dumps(_report(outcomes={"unchanged": 1}))
+    )
+    return subprocess.CompletedProcess(args=[], returncode=0)
+
+
+@pytest.mark.django_db
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_scrape_task_records_the_subprocess_report(mock_run: mock.MagicMock) -> None:
+    """The task's run carries the subprocess's phases and the data's age."""
+    Character.objects.create(name="Yhral", level=45)
+    Character.objects.filter(name="Yhral").update(
+        last_scraped_at=timezone.now() - timedelta(hours=2)
+    )
+    mock_run.side_effect = _write_report_from_subprocess
+
+    assert scrape_character.apply(args=["Yhral"]).get() is True
+
+    run = ScrapeRun.objects.get()
+    item = run.entries.get()
+    assert run.kind == ScrapeRun.Kind.CHARACTER and run.task_id
+    assert (run.unchanged, run.db_ms) == (1, 8.0)
+    assert item.outcome == ScrapeRunItem.Outcome.UNCHANGED
+    assert item.staleness_seconds == pytest.approx(7200, abs=60)
+    report_path = mock_run.call_args.kwargs["env"][services.SCRAPE_REPORT_ENV]
+    assert not os.path.exists(report_path)
+
+
+@pytest.mark.django_db
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_sweep_records_skipped_targets(mock_run: mock.MagicMock) -> None:
+    """Fresh characters are ledger entries too, with no fetch."""
+    Character.objects.create(name="Yhral", level=45)
+
+    scrape_watched_characters.apply().get()
+
+    mock_run.assert_not_called()
+    (item,) = ScrapeRunItem.objects.all()
+    assert (item.run.kind, item.outcome) == (
+        ScrapeRun.Kind.SWEEP,
+        ScrapeRunItem.Outcome.SKIPPED,
+    )
+
+
+@pytest.mark.django_db
+def test_trends_aggregate_per_bucket() -> None:
+    """Throughput counts scrape wall time only; skipped targets don't dilute it."""
+    with services.RunRecorder(ScrapeRun.Kind.SWEEP) as recorder:
+        recorder.add(_item(_report()))
+        recorder.add(_item(_report(error_class="IgnoreRequest")))
+        recorder.add(services.skipped_item("Tester", staleness_seconds=10.0))
+
+    (trend,) = services.run_trends(
+        bucket="day", since=timezone.now() - timedelta(days=1)
+    )
+
+    assert (trend.targets, trend.scraped, trend.failed, trend.skipped) == (3, 1, 1, 1)
+    assert trend.targets_per_minute == pytest.approx(40.0)  # 2 per 3 s
+    assert trend.max_staleness_seconds is None
+
+
+async def _staff_client() -> AsyncClient:
+    user = await sync_to_async(User.objects.create_user)(
+        username="admin",
+        email="admin@example.com",
+        password="KomplexHaslo!23",
+        is_staff=True,
+    )
+    client = AsyncClient()
+    await sync_to_async(client.force_login)(user)
+    return client
+
+
+async def _query(client: AsyncClient, query: str, **variables: Any) -> dict[str, Any]:
+    response = await client.post(
+        GRAPHQL_URL,
+        data=json.dumps({"query": query, "variables": variables}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def _seed_runs() -> None:
+    for failed in (False, True):
+        with services.RunRecorder(ScrapeRun.Kind.SWEEP) as recorder:
+            recorder.add(_item(_report(), returncode=1 if failed else 0))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_scrape_runs_connection_pages_newest_first() -> None:
+    """Staff page through runs with their entries; others are refused."""
+    await sync_to_async(_seed_runs)()
+    anonymous = await _query(AsyncClient(), RUNS_QUERY)
+    assert anonymous["errors"][0]["message"] == "Staff only"
+
+    client = await _staff_client()
+    first = (await _query(client, RUNS_QUERY, first=1))["data"]["scrapeRuns"]
+    rest = (await _query(client, RUNS_QUERY, after=first["pageInfo"]["endCursor"]))[
+        "data"
+    ]["scrapeRuns"]
+
+    (newest,) = [edge["node"] for edge in first["edges"]]
+    (oldest,) = [edge["node"] for edge in rest["edges"]]
+    assert first["pageInfo"]["hasNextPage"] and not rest["pageInfo"]["hasNextPage"]
+    assert (newest["failed"], oldest["failed"]) == (1, 0)
+    assert newest["entries"] == [{"target": "Yhral", "outcome": "failed"}]
+    assert newest["durationMs"] >= 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_scrape_run_trends_field() -> None:
+    """`scrapeRunTrends` exposes the per-bucket aggregates to staff."""
+    await sync_to_async(_seed_runs)()
+    client = await _staff_client()
+
+    payload = await _query(
+        client,
+        "{ scrapeRunTrends(bucket: DAY, days: 1) { targets failed avgFetchMs } }",
+    )
+
+    assert payload["data"]["scrapeRunTrends"] == [
+        {"targets": 2, "failed": 1, "avgFetchMs": 120.0}
+    ]
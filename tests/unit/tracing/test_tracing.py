@@ -0,0 +1,148 @@
+"""Tests for scrape tracing across the task → subprocess boundary."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+from apps.characters.tasks import _run_scrape
+from config import tracing
+
+
+@pytest.fixture()
+def trace_file(settings: SettingsWrapper, tmp_path: Path) -> Path:
+    path = tmp_path / "traces.jsonl"
+    settings.TRACE_EXPORT_URL = f"jsonl:///{path}"
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process() -> Iterator[None]:
+    tracing._finished.clear()
+    yield
+    tracing._finished.clear()
+
+
+def _spans(path: Path) -> dict[str, dict[str, Any]]:
+    lines = path.read_text().splitlines()
+    return {span["name"]: span for span in map(json.loads, lines)}
+
+
+def test_tracing_off_by_default() -> None:
+    """Without `TRACE_EXPORT_URL` spans are no-ops and nothing is propagated."""
+    with tracing.span("task") as context:
+        assert context is None
+    assert tracing.child_env(context) == {}
+    assert tracing._finished == []
+
+
+def test_nested_spans_form_one_trace_exported_at_the_outermost(
+    trace_file: Path,
+) -> None:
+    """Children share the trace id; the export happens when the root ends."""
+    with tracing.span("task", character="Yhral"):
+        with tracing.span("subprocess"):
+            pass
+        assert not trace_file.exists()
+
+    spans = _spans(trace_file)
+    assert spans["task"]["parent_id"] is None
+    assert spans["subprocess"]["parent_id"] == spans["task"]["span_id"]
+    assert spans["subprocess"]["trace_id"] == spans["task"]["trace_id"]
+    assert spans["task"]["attributes"] == {"character": "Yhral"}
+
+
+def test_subprocess_continues_the_trace_with_startup_phases(
+    trace_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The child parents its spans to `TRACEPARENT` and splits its startup."""
+    parent = tracing.SpanContext("a" * 32, "b" * 16)
+    monkeypatch.setattr(
+        tracing, "_remote", tracing.SpanContext.parse(parent.traceparent)
+    )
+    monkeypatch.setenv(tracing.SPAWNED_AT_ENV, "100.0")
+    monkeypatch.setenv(tracing.PROCESS_STARTED_AT_ENV, "100.05")
+    monkeypatch.setitem(tracing._marks, "command_imported", 100.5)
+
+    with tracing.span("scrape_character.command"):
+        tracing.record_startup("command_imported")
+
+    spans = _spans(trace_file)
+    command = spans["scrape_character.command"]
+    assert (command["trace_id"], command["parent_id"]) == ("a" * 32, "b" * 16)
+    assert spans["process.spawn"]["duration_ms"] == pytest.approx(50)
+    assert spans["django.setup"]["duration_ms"] == pytest.approx(450)
+    assert spans["imports"]["start"] == 100.5
+    for phase in ("process.spawn", "django.setup", "imports"):
+        assert spans[phase]["parent_id"] == command["span_id"]
+
+
+def test_adopted_parent_covers_threads_without_context(trace_file: Path) -> None:
+    """Spans from a thread that did not inherit the context (the reactor)
+    nest under the adopted crawl span."""
+    with tracing.span("command"):
+        with tracing.span("crawl") as crawl, tracing.adopt(crawl):
+            worker = threading.Thread(
+                target=lambda: tracing.record("fetch", 1.0, 2.0, status=200)
+            )
+            worker.start()
+            worker.join()
+
+    spans = _spans(trace_file)
+    assert spans["fetch"]["parent_id"] == spans["crawl"]["span_id"]
+
+
+@mock.patch("apps.characters.tasks.subprocess.run")
+def test_scrape_subprocess_receives_traceparent(
+    mock_run: mock.MagicMock, trace_file: Path
+) -> None:
+    """The subprocess span's context reaches the child through its env."""
+    mock_run.return_value = subprocess.CompletedProcess(args=[], returncode=0)
+
+    _run_scrape("Yhral")
+
+    env = mock_run.call_args.kwargs["env"]
+    child = _spans(trace_file)["scrape_character.subprocess"]
+    assert env[tracing.TRACEPARENT_ENV] == (
+        f"00-{child['trace_id']}-{child['span_id']}-01"
+    )
+    assert float(env[tracing.SPAWNED_AT_ENV]) >= child["start"]
+
+
+def test_otlp_export(settings: SettingsWrapper) -> None:
+    """An http(s) URL gets one OTLP/HTTP JSON request per flush."""
+    received: list[dict[str, Any]] = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(json.loads(body))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    settings.TRACE_EXPORT_URL = f"http://127.0.0.1:{server.server_port}/v1/traces"
+
+    with tracing.span("task", attempt=1):
+        pass
+    thread.join(5)
+    server.server_close()
+
+    (span,) = received[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert span["name"] == "task"
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert span["attributes"] == [{"key": "attempt", "value": {"intValue": "1"}}]